@@ -1,6 +1,6 @@
 from django.contrib import admin
 from django.utils import timezone
-from appointments.models import Patient,Feedback,Appointment
+from appointments.models import Patient,Feedback,Appointment,AppointmentSeries,WaitlistEntry
 
 
 @admin.register(Patient)
@@ -32,3 +32,17 @@ class AppointmentAdmin(admin.ModelAdmin):
     is_past_appointment.short_description = 'Past Appointment'
 
 
+@admin.register(AppointmentSeries)
+class AppointmentSeriesAdmin(admin.ModelAdmin):
+    list_display = ('patient', 'doctor', 'service', 'start_date', 'time_slot', 'interval_weeks', 'occurrences')
+    list_filter = ('doctor',)
+    search_fields = ('patient__user__first_name', 'patient__user__last_name', 'patient__user__email')
+    readonly_fields = ('created_at',)
+
+
+@admin.register(WaitlistEntry)
+class WaitlistEntryAdmin(admin.ModelAdmin):
+    list_display = ('patient', 'doctor', 'service', 'start_date', 'end_date', 'auto_book', 'status', 'created_at')
+    list_filter = ('status', 'auto_book', 'doctor')
+    search_fields = ('patient__user__first_name', 'patient__user__last_name', 'patient__user__email')
+    readonly_fields = ('created_at',)
@@ -0,0 +1,81 @@
+"""
+A doctor's calendar for a date range: shifts, leaves and appointments per
+day, built from three indexed queries and merged in one pass over the days.
+"""
+from datetime import timedelta
+
+from staff_management.models import DoctorLeave, Schedule
+
+from .flat_serializers import date_field, full_name, time_field
+from .models import Appointment
+
+
+MAX_CALENDAR_DAYS = 62  # enough for a month view with leading/trailing weeks
+
+CALENDAR_APPOINTMENT_COLUMNS = (
+    'id', 'date', 'time_slot', 'end_time', 'status', 'reason_for_visit',
+    'patient_id', 'patient__user__first_name', 'patient__user__last_name', 'service__name',
+)
+
+
+def doctor_calendar(doctor_id, start, end):
+    date_repr = date_field.to_representation
+    time_repr = time_field.to_representation
+
+    # Weekly template: the doctor's open shifts by weekday.
+    shifts = {}
+    schedules = Schedule.objects.filter(doctor_id=doctor_id, is_closed=False).order_by('start_time')
+    for day_name, shift, shift_start, shift_end in schedules.values_list(
+        'day_of_week', 'shift', 'start_time', 'end_time'
+    ):
+        shifts.setdefault(day_name, []).append(
+            {'shift': shift, 'start_time': time_repr(shift_start), 'end_time': time_repr(shift_end)}
+        )
+
+    # Leaves overlapping the range (doctor, start_date, end_date index).
+    leaves = list(
+        DoctorLeave.objects.filter(doctor_id=doctor_id, start_date__lte=end, end_date__gte=start)
+        .order_by('start_date').values('id', 'start_date', 'end_date', 'reason', 'status')
+    )
+
+    # Appointments in the range, already in calendar order (doctor, date, time_slot index).
+    appointments = iter(
+        Appointment.objects.filter(doctor_id=doctor_id, date__range=(start, end))
+        .order_by('date', 'time_slot').values_list(*CALENDAR_APPOINTMENT_COLUMNS)
+    )
+    pending = next(appointments, None)
+
+    days = []
+    day = start
+    while day <= end:
+        day_appointments = []
+        while pending is not None and pending[1] == day:
+            pk, _, slot, slot_end, status, reason, patient_id, first_name, last_name, service_name = pending
+            day_appointments.append({
+                'id': pk,
+                'patient': patient_id,
+                'patient_name': full_name(first_name, last_name),
+                'service_name': service_name,
+                'time_slot': time_repr(slot),
+                'end_time': time_repr(slot_end),
+                'status': status,
+                'reason_for_visit': reason,
+            })
+            pending = next(appointments, None)
+
+        day_leaves = [leave for leave in leaves if leave['start_date'] <= day <= leave['end_date']]
+        day_name = day.strftime('%A')
+        days.append({
+            'date': date_repr(day),
+            'day_of_week': day_name,
+            'shifts': shifts.get(day_name, []),
+            # Same rule as Doctor.is_available_on(): any leave blocks the day.
+            'on_leave': bool(day_leaves),
+            'leaves': [
+                {'id': leave['id'], 'reason': leave['reason'], 'status': leave['status']} for leave in day_leaves
+            ],
+            'appointments': day_appointments,
+        })
+        day += timedelta(days=1)
+
+    return {'from': date_repr(start), 'to': date_repr(end), 'days': days}
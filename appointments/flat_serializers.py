@@ -0,0 +1,81 @@
+"""
+values_list()-based read paths producing the same dicts as
+AppointmentSerializer and DoctorAppointmentListSerializer, without
+per-row serializer instances, source traversal or related-object loads.
+"""
+from rest_framework import serializers
+
+
+date_field = serializers.DateField()
+time_field = serializers.TimeField()
+datetime_field = serializers.DateTimeField()
+price_field = serializers.DecimalField(max_digits=10, decimal_places=2)
+
+
+def full_name(first_name, last_name):
+    # Same as AbstractUser.get_full_name()
+    return ("%s %s" % (first_name, last_name)).strip()
+
+
+APPOINTMENT_COLUMNS = (
+    'id', 'patient_id', 'patient__user__first_name', 'patient__user__last_name', 'patient__user__email',
+    'doctor_id', 'doctor__user__first_name', 'doctor__user__last_name',
+    'service_id', 'service__name', 'service__base_price',
+    'date', 'time_slot', 'status', 'reason_for_visit', 'booking_timestamp',
+)
+
+
+def appointment_rows(queryset):
+    """Rows shaped like AppointmentSerializer(queryset, many=True).data"""
+    date_repr = date_field.to_representation
+    price_repr = price_field.to_representation
+    datetime_repr = datetime_field.to_representation
+
+    return [
+        {
+            'id': pk,
+            'patient': patient_id,
+            'patient_name': full_name(p_first, p_last),
+            'patient_email': p_email,
+            'doctor': doctor_id,
+            'doctor_name': full_name(d_first, d_last),
+            'service': service_id,
+            'service_name': service_name,
+            'service_price': price_repr(price),
+            'date': date_repr(day),
+            'time_slot': slot.strftime('%I:%M %p'),
+            'status': status,
+            'reason_for_visit': reason,
+            'booking_timestamp': datetime_repr(booked),
+        }
+        for (pk, patient_id, p_first, p_last, p_email, doctor_id, d_first, d_last,
+             service_id, service_name, price, day, slot, status, reason, booked)
+        in queryset.values_list(*APPOINTMENT_COLUMNS)
+    ]
+
+
+DOCTOR_APPOINTMENT_COLUMNS = (
+    'id', 'patient__user__first_name', 'patient__user__last_name', 'patient__user__email',
+    'service__name', 'date', 'time_slot', 'status', 'reason_for_visit',
+)
+
+
+def doctor_appointment_rows(queryset):
+    """Rows shaped like DoctorAppointmentListSerializer(queryset, many=True).data"""
+    date_repr = date_field.to_representation
+    time_repr = time_field.to_representation
+
+    return [
+        {
+            'id': pk,
+            'patient_name': full_name(p_first, p_last),
+            'patient_email': p_email,
+            'service_name': service_name,
+            'date': date_repr(day),
+            'time_slot': time_repr(slot),
+            'status': status,
+            'reason_for_visit': reason,
+        }
+        for (pk, p_first, p_last, p_email, service_name, day, slot, status, reason)
+        in queryset.values_list(*DOCTOR_APPOINTMENT_COLUMNS)
+    ]
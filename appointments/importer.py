@@ -0,0 +1,327 @@
+"""
+Bulk import of appointments from a legacy calendar (CSV or NDJSON).
+
+Rows are read as a stream and handled in chunks: references are resolved
+with one query per table, availability is checked against a preloaded
+schedule/leave index instead of Appointment.clean(), and valid rows are
+inserted with bulk_create(). Every rejected row is reported with its line
+number and the reasons.
+
+Columns: patient (email or id), doctor (email or id), service (name or id),
+date (YYYY-MM-DD), time_slot (HH:MM), status (default Scheduled),
+reason_for_visit (optional).
+"""
+import codecs
+import csv
+import json
+from datetime import date, datetime
+from itertools import islice
+
+from django.db import transaction
+from django.utils import timezone
+
+from medical_records.models import Service
+from staff_management.availability import AvailabilityIndex
+from staff_management.models import Doctor
+
+from .models import Appointment, Patient
+from .slots import IntervalIndex, end_time_for
+
+
+FORMATS = ('csv', 'ndjson')
+TIME_FORMATS = ('%H:%M', '%H:%M:%S', '%I:%M %p')
+STATUSES = {value for value, _ in Appointment.STATUS_CHOICES}
+
+
+def guess_format(name='', content_type=''):
+    name, content_type = (name or '').lower(), (content_type or '').lower()
+    if name.endswith(('.ndjson', '.jsonl')) or 'ndjson' in content_type or 'jsonl' in content_type:
+        return 'ndjson'
+    if name.endswith('.csv') or 'csv' in content_type:
+        return 'csv'
+    return None
+
+
+def read_rows(stream, fmt):
+    """Yield (line_number, dict) from a binary stream of CSV or NDJSON."""
+    lines = codecs.iterdecode(stream, 'utf-8-sig')
+    if fmt == 'csv':
+        reader = csv.DictReader(lines)
+        for row in reader:
+            yield reader.line_num, row
+    elif fmt == 'ndjson':
+        for number, line in enumerate(lines, start=1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError:
+                row = None
+            yield number, row if isinstance(row, dict) else None
+    else:
+        raise ValueError(f"Unsupported format '{fmt}'. Use one of: {', '.join(FORMATS)}.")
+
+
+def _parse_time(value):
+    for fmt in TIME_FORMATS:
+        try:
+            return datetime.strptime(value, fmt).time()
+        except ValueError:
+            continue
+    return None
+
+
+def _lookup_key(value):
+    """Split a reference into ('id', int) or (None, email-or-name)."""
+    value = str(value).strip()
+    if value.isdigit():
+        return 'id', int(value)
+    return None, value
+
+
+class ImportResult:
+    MAX_REPORTED_ERRORS = 1000
+
+    def __init__(self):
+        self.total = 0
+        self.imported = 0
+        self.failed = 0
+        self.errors = []
+
+    def reject(self, line, messages):
+        self.failed += 1
+        if len(self.errors) < self.MAX_REPORTED_ERRORS:
+            self.errors.append({'row': line, 'errors': messages})
+
+    def as_dict(self):
+        return {
+            'total': self.total,
+            'imported': self.imported,
+            'failed': self.failed,
+            'errors': sorted(self.errors, key=lambda e: e['row']),
+            'errors_truncated': self.failed > len(self.errors),
+        }
+
+
+class AppointmentImporter:
+    """
+    Past rows are treated as history: they must not be 'Scheduled' and are
+    not checked against the doctor's current schedule. Rows from today on
+    get the same checks as booking through the API.
+    """
+
+    def __init__(self, chunk_size=1000, dry_run=False):
+        self.chunk_size = chunk_size
+        self.dry_run = dry_run
+        self.result = ImportResult()
+        self._patients = {}
+        self._doctors = {}
+        self._services = {}
+        self._durations = {}
+        # Rows accepted so far, so later rows in the file cannot overlap them.
+        self._accepted_doctors = IntervalIndex()
+        self._accepted_patients = IntervalIndex()
+
+    def run(self, rows):
+        rows = iter(rows)
+        while True:
+            chunk = list(islice(rows, self.chunk_size))
+            if not chunk:
+                break
+            self.import_chunk(chunk)
+        return self.result
+
+    # ---- references -------------------------------------------------
+
+    def _resolve(self, cache, values, by_id, by_text):
+        keys = {_lookup_key(value) for value in values} - cache.keys()
+        ids = {key for kind, key in keys if kind == 'id'}
+        texts = {key for kind, key in keys if kind is None}
+        if ids:
+            cache.update((('id', key), pk) for key, pk in by_id(ids))
+        if texts:
+            cache.update(((None, key), pk) for key, pk in by_text(texts))
+        for key in keys:
+            cache.setdefault(key, None)
+
+    def _ref(self, cache, value):
+        return cache.get(_lookup_key(value))
+
+    def resolve_references(self, parsed):
+        patients = {row['patient'] for row in parsed}
+        doctors = {row['doctor'] for row in parsed}
+        services = {row['service'] for row in parsed}
+
+        self._resolve(
+            self._patients, patients,
+            lambda ids: Patient.objects.filter(pk__in=ids).values_list('pk', 'pk'),
+            lambda emails: Patient.objects.filter(user__email__in=emails).values_list('user__email', 'pk'),
+        )
+        self._resolve(
+            self._doctors, doctors,
+            lambda ids: Doctor.objects.filter(pk__in=ids).values_list('pk', 'pk'),
+            lambda emails: Doctor.objects.filter(user__email__in=emails).values_list('user__email', 'pk'),
+        )
+        self._resolve(
+            self._services, services,
+            lambda ids: Service.objects.filter(pk__in=ids).values_list('pk', 'pk'),
+            lambda names: Service.objects.filter(name__in=names).values_list('name', 'pk'),
+        )
+        new_services = {pk for pk in self._services.values() if pk is not None} - self._durations.keys()
+        if new_services:
+            self._durations.update(
+                Service.objects.filter(pk__in=new_services).values_list('pk', 'default_duration_min')
+            )
+
+    # ---- validation -------------------------------------------------
+
+    def parse_row(self, row):
+        """Field-level checks. Returns (cleaned, errors)."""
+        if row is None:
+            return None, ["Row is not a JSON object."]
+
+        errors = []
+        cleaned = {}
+        for field in ('patient', 'doctor', 'service', 'date', 'time_slot'):
+            value = row.get(field)
+            if value is None or str(value).strip() == '':
+                errors.append(f"'{field}' is required.")
+            else:
+                cleaned[field] = str(value).strip()
+
+        if 'date' in cleaned:
+            try:
+                cleaned['date'] = date.fromisoformat(cleaned['date'])
+            except ValueError:
+                errors.append("'date' must be in YYYY-MM-DD format.")
+        if 'time_slot' in cleaned:
+            cleaned['time_slot'] = _parse_time(cleaned['time_slot'])
+            if cleaned['time_slot'] is None:
+                errors.append("'time_slot' must be in HH:MM format.")
+
+        status = str(row.get('status') or 'Scheduled').strip()
+        if status not in STATUSES:
+            errors.append(f"'{status}' is not a valid status.")
+        cleaned['status'] = status
+        cleaned['reason_for_visit'] = row.get('reason_for_visit') or None
+        return cleaned, errors
+
+    def import_chunk(self, chunk):
+        self.result.total += len(chunk)
+
+        parsed = []
+        for line, row in chunk:
+            cleaned, errors = self.parse_row(row)
+            if errors:
+                self.result.reject(line, errors)
+            else:
+                parsed.append((line, cleaned))
+        if not parsed:
+            return
+
+        self.resolve_references([row for _, row in parsed])
+
+        resolved = []
+        for line, row in parsed:
+            errors = []
+            patient_id = self._ref(self._patients, row['patient'])
+            doctor_id = self._ref(self._doctors, row['doctor'])
+            service_id = self._ref(self._services, row['service'])
+            if patient_id is None:
+                errors.append(f"Patient '{row['patient']}' not found.")
+            if doctor_id is None:
+                errors.append(f"Doctor '{row['doctor']}' not found.")
+            if service_id is None:
+                errors.append(f"Service '{row['service']}' not found.")
+            if errors:
+                self.result.reject(line, errors)
+                continue
+            row.update(patient_id=patient_id, doctor_id=doctor_id, service_id=service_id,
+                       end_time=end_time_for(row['time_slot'], self._durations[service_id]))
+            resolved.append((line, row))
+        if not resolved:
+            return
+
+        doctor_ids = {row['doctor_id'] for _, row in resolved}
+        patient_ids = {row['patient_id'] for _, row in resolved}
+        start = min(row['date'] for _, row in resolved)
+        end = max(row['date'] for _, row in resolved)
+
+        availability = AvailabilityIndex(doctor_ids, start, end)
+        in_range = Appointment.objects.filter(date__range=(start, end)).exclude(status='Cancelled')
+        booked, patient_booked = IntervalIndex(), IntervalIndex()
+        for doctor_id, day, slot_start, slot_end in in_range.filter(doctor_id__in=doctor_ids).values_list(
+            'doctor_id', 'date', 'time_slot', 'end_time'
+        ):
+            booked.add((doctor_id, day), slot_start, slot_end)
+        for patient_id, day, slot_start, slot_end in in_range.filter(patient_id__in=patient_ids).values_list(
+            'patient_id', 'date', 'time_slot', 'end_time'
+        ):
+            patient_booked.add((patient_id, day), slot_start, slot_end)
+
+        today = date.today()
+        now = timezone.now()
+        valid = []
+        for line, row in resolved:
+            doctor_day = (row['doctor_id'], row['date'])
+            patient_day = (row['patient_id'], row['date'])
+            interval = (row['time_slot'], row['end_time'])
+
+            if row['date'] < today:
+                error = "Cannot import a past appointment as 'Scheduled'." if row['status'] == 'Scheduled' else None
+            else:
+                error = availability.check(row['doctor_id'], row['date'], row['time_slot'], now=now)
+
+            # Cancelled rows are history only and do not hold the slot.
+            holds_slot = row['status'] != 'Cancelled'
+            if error is None and holds_slot and (
+                booked.overlaps(doctor_day, *interval) or self._accepted_doctors.overlaps(doctor_day, *interval)
+            ):
+                error = "This time slot is already booked for the doctor."
+            if error is None and holds_slot and (
+                patient_booked.overlaps(patient_day, *interval)
+                or self._accepted_patients.overlaps(patient_day, *interval)
+            ):
+                error = "The patient already has an appointment booked for this date and time."
+            if error:
+                self.result.reject(line, [error])
+                continue
+
+            if holds_slot:
+                self._accepted_doctors.add(doctor_day, *interval)
+                self._accepted_patients.add(patient_day, *interval)
+            valid.append((line, row))
+
+        if valid and not self.dry_run:
+            self.insert(valid, doctor_ids, start, end)
+        else:
+            self.result.imported += len(valid)
+
+    def insert(self, valid, doctor_ids, start, end):
+        objs = [
+            Appointment(
+                patient_id=row['patient_id'], doctor_id=row['doctor_id'], service_id=row['service_id'],
+                date=row['date'], time_slot=row['time_slot'], end_time=row['end_time'], status=row['status'],
+                reason_for_visit=row['reason_for_visit'],
+            )
+            for _, row in valid
+        ]
+        with transaction.atomic():
+            # A concurrent booking can still take a slot between the check
+            # and the insert; those rows are skipped by the database constraint.
+            # Only active rows hold a slot, so only they are checked against
+            # what was stored: a cancelled row for the same patient and slot
+            # would otherwise pass for a skipped one.
+            Appointment.objects.bulk_create(objs, batch_size=self.chunk_size, ignore_conflicts=True)
+            stored = set(
+                Appointment.objects.filter(doctor_id__in=doctor_ids, date__range=(start, end))
+                .exclude(status='Cancelled')
+                .values_list('doctor_id', 'date', 'time_slot', 'patient_id')
+            )
+
+        for line, row in valid:
+            key = (row['doctor_id'], row['date'], row['time_slot'], row['patient_id'])
+            if row['status'] == 'Cancelled' or key in stored:
+                self.result.imported += 1
+            else:
+                self.result.reject(line, ["This time slot was booked while the import was running."])
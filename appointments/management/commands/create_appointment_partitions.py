@@ -0,0 +1,23 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from appointments.partitioning import ensure_partitions, is_partitioned
+
+
+class Command(BaseCommand):
+    help = "Pre-create monthly appointment partitions ahead of time (Postgres with APPOINTMENT_PARTITIONING). Run monthly from cron."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--months-ahead', type=int, default=settings.APPOINTMENT_PARTITION_MONTHS_AHEAD)
+
+    def handle(self, *args, **options):
+        if not is_partitioned(connection):
+            self.stdout.write("The appointments table is not partitioned; nothing to do.")
+            return
+
+        with transaction.atomic():
+            created = ensure_partitions(connection, options['months_ahead'])
+        for name in created:
+            self.stdout.write(f"Created {name}")
+        self.stdout.write(self.style.SUCCESS(f"{len(created)} partition(s) created."))
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from appointments.waitlist import expire_stale_offers
+
+
+class Command(BaseCommand):
+    help = "Expire unanswered waitlist offers and pass each slot to the next patient in line. Run from cron."
+
+    def handle(self, *args, **options):
+        expired = expire_stale_offers()
+        self.stdout.write(f"Expired {expired} waitlist offer(s).")
@@ -0,0 +1,39 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from appointments.importer import FORMATS, AppointmentImporter, guess_format, read_rows
+
+
+class Command(BaseCommand):
+    help = "Import appointments from a legacy calendar export (CSV or NDJSON)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('path')
+        parser.add_argument('--format', choices=FORMATS, help="Defaults to the file extension.")
+        parser.add_argument('--chunk-size', type=int, default=1000)
+        parser.add_argument('--dry-run', action='store_true', help="Validate only, insert nothing.")
+        parser.add_argument('--errors', help="Write the per-row errors to this JSON file.")
+
+    def handle(self, *args, **options):
+        fmt = options['format'] or guess_format(options['path'])
+        if fmt is None:
+            raise CommandError("Cannot tell the file format from its name; pass --format.")
+
+        importer = AppointmentImporter(chunk_size=options['chunk_size'], dry_run=options['dry_run'])
+        try:
+            with open(options['path'], 'rb') as fh:
+                result = importer.run(read_rows(fh, fmt))
+        except OSError as e:
+            raise CommandError(str(e))
+
+        verb = "Would import" if options['dry_run'] else "Imported"
+        self.stdout.write(f"{verb} {result.imported} of {result.total} rows, {result.failed} rejected.")
+        for error in result.errors[:20]:
+            self.stdout.write(self.style.WARNING(f"  row {error['row']}: {'; '.join(error['errors'])}"))
+        if result.failed > 20:
+            self.stdout.write(self.style.WARNING(f"  ... and {result.failed - 20} more"))
+
+        if options['errors']:
+            with open(options['errors'], 'w') as fh:
+                json.dump(result.as_dict(), fh, indent=2, default=str)
@@ -0,0 +1,67 @@
+# Generated by Django 5.2.6 on 2026-10-19 15:52
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('appointments', '0013_appointmentseries'),
+        ('medical_records', '0006_service_doctors'),
+        ('staff_management', '0009_alter_doctorleave_status'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='WaitlistEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('start_date', models.DateField()),
+                ('end_date', models.DateField()),
+                ('auto_book', models.BooleanField(default=False, help_text='Book the freed slot directly instead of offering it')),
+                ('reason_for_visit', models.TextField(blank=True, null=True)),
+                ('status', models.CharField(choices=[('Waiting', 'Waiting'), ('Offered', 'Offered'), ('Booked', 'Booked'), ('Expired', 'Expired')], default='Waiting', max_length=10)),
+                ('offered_date', models.DateField(blank=True, null=True)),
+                ('offered_time_slot', models.TimeField(blank=True, null=True)),
+                ('offer_expires_at', models.DateTimeField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'verbose_name_plural': 'Waitlist entries',
+                'ordering': ['created_at'],
+            },
+        ),
+        migrations.AlterUniqueTogether(
+            name='appointment',
+            unique_together=set(),
+        ),
+        migrations.AddConstraint(
+            model_name='appointment',
+            constraint=models.UniqueConstraint(condition=models.Q(('status', 'Cancelled'), _negated=True), fields=('doctor', 'date', 'time_slot'), name='unique_active_doctor_slot'),
+        ),
+        migrations.AddField(
+            model_name='waitlistentry',
+            name='appointment',
+            field=models.OneToOneField(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='waitlist_entry', to='appointments.appointment'),
+        ),
+        migrations.AddField(
+            model_name='waitlistentry',
+            name='doctor',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='waitlist_entries', to='staff_management.doctor'),
+        ),
+        migrations.AddField(
+            model_name='waitlistentry',
+            name='patient',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='waitlist_entries', to='appointments.patient'),
+        ),
+        migrations.AddField(
+            model_name='waitlistentry',
+            name='service',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, to='medical_records.service'),
+        ),
+        migrations.AddIndex(
+            model_name='waitlistentry',
+            index=models.Index(fields=['doctor', 'status', 'start_date', 'end_date', 'created_at'], name='waitlist_match_idx'),
+        ),
+    ]
@@ -0,0 +1,67 @@
+from datetime import datetime, timedelta
+
+from django.db import migrations, models
+
+
+def fill_end_time(apps, schema_editor):
+    Appointment = apps.get_model('appointments', 'Appointment')
+    Service = apps.get_model('medical_records', 'Service')
+    durations = dict(Service.objects.values_list('pk', 'default_duration_min'))
+
+    # One UPDATE per distinct (service, start time) instead of one per row.
+    pairs = Appointment.objects.order_by().values_list('service_id', 'time_slot').distinct()
+    for service_id, time_slot in pairs:
+        start = datetime.combine(datetime.min, time_slot)
+        end = min(start + timedelta(minutes=max(durations[service_id], 1)), start.replace(hour=23, minute=59, second=59))
+        Appointment.objects.filter(service_id=service_id, time_slot=time_slot).update(end_time=end.time())
+
+
+EXCLUSION_SQL = (
+    "ALTER TABLE appointments_appointment ADD CONSTRAINT appointment_no_overlap "
+    "EXCLUDE USING gist (doctor_id WITH =, tsrange(date + time_slot, date + end_time) WITH &&) "
+    "WHERE (status <> 'Cancelled')"
+)
+
+
+def add_exclusion_constraint(apps, schema_editor):
+    # Postgres rejects overlapping bookings itself. Other databases rely on
+    # the overlap check in Appointment.clean() for overlaps; the only
+    # database guard there is unique_active_doctor_slot, which catches
+    # identical start times and is enforced on MySQL only from 0017 on.
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute("CREATE EXTENSION IF NOT EXISTS btree_gist")
+    schema_editor.execute(EXCLUSION_SQL)
+
+
+def remove_exclusion_constraint(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute("ALTER TABLE appointments_appointment DROP CONSTRAINT IF EXISTS appointment_no_overlap")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('appointments', '0014_waitlist_active_slot_constraint'),
+        ('medical_records', '0006_service_doctors'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='appointment',
+            name='end_time',
+            field=models.TimeField(editable=False, null=True),
+        ),
+        migrations.RunPython(fill_end_time, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='appointment',
+            name='end_time',
+            field=models.TimeField(editable=False),
+        ),
+        migrations.AddIndex(
+            model_name='appointment',
+            index=models.Index(fields=['doctor', 'date', 'time_slot'], name='appointment_doctor_day_idx'),
+        ),
+        migrations.RunPython(add_exclusion_constraint, remove_exclusion_constraint),
+    ]
@@ -0,0 +1,26 @@
+from django.conf import settings
+from django.db import migrations
+
+from appointments.partitioning import convert_to_partitioned, is_partitioned, partitioning_enabled
+
+
+def partition_appointments(apps, schema_editor):
+    # Opt-in and Postgres only; SQLite and MySQL keep the plain table.
+    connection = schema_editor.connection
+    if not partitioning_enabled(connection) or is_partitioned(connection):
+        return
+    convert_to_partitioned(schema_editor, settings.APPOINTMENT_PARTITION_MONTHS_AHEAD)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('appointments', '0015_appointment_end_time'),
+        # Tables with foreign keys to appointments must exist first, so their
+        # constraints are dropped by the conversion instead of failing later.
+        ('medical_records', '0006_service_doctors'),
+    ]
+
+    operations = [
+        migrations.RunPython(partition_appointments, migrations.RunPython.noop),
+    ]
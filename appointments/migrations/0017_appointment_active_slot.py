@@ -0,0 +1,30 @@
+# Generated by Django 5.2.6 on 2026-10-19 16:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # The partial unique constraint from 0014 is ignored by MySQL; the
+    # generated column gives every backend a real unique index. Adding the
+    # constraint fails if duplicate active bookings already exist, which
+    # have to be resolved by hand first.
+
+    dependencies = [
+        ('appointments', '0016_partition_appointments'),
+    ]
+
+    operations = [
+        migrations.RemoveConstraint(
+            model_name='appointment',
+            name='unique_active_doctor_slot',
+        ),
+        migrations.AddField(
+            model_name='appointment',
+            name='active_slot',
+            field=models.GeneratedField(db_persist=True, expression=models.Case(models.When(models.Q(('status', 'Cancelled'), _negated=True), then=models.F('time_slot')), default=None), output_field=models.TimeField(null=True), verbose_name='time slot'),
+        ),
+        migrations.AddConstraint(
+            model_name='appointment',
+            constraint=models.UniqueConstraint(fields=('doctor', 'date', 'active_slot'), name='unique_active_doctor_slot'),
+        ),
+    ]
@@ -2,9 +2,10 @@ from django.db import models
 from django.core.exceptions import ValidationError
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.utils import timezone
-from datetime import date
+from datetime import date, timedelta
 from core.models import User
-from staff_management.models import Doctor, Schedule 
+from staff_management.models import Doctor, Schedule, get_day_shifts
+from .slots import end_time_for
 
 class Patient(models.Model):
     user = models.OneToOneField(User, on_delete=models.CASCADE, primary_key=True)
@@ -28,6 +29,32 @@ class Patient(models.Model):
         return self.user.get_full_name() or self.user.email
 
 
+class AppointmentSeries(models.Model):
+    """A weekly recurring booking; its occurrences are ordinary Appointments."""
+    MAX_OCCURRENCES = 52
+
+    patient = models.ForeignKey(Patient, on_delete=models.CASCADE, related_name="appointment_series")
+    doctor = models.ForeignKey(Doctor, on_delete=models.CASCADE, related_name="appointment_series")
+    service = models.ForeignKey('medical_records.Service', on_delete=models.PROTECT)
+    start_date = models.DateField()
+    time_slot = models.TimeField()
+    interval_weeks = models.PositiveSmallIntegerField(default=1, validators=[MinValueValidator(1), MaxValueValidator(12)])
+    occurrences = models.PositiveSmallIntegerField(validators=[MinValueValidator(1), MaxValueValidator(MAX_OCCURRENCES)])
+    reason_for_visit = models.TextField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        verbose_name_plural = "Appointment series"
+
+    def occurrence_dates(self):
+        step = timedelta(weeks=self.interval_weeks)
+        return [self.start_date + step * i for i in range(self.occurrences)]
+
+    def __str__(self):
+        return f"Series: {self.patient} with {self.doctor}, {self.occurrences} x every {self.interval_weeks} week(s)"
+
+
 class Appointment(models.Model):
     STATUS_CHOICES = [
         ('Scheduled', 'Scheduled'),
@@ -42,14 +69,38 @@ class Appointment(models.Model):
     service = models.ForeignKey('medical_records.Service', on_delete=models.PROTECT)
     date = models.DateField()
     time_slot = models.TimeField()
+    end_time = models.TimeField(editable=False)
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='Scheduled')
     reason_for_visit = models.TextField(null=True, blank=True)
     booking_timestamp = models.DateTimeField(auto_now_add=True)
+    series = models.ForeignKey(AppointmentSeries, on_delete=models.SET_NULL, null=True, blank=True, related_name="appointments")
+    # time_slot while the appointment holds its slot, NULL once Cancelled, so
+    # a cancelled slot can be rebooked. A plain unique index over it works on
+    # every backend; MySQL ignores the partial constraints that would
+    # otherwise be needed.
+    active_slot = models.GeneratedField(
+        expression=models.Case(
+            models.When(~models.Q(status='Cancelled'), then=models.F('time_slot')),
+            default=None,
+        ),
+        output_field=models.TimeField(null=True),
+        db_persist=True,
+        verbose_name='time slot',
+    )
 
     class Meta:
-        unique_together = ('doctor', 'date', 'time_slot') 
+        constraints = [
+            models.UniqueConstraint(fields=['doctor', 'date', 'active_slot'], name='unique_active_doctor_slot'),
+        ]
+        indexes = [
+            # Overlap checks seek to the doctor's day and range-scan time_slot.
+            models.Index(fields=['doctor', 'date', 'time_slot'], name='appointment_doctor_day_idx'),
+        ]
         ordering = ['-date', '-time_slot']
 
+    def compute_end_time(self):
+        return end_time_for(self.time_slot, self.service.default_duration_min)
+
     def clean(self):
         
         if self.date < date.today():
@@ -64,18 +115,15 @@ class Appointment(models.Model):
         
         day_name = self.date.strftime('%A')
         
-        daily_schedules = self.doctor.schedules.filter(
-            day_of_week=day_name, 
-            is_closed=False
-        )
+        daily_schedules = get_day_shifts(self.doctor_id, day_name)
 
         is_valid_time = False
         valid_ranges = []
 
-        for schedule in daily_schedules:
-            valid_ranges.append(f"{schedule.shift}: {schedule.start_time.strftime('%I:%M %p')} - {schedule.end_time.strftime('%I:%M %p')}")
+        for shift, start_time, end_time in daily_schedules:
+            valid_ranges.append(f"{shift}: {start_time.strftime('%I:%M %p')} - {end_time.strftime('%I:%M %p')}")
             
-            if schedule.start_time <= self.time_slot < schedule.end_time:
+            if start_time <= self.time_slot < end_time:
                 is_valid_time = True
                 break 
         
@@ -85,7 +133,16 @@ class Appointment(models.Model):
                 f"Invalid time. On {day_name}s, Dr. {self.doctor.user.last_name} is available during: {ranges_str}."
             )
 
+        self.end_time = self.compute_end_time()
+        slot_taken = Appointment.objects.filter(
+            doctor=self.doctor, date=self.date, time_slot__lt=self.end_time, end_time__gt=self.time_slot
+        ).exclude(status='Cancelled').exclude(pk=self.pk).exists()
+        if slot_taken:
+            raise ValidationError("This time slot is already booked for the doctor.")
+
     def save(self, *args, **kwargs):
+        if not self.pk or self.end_time is None:
+            self.end_time = self.compute_end_time()
         if not self.pk:  
             self.full_clean()
         super().save(*args, **kwargs)
@@ -94,6 +151,54 @@ class Appointment(models.Model):
         return f"Appt: {self.patient} with {self.doctor} on {self.date} at {self.time_slot.strftime('%I:%M %p')}"
 
 
+class WaitlistEntry(models.Model):
+    """
+    A patient waiting for any slot with a doctor between start_date and
+    end_date. When a matching appointment is cancelled the oldest entry is
+    either booked straight into the slot (auto_book) or offered it.
+    """
+    STATUS_CHOICES = [
+        ('Waiting', 'Waiting'),
+        ('Offered', 'Offered'),
+        ('Booked', 'Booked'),
+        ('Expired', 'Expired'),
+    ]
+    OFFER_TTL = timedelta(hours=2)
+
+    patient = models.ForeignKey(Patient, on_delete=models.CASCADE, related_name="waitlist_entries")
+    doctor = models.ForeignKey(Doctor, on_delete=models.CASCADE, related_name="waitlist_entries")
+    service = models.ForeignKey('medical_records.Service', on_delete=models.PROTECT)
+    start_date = models.DateField()
+    end_date = models.DateField()
+    auto_book = models.BooleanField(default=False, help_text="Book the freed slot directly instead of offering it")
+    reason_for_visit = models.TextField(null=True, blank=True)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='Waiting')
+    offered_date = models.DateField(null=True, blank=True)
+    offered_time_slot = models.TimeField(null=True, blank=True)
+    offer_expires_at = models.DateTimeField(null=True, blank=True)
+    appointment = models.OneToOneField(Appointment, on_delete=models.SET_NULL, null=True, blank=True, related_name="waitlist_entry")
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['created_at']
+        verbose_name_plural = "Waitlist entries"
+        indexes = [
+            # Matching a freed slot: doctor + status equality, then the date range, in FIFO order.
+            models.Index(fields=['doctor', 'status', 'start_date', 'end_date', 'created_at'], name='waitlist_match_idx'),
+        ]
+
+    def clean(self):
+        if self.start_date > self.end_date:
+            raise ValidationError("End date cannot be before start date.")
+
+    def save(self, *args, **kwargs):
+        self.clean()
+        super().save(*args, **kwargs)
+
+    def __str__(self):
+        return f"Waitlist: {self.patient} for {self.doctor} ({self.start_date} to {self.end_date}) - {self.status}"
+
+
 class Feedback(models.Model):
     appointment = models.OneToOneField(Appointment, on_delete=models.CASCADE, related_name="feedback")
     rating_score = models.IntegerField(
@@ -0,0 +1,178 @@
+"""
+Optional monthly range partitioning of appointments_appointment by `date`
+(PostgreSQL only, enabled with settings.APPOINTMENT_PARTITIONING).
+
+Postgres requires the partition key in every unique constraint, so on a
+partitioned table:
+
+* the primary key becomes (id, date); ids still come from one sequence and
+  stay unique in practice,
+* foreign keys *to* appointments (feedback, prescription, bill, waitlist)
+  cannot be enforced by the database and are dropped; Django still treats
+  them as relations and cascades deletes itself,
+* the appointment_no_overlap exclusion constraint is created on each
+  partition; overlapping bookings share a date, so they always meet in the
+  same partition.
+
+On any other database, or with the setting off, everything here is a no-op
+and the table stays a plain table.
+"""
+from datetime import date
+
+from django.conf import settings
+
+
+TABLE = 'appointments_appointment'
+LEGACY_TABLE = 'appointments_appointment_unpartitioned'
+DEFAULT_PARTITION = f'{TABLE}_default'
+
+OVERLAP_SQL = (
+    "ALTER TABLE {partition} ADD CONSTRAINT {partition}_no_overlap "
+    "EXCLUDE USING gist (doctor_id WITH =, tsrange(date + time_slot, date + end_time) WITH &&) "
+    "WHERE (status <> 'Cancelled')"
+)
+
+
+def month_start(day):
+    return day.replace(day=1)
+
+
+def add_months(day, months):
+    index = day.year * 12 + day.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month):
+    return f'{TABLE}_p{month:%Y_%m}'
+
+
+def partitioning_enabled(connection):
+    return connection.vendor == 'postgresql' and settings.APPOINTMENT_PARTITIONING
+
+
+def is_partitioned(connection):
+    if connection.vendor != 'postgresql':
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT 1 FROM pg_partitioned_table p JOIN pg_class c ON c.oid = p.partrelid WHERE c.relname = %s",
+            [TABLE],
+        )
+        return cursor.fetchone() is not None
+
+
+def existing_partitions(connection):
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT c.relname FROM pg_inherits i "
+            "JOIN pg_class c ON c.oid = i.inhrelid JOIN pg_class p ON p.oid = i.inhparent "
+            "WHERE p.relname = %s",
+            [TABLE],
+        )
+        return {row[0] for row in cursor.fetchall()}
+
+
+def stored_columns(cursor, table):
+    """Column list for copying rows between tables; generated columns (active_slot) are recomputed, not copied."""
+    cursor.execute(
+        "SELECT column_name FROM information_schema.columns "
+        "WHERE table_name = %s AND is_generated = 'NEVER' ORDER BY ordinal_position",
+        [table],
+    )
+    return ", ".join(f'"{row[0]}"' for row in cursor.fetchall())
+
+
+def create_partition(cursor, month):
+    """
+    Add the partition for `month`. Rows for that month already sitting in
+    the default partition (bookings made further ahead than the partitions
+    reached) are moved into it before it is attached. Run in a transaction.
+    """
+    name = partition_name(month)
+    start, end = month.isoformat(), add_months(month, 1).isoformat()
+    columns = stored_columns(cursor, TABLE)
+    cursor.execute(f"CREATE TABLE {name} (LIKE {TABLE} INCLUDING DEFAULTS INCLUDING CONSTRAINTS INCLUDING GENERATED)")
+    cursor.execute(
+        f"WITH moved AS (DELETE FROM {DEFAULT_PARTITION} WHERE date >= '{start}' AND date < '{end}' RETURNING *) "
+        f"INSERT INTO {name} ({columns}) SELECT {columns} FROM moved"
+    )
+    cursor.execute(f"ALTER TABLE {TABLE} ATTACH PARTITION {name} FOR VALUES FROM ('{start}') TO ('{end}')")
+    cursor.execute(OVERLAP_SQL.format(partition=name))
+    return name
+
+
+def ensure_partitions(connection, months_ahead, today=None):
+    """Create the monthly partitions from this month to `months_ahead` months out. Returns the names created."""
+    if not is_partitioned(connection):
+        return []
+    first = month_start(today or date.today())
+    existing = existing_partitions(connection)
+    created = []
+    with connection.cursor() as cursor:
+        for offset in range(months_ahead + 1):
+            month = add_months(first, offset)
+            if partition_name(month) not in existing:
+                created.append(create_partition(cursor, month))
+    return created
+
+
+def convert_to_partitioned(schema_editor, months_ahead):
+    """Rebuild the appointments table as a partitioned table and move the rows across."""
+    execute = schema_editor.execute
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(f"SELECT MIN(date), MAX(date), MAX(id) FROM {TABLE}")
+        first_day, last_day, max_id = cursor.fetchone()
+        cursor.execute(
+            "SELECT conrelid::regclass::text, conname FROM pg_constraint "
+            "WHERE contype = 'f' AND confrelid = %s::regclass",
+            [TABLE],
+        )
+        inbound_fks = cursor.fetchall()
+        cursor.execute(
+            "SELECT pg_get_indexdef(indexrelid) FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid "
+            "WHERE i.indrelid = %s::regclass AND NOT i.indisprimary",
+            [TABLE],
+        )
+        index_defs = [row[0] for row in cursor.fetchall()]
+        cursor.execute(
+            "SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint "
+            "WHERE conrelid = %s::regclass AND contype = 'f'",
+            [TABLE],
+        )
+        outbound_fks = cursor.fetchall()
+
+    for table, constraint in inbound_fks:
+        execute(f'ALTER TABLE {table} DROP CONSTRAINT "{constraint}"')
+    execute(f"ALTER TABLE {TABLE} DROP CONSTRAINT IF EXISTS appointment_no_overlap")
+    execute(f"ALTER TABLE {TABLE} RENAME TO {LEGACY_TABLE}")
+
+    # Identity columns cannot live on a partitioned table before Postgres 17,
+    # so ids come from a plain sequence owned by the new table.
+    execute(f"CREATE TABLE {TABLE} (LIKE {LEGACY_TABLE} INCLUDING DEFAULTS INCLUDING GENERATED) PARTITION BY RANGE (date)")
+    execute(f"CREATE SEQUENCE {TABLE}_id_seq OWNED BY {TABLE}.id")
+    execute(f"ALTER TABLE {TABLE} ALTER COLUMN id SET DEFAULT nextval('{TABLE}_id_seq')")
+    execute(f"SELECT setval('{TABLE}_id_seq', {(max_id or 0) + 1}, false)")
+    execute(f"ALTER TABLE {TABLE} ADD PRIMARY KEY (id, date)")
+
+    # Indexes and outbound foreign keys keep their names and definitions
+    # (read before the rename, so they already point at the new table).
+    # Index names are schema-wide, so the legacy ones are moved aside first.
+    for definition in index_defs:
+        name = definition.split(' INDEX ', 1)[1].split(' ON ', 1)[0]
+        execute(f"ALTER INDEX {name} RENAME TO {name[:50]}_legacy")
+        execute(definition)
+    for name, definition in outbound_fks:
+        execute(f'ALTER TABLE {TABLE} ADD CONSTRAINT "{name}" {definition}')
+
+    execute(f"CREATE TABLE {DEFAULT_PARTITION} PARTITION OF {TABLE} DEFAULT")
+    with schema_editor.connection.cursor() as cursor:
+        month = month_start(first_day or date.today())
+        last = add_months(month_start(max(last_day or date.today(), date.today())), months_ahead)
+        while month <= last:
+            create_partition(cursor, month)
+            month = add_months(month, 1)
+
+    with schema_editor.connection.cursor() as cursor:
+        columns = stored_columns(cursor, LEGACY_TABLE)
+    execute(f"INSERT INTO {TABLE} ({columns}) SELECT {columns} FROM {LEGACY_TABLE}")
+    execute(f"DROP TABLE {LEGACY_TABLE}")
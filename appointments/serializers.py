@@ -1,8 +1,13 @@
 from rest_framework import serializers
 from django.core.exceptions import ValidationError as DjangoValidationError
-from .models import Appointment
+from django.db import transaction
+from django.db.models import Q
+from datetime import date
+from .models import Appointment, AppointmentSeries, WaitlistEntry
 from medical_records.models import Service 
 from .models import Feedback
+from staff_management.availability import AvailabilityIndex
+from .slots import IntervalIndex, end_time_for
 
 
 class AppointmentBookingSerializer(serializers.ModelSerializer):
@@ -143,4 +148,103 @@ class AppointmentSerializer(serializers.ModelSerializer):
         representation = super().to_representation(instance)
         if instance.time_slot:
             representation['time_slot'] = instance.time_slot.strftime('%I:%M %p') 
-        return representation
\ No newline at end of file
+        return representation
+
+
+class AppointmentSeriesSerializer(serializers.ModelSerializer):
+
+    service_id = serializers.PrimaryKeyRelatedField(
+        queryset=Service.objects.all(), source='service', write_only=True
+    )
+    dates = serializers.SerializerMethodField()
+
+    class Meta:
+        model = AppointmentSeries
+        fields = ['id', 'doctor', 'service_id', 'start_date', 'time_slot', 'interval_weeks',
+                  'occurrences', 'reason_for_visit', 'dates']
+
+    def get_dates(self, obj):
+        return [day.isoformat() for day in obj.occurrence_dates()]
+
+    def validate(self, data):
+        # Every occurrence is checked in one pass: two queries for the doctor's
+        # schedule and leaves, one for existing bookings in the whole range.
+        series = AppointmentSeries(**data)
+        dates = series.occurrence_dates()
+        doctor_id = data['doctor'].pk
+        patient_id = self.context['request'].user.pk
+        slot = data['time_slot']
+        end = end_time_for(slot, data['service'].default_duration_min)
+
+        availability = AvailabilityIndex([doctor_id], dates[0], dates[-1])
+        booked = Appointment.objects.filter(
+            Q(doctor_id=doctor_id) | Q(patient_id=patient_id), date__in=dates
+        ).exclude(status='Cancelled')
+        doctor_booked, patient_booked = IntervalIndex(), IntervalIndex()
+        for booked_doctor, booked_patient, day, booked_start, booked_end in booked.values_list(
+            'doctor_id', 'patient_id', 'date', 'time_slot', 'end_time'
+        ):
+            if booked_doctor == doctor_id:
+                doctor_booked.add(day, booked_start, booked_end)
+            if booked_patient == patient_id:
+                patient_booked.add(day, booked_start, booked_end)
+
+        conflicts = []
+        for day in dates:
+            error = availability.check(doctor_id, day, slot)
+            if error is None and doctor_booked.overlaps(day, slot, end):
+                error = "This time slot is already booked for the doctor."
+            if error is None and patient_booked.overlaps(day, slot, end):
+                error = "You already have an appointment booked for this date and time."
+            if error:
+                conflicts.append({'date': day.isoformat(), 'error': error})
+
+        if conflicts:
+            raise serializers.ValidationError({'conflicts': conflicts})
+        return data
+
+    def create(self, validated_data):
+        with transaction.atomic():
+            series = AppointmentSeries.objects.create(**validated_data)
+            end = end_time_for(series.time_slot, series.service.default_duration_min)
+            Appointment.objects.bulk_create([
+                Appointment(
+                    patient=series.patient, doctor=series.doctor, service=series.service,
+                    date=day, time_slot=series.time_slot, end_time=end,
+                    reason_for_visit=series.reason_for_visit,
+                    series=series,
+                )
+                for day in series.occurrence_dates()
+            ])
+        return series
+
+
+class WaitlistEntrySerializer(serializers.ModelSerializer):
+
+    service_id = serializers.PrimaryKeyRelatedField(
+        queryset=Service.objects.all(), source='service', write_only=True
+    )
+    doctor_name = serializers.CharField(source='doctor.user.get_full_name', read_only=True)
+    service_name = serializers.CharField(source='service.name', read_only=True)
+
+    class Meta:
+        model = WaitlistEntry
+        fields = ['id', 'doctor', 'doctor_name', 'service_id', 'service_name', 'start_date', 'end_date',
+                  'auto_book', 'reason_for_visit', 'status', 'offered_date', 'offered_time_slot',
+                  'offer_expires_at', 'appointment', 'created_at']
+        read_only_fields = ['status', 'offered_date', 'offered_time_slot', 'offer_expires_at',
+                            'appointment', 'created_at']
+
+    def validate(self, data):
+        if data['start_date'] > data['end_date']:
+            raise serializers.ValidationError("End date cannot be before start date.")
+        if data['end_date'] < date.today():
+            raise serializers.ValidationError("The waitlist range must not be in the past.")
+
+        user = self.context['request'].user
+        already_waiting = WaitlistEntry.objects.filter(
+            patient_id=user.pk, doctor=data['doctor'], status__in=['Waiting', 'Offered']
+        ).exists()
+        if already_waiting:
+            raise serializers.ValidationError("You are already on this doctor's waitlist.")
+        return data
@@ -0,0 +1,48 @@
+"""
+Appointments occupy [time_slot, end_time), where end_time comes from the
+service's default duration. These helpers do the overlap arithmetic for
+the batch paths (import, series) that check many slots in memory.
+"""
+from bisect import bisect_left, insort
+from collections import defaultdict
+from datetime import time
+
+
+LAST_SECOND = 24 * 60 * 60 - 1
+
+
+def to_seconds(value):
+    return value.hour * 3600 + value.minute * 60 + value.second
+
+
+def end_time_for(start, duration_min):
+    # Zero-length services still occupy their start time; nothing runs past midnight.
+    seconds = min(to_seconds(start) + max(duration_min, 1) * 60, LAST_SECOND)
+    return time(seconds // 3600, seconds // 60 % 60, seconds % 60)
+
+
+class IntervalIndex:
+    """
+    Booked intervals per key (e.g. (doctor_id, date)), kept sorted by start.
+    An overlap test bisects to the intervals that start before `end` and no
+    earlier than `start - longest interval`, so it is O(log n) plus the few
+    intervals in that window.
+    """
+
+    def __init__(self):
+        self._intervals = defaultdict(list)
+        self._longest = 0
+
+    def add(self, key, start, end):
+        start, end = to_seconds(start), to_seconds(end)
+        insort(self._intervals[key], (start, end))
+        self._longest = max(self._longest, end - start)
+
+    def overlaps(self, key, start, end):
+        intervals = self._intervals.get(key)
+        if not intervals:
+            return False
+        start, end = to_seconds(start), to_seconds(end)
+        lo = bisect_left(intervals, (start - self._longest,))
+        hi = bisect_left(intervals, (end,))
+        return any(booked_end > start for _, booked_end in intervals[lo:hi])
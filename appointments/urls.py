@@ -1,16 +1,24 @@
 from django.urls import path
 from .views import (BookAppointmentView,PatientAppointmentListView,RescheduleAppointmentView,
                     CancelAppointmentView,DoctorAppointmentListView,CompleteAppointmentView,
-                    CreateFeedbackView,AdminTodayQueueView,UpdateAppointmentStatusView
+                    CreateFeedbackView,AdminTodayQueueView,UpdateAppointmentStatusView,ImportAppointmentsView,
+                    BookAppointmentSeriesView,WaitlistListCreateView,WaitlistEntryDeleteView,AcceptWaitlistOfferView,
+                    DoctorCalendarView
 )
 urlpatterns = [
     path('book/', BookAppointmentView.as_view(), name='book_appointment'),
+    path('book/series/', BookAppointmentSeriesView.as_view(), name='book_appointment_series'),
     path('my-appointments/', PatientAppointmentListView.as_view(), name='patient_history'),
     path('cancel/<int:pk>/', CancelAppointmentView.as_view(), name='cancel_appointment'),
     path('reschedule/<int:pk>/', RescheduleAppointmentView.as_view(), name='reschedule_appointment'),
     path('doctor/appointments/', DoctorAppointmentListView.as_view(), name='doctor_appointments'),
+    path('doctor/calendar/', DoctorCalendarView.as_view(), name='doctor_calendar'),
     path('doctor/complete/<int:pk>/', CompleteAppointmentView.as_view(), name='complete_appointment'),
     path('feedback/', CreateFeedbackView.as_view(), name='create_feedback'),
     path('admin/today/', AdminTodayQueueView.as_view(), name='admin_today_queue'),
     path('update_status/<int:pk>/', UpdateAppointmentStatusView.as_view(), name='update_status'),
+    path('waitlist/', WaitlistListCreateView.as_view(), name='waitlist'),
+    path('waitlist/<int:pk>/', WaitlistEntryDeleteView.as_view(), name='waitlist_leave'),
+    path('waitlist/<int:pk>/accept/', AcceptWaitlistOfferView.as_view(), name='waitlist_accept'),
+    path('admin/import/', ImportAppointmentsView.as_view(), name='import_appointments'),
 ]
\ No newline at end of file
@@ -1,6 +1,7 @@
 import threading
 from django.core.mail import send_mail
 from django.conf import settings
+from django.utils import timezone
 
 # 👇 Helper function that runs in the background
 def send_email_thread(subject, message, recipient_list):
@@ -63,4 +64,62 @@ def send_appointment_notification(appointment, action):
         target=send_email_thread,
         args=(subject, message, [patient_email])
     )
-    email_thread.start()
\ No newline at end of file
+    email_thread.start()
+
+
+def send_series_notification(series):
+    # One summary email for the whole series instead of one per occurrence.
+    patient_email = series.patient.user.email
+    if not patient_email:
+        print("❌ Error: Patient has no email address.")
+        return
+
+    patient_name = series.patient.user.first_name
+    doctor_name = series.doctor.user.get_full_name()
+    time_str = series.time_slot.strftime('%I:%M %p')
+    dates = "\n".join(f"  • {day.strftime('%A, %d %B %Y')}" for day in series.occurrence_dates())
+
+    subject = f"Recurring Appointments Confirmed: Dr. {doctor_name}"
+    message = (
+        f"Dear {patient_name},\n\n"
+        f"Your {series.occurrences} recurring appointments have been successfully booked.\n\n"
+        f"👨‍⚕️ Doctor: Dr. {doctor_name}\n"
+        f"⏰ Time: {time_str}\n"
+        f"📅 Dates:\n{dates}\n\n"
+        f"Thank you for choosing Dr. Mahajan's Clinic!"
+    )
+
+    email_thread = threading.Thread(
+        target=send_email_thread,
+        args=(subject, message, [patient_email])
+    )
+    email_thread.start()
+
+
+def send_waitlist_offer_notification(entry):
+    patient_email = entry.patient.user.email
+    if not patient_email:
+        print("❌ Error: Patient has no email address.")
+        return
+
+    patient_name = entry.patient.user.first_name
+    doctor_name = entry.doctor.user.get_full_name()
+    date_str = entry.offered_date.strftime('%A, %d %B %Y')
+    time_str = entry.offered_time_slot.strftime('%I:%M %p')
+    expires_str = timezone.localtime(entry.offer_expires_at).strftime('%I:%M %p')
+
+    subject = f"A slot with Dr. {doctor_name} is available"
+    message = (
+        f"Dear {patient_name},\n\n"
+        f"A slot you were waiting for has opened up.\n\n"
+        f"👨‍⚕️ Doctor: Dr. {doctor_name}\n"
+        f"📅 Date: {date_str}\n"
+        f"⏰ Time: {time_str}\n\n"
+        f"Accept it from your waitlist before {expires_str} to confirm the booking."
+    )
+
+    email_thread = threading.Thread(
+        target=send_email_thread,
+        args=(subject, message, [patient_email])
+    )
+    email_thread.start()
@@ -4,18 +4,28 @@ from django.shortcuts import render
 from rest_framework import generics, status,permissions
 from rest_framework.response import Response
 from rest_framework.exceptions import ValidationError, NotFound
-from .models import Appointment, Patient
+from .models import Appointment, Patient, WaitlistEntry
 from .serializers import (AppointmentBookingSerializer,AppointmentListSerializer,AppointmentRescheduleSerializer,
                           AppointmentCancelSerializer,DoctorAppointmentListSerializer,AppointmentCompleteSerializer,
-                          AppointmentSerializer)
-from core.permissions import IsPatient,IsDoctor
+                          AppointmentSerializer,AppointmentSeriesSerializer,WaitlistEntrySerializer)
+from core.permissions import IsPatient,IsDoctor,IsAdmin
+from core.mixins import IdempotencyMixin, ReplicaReadMixin
 from .serializers import FeedbackSerializer
-from datetime import date
-from .utils import send_appointment_notification
+from datetime import date, timedelta
+from .utils import send_appointment_notification, send_series_notification
+from .flat_serializers import appointment_rows, doctor_appointment_rows
+from .importer import AppointmentImporter, guess_format, read_rows
 from rest_framework.views import APIView
 from django.shortcuts import get_object_or_404
-
-class BookAppointmentView(generics.CreateAPIView):
+from django.db import IntegrityError, transaction
+from django.core.exceptions import ValidationError as DjangoValidationError
+from .waitlist import accept_offer, backfill_slot
+from .slots import end_time_for
+from .doctor_calendar import MAX_CALENDAR_DAYS, doctor_calendar
+from medical_records.billing import create_bill
+from archive.reads import archived_appointment_rows, needs_archive, requested_range
+
+class BookAppointmentView(IdempotencyMixin, generics.CreateAPIView):
     serializer_class = AppointmentBookingSerializer
     permission_classes = [IsPatient]
 
@@ -37,11 +47,13 @@ class BookAppointmentView(generics.CreateAPIView):
             raise NotFound({"error": "Patient profile not found. Please contact support."})
 
         
+        start = serializer.validated_data['time_slot']
         existing_appt = Appointment.objects.filter(
             patient=patient_profile,
             date=serializer.validated_data['date'],
-            time_slot=serializer.validated_data['time_slot']
-        ).exists()
+            time_slot__lt=end_time_for(start, serializer.validated_data['service'].default_duration_min),
+            end_time__gt=start
+        ).exclude(status='Cancelled').exists()
         
         if existing_appt:
             raise ValidationError({"error": "You already have an appointment booked for this date and time."})
@@ -54,13 +66,47 @@ class BookAppointmentView(generics.CreateAPIView):
 
 
 
-class PatientAppointmentListView(generics.ListAPIView):
+class BookAppointmentSeriesView(generics.CreateAPIView):
+    serializer_class = AppointmentSeriesSerializer
+    permission_classes = [IsPatient]
+
+    def perform_create(self, serializer):
+        try:
+            patient_profile = Patient.objects.get(user=self.request.user)
+        except Patient.DoesNotExist:
+            raise NotFound({"error": "Patient profile not found. Please contact support."})
+
+        try:
+            series = serializer.save(patient=patient_profile)
+        except IntegrityError:
+            raise ValidationError({"error": "One of these slots was just booked by someone else. Please try again."})
+
+        send_series_notification(series)
+
+
+class PatientAppointmentListView(ReplicaReadMixin, generics.ListAPIView):
     serializer_class = AppointmentListSerializer
     permission_classes = [IsPatient]
 
     def get_queryset(self):
         
-        return Appointment.objects.filter(patient__user=self.request.user).order_by('-date', '-time_slot')
+        start, end = requested_range(self.request.query_params)
+        queryset = Appointment.objects.filter(patient__user=self.request.user)
+        if start:
+            queryset = queryset.filter(date__gte=start)
+        if end:
+            queryset = queryset.filter(date__lte=end)
+        return queryset.order_by('-date', '-time_slot')
+
+    def list(self, request, *args, **kwargs):
+        rows = self.get_serializer(self.get_queryset(), many=True).data
+        start, end = requested_range(request.query_params)
+        if needs_archive(start):
+            rows = sorted(
+                [*rows, *archived_appointment_rows(request.user.pk, start, end)],
+                key=lambda row: (row['date'], row['time_slot']), reverse=True,
+            )
+        return Response(rows)
     
 class CancelAppointmentView(generics.UpdateAPIView):
     serializer_class = AppointmentCancelSerializer
@@ -80,6 +126,7 @@ class CancelAppointmentView(generics.UpdateAPIView):
             raise ValidationError("Cannot cancel a past appointment.")
         appointment = serializer.save(status='Cancelled')
         send_appointment_notification(appointment, 'cancelled')
+        backfill_slot(appointment.doctor_id, appointment.date, appointment.time_slot)
 
 class RescheduleAppointmentView(generics.UpdateAPIView):
     serializer_class = AppointmentRescheduleSerializer
@@ -98,7 +145,7 @@ class RescheduleAppointmentView(generics.UpdateAPIView):
 
 
 
-class DoctorAppointmentListView(generics.ListAPIView):
+class DoctorAppointmentListView(ReplicaReadMixin, generics.ListAPIView):
     serializer_class = DoctorAppointmentListSerializer
     permission_classes = [IsDoctor]
 
@@ -109,10 +156,37 @@ class DoctorAppointmentListView(generics.ListAPIView):
 
         if date_param == 'today':
             queryset = queryset.filter(date=date.today())  
+        # Plain date bounds let a partitioned table skip other months.
+        start, end = requested_range(self.request.query_params)
+        if start:
+            queryset = queryset.filter(date__gte=start)
+        if end:
+            queryset = queryset.filter(date__lte=end)
         return queryset.order_by('date', 'time_slot')
+
+    def list(self, request, *args, **kwargs):
+        return Response(doctor_appointment_rows(self.get_queryset()))
     
 
 
+class DoctorCalendarView(ReplicaReadMixin, APIView):
+    permission_classes = [IsDoctor]
+
+    def get(self, request):
+        try:
+            start = date.fromisoformat(request.query_params.get('from') or date.today().isoformat())
+            end = date.fromisoformat(request.query_params.get('to') or (start + timedelta(days=6)).isoformat())
+        except ValueError:
+            return Response({"error": "'from' and 'to' must be dates in YYYY-MM-DD format."}, status=status.HTTP_400_BAD_REQUEST)
+
+        if end < start:
+            return Response({"error": "'to' cannot be before 'from'."}, status=status.HTTP_400_BAD_REQUEST)
+        if (end - start).days >= MAX_CALENDAR_DAYS:
+            return Response({"error": f"The range cannot be longer than {MAX_CALENDAR_DAYS} days."}, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response(doctor_calendar(request.user.pk, start, end))
+
+
 
 class CompleteAppointmentView(generics.UpdateAPIView):
     
@@ -127,7 +201,9 @@ class CompleteAppointmentView(generics.UpdateAPIView):
 
         if appointment.status != 'Scheduled':
             raise ValidationError(f"Cannot complete an appointment that is {appointment.status}.")  
-        serializer.save(status='Completed')    
+        with transaction.atomic():
+            serializer.save(status='Completed')
+            create_bill(appointment.pk)
 
 
 
@@ -154,6 +230,9 @@ class AdminTodayQueueView(generics.ListAPIView):
         return Appointment.objects.filter(
             date=date.today()
         ).order_by('time_slot')
+
+    def list(self, request, *args, **kwargs):
+        return Response(appointment_rows(self.get_queryset()))
     
 
 
@@ -179,8 +258,95 @@ class UpdateAppointmentStatusView(APIView):
 
         
         if new_status:
+            freed = new_status == 'Cancelled' and appointment.status != 'Cancelled'
+            completed = new_status == 'Completed' and appointment.status != 'Completed'
+            reopened = appointment.status == 'Cancelled' and new_status != 'Cancelled'
             appointment.status = new_status
-            appointment.save()
+            try:
+                if reopened:
+                    # The slot may have been rebooked since it was cancelled.
+                    appointment.clean()
+                with transaction.atomic():
+                    appointment.save()
+                    if completed:
+                        create_bill(appointment.pk)
+            except DjangoValidationError as e:
+                return Response({"error": e.messages}, status=status.HTTP_400_BAD_REQUEST)
+            except IntegrityError:
+                return Response({"error": "This time slot is already booked for the doctor."},
+                                status=status.HTTP_400_BAD_REQUEST)
+            if freed:
+                backfill_slot(appointment.doctor_id, appointment.date, appointment.time_slot)
             return Response({"message": f"Status updated to {new_status}"}, status=200)
         
         return Response({"error": "Status is required"}, status=400)
+
+
+class ImportAppointmentsView(APIView):
+    """
+    Bulk import from a legacy calendar. Send the file as multipart `file`,
+    or the raw body with Content-Type text/csv or application/x-ndjson.
+    Add ?dry_run=1 to validate without inserting.
+    """
+    permission_classes = [IsAdmin]
+
+    def post(self, request):
+        upload = request.FILES.get('file') if request.content_type.startswith('multipart/') else None
+        if upload is not None:
+            fmt = guess_format(upload.name, upload.content_type)
+            stream = upload
+        else:
+            fmt = guess_format(content_type=request.content_type)
+            stream = request.stream
+
+        if fmt is None:
+            return Response({"error": "Upload a .csv or .ndjson file."}, status=status.HTTP_400_BAD_REQUEST)
+        if stream is None:
+            return Response({"error": "The import file is empty."}, status=status.HTTP_400_BAD_REQUEST)
+
+        dry_run = request.query_params.get('dry_run') in ('1', 'true')
+        result = AppointmentImporter(dry_run=dry_run).run(read_rows(stream, fmt))
+        return Response(result.as_dict(), status=status.HTTP_200_OK)
+
+
+class WaitlistListCreateView(generics.ListCreateAPIView):
+    serializer_class = WaitlistEntrySerializer
+    permission_classes = [IsPatient]
+
+    def get_queryset(self):
+        return WaitlistEntry.objects.filter(patient__user=self.request.user).select_related('doctor__user', 'service')
+
+    def perform_create(self, serializer):
+        try:
+            patient_profile = Patient.objects.get(user=self.request.user)
+        except Patient.DoesNotExist:
+            raise NotFound({"error": "Patient profile not found. Please contact support."})
+        serializer.save(patient=patient_profile)
+
+
+class WaitlistEntryDeleteView(generics.DestroyAPIView):
+    permission_classes = [IsPatient]
+
+    def get_queryset(self):
+        return WaitlistEntry.objects.filter(patient__user=self.request.user, status__in=['Waiting', 'Offered'])
+
+    def perform_destroy(self, instance):
+        offered = instance.status == 'Offered'
+        instance.delete()
+        if offered:
+            backfill_slot(instance.doctor_id, instance.offered_date, instance.offered_time_slot)
+
+
+class AcceptWaitlistOfferView(APIView):
+    permission_classes = [IsPatient]
+
+    def post(self, request, pk):
+        entry = get_object_or_404(WaitlistEntry.objects.select_related('patient__user', 'doctor__user', 'service'),
+                                  pk=pk, patient__user=request.user)
+        try:
+            appointment = accept_offer(entry)
+        except DjangoValidationError as e:
+            return Response({"error": e.messages}, status=status.HTTP_400_BAD_REQUEST)
+
+        send_appointment_notification(appointment, 'booked')
+        return Response(AppointmentListSerializer(appointment).data, status=status.HTTP_201_CREATED)
@@ -0,0 +1,129 @@
+from datetime import date
+
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import IntegrityError, transaction
+from django.db.models import Exists, OuterRef, Q
+from django.utils import timezone
+
+from .models import Appointment, WaitlistEntry
+from .slots import end_time_for
+from .utils import send_appointment_notification, send_waitlist_offer_notification
+
+
+def patient_overlaps(patient, day, start, end):
+    """Active appointments of `patient` overlapping [start, end); same interval rule as Appointment.clean()."""
+    return Appointment.objects.filter(
+        patient=patient, date=day, time_slot__lt=end, end_time__gt=start
+    ).exclude(status='Cancelled')
+
+
+def waiting_for_slot(doctor_id, day, time_slot):
+    """
+    Waiting entries whose range covers the slot, oldest first. Served by
+    waitlist_match_idx: equality on doctor/status, range on start_date.
+    Patients with an appointment overlapping the booking they would get
+    (which ends according to their entry's service) are skipped.
+    """
+    entries = WaitlistEntry.objects.filter(
+        doctor_id=doctor_id, status='Waiting', start_date__lte=day, end_date__gte=day
+    )
+    # One overlap test per distinct service duration among the candidates.
+    durations = set(entries.values_list('service__default_duration_min', flat=True))
+    free = Q()
+    for duration in durations:
+        busy = patient_overlaps(OuterRef('patient'), day, time_slot, end_time_for(time_slot, duration))
+        free |= Q(service__default_duration_min=duration) & ~Exists(busy)
+    return (
+        entries.filter(free)
+        .select_related('patient__user', 'doctor__user', 'service')
+        .order_by('created_at', 'pk')
+    )
+
+
+def book_from_waitlist(entry, day, time_slot, claim_from='Waiting'):
+    """
+    Book the slot for `entry`. The entry is claimed with a conditional
+    UPDATE on its `claim_from` status, so two requests racing for the same
+    entry cannot both book; the loser gets a DjangoValidationError.
+    """
+    appointment = Appointment(
+        patient=entry.patient, doctor=entry.doctor, service=entry.service,
+        date=day, time_slot=time_slot, reason_for_visit=entry.reason_for_visit,
+    )
+    if patient_overlaps(entry.patient_id, day, time_slot, appointment.compute_end_time()).exists():
+        raise DjangoValidationError("You already have an appointment booked for this date and time.")
+    with transaction.atomic():
+        claimed = WaitlistEntry.objects.filter(pk=entry.pk, status=claim_from).update(status='Booked')
+        if not claimed:
+            raise DjangoValidationError("This waitlist entry has already been handled.")
+        appointment.save()
+        entry.status = 'Booked'
+        entry.appointment = appointment
+        entry.save(update_fields=['appointment'])
+    return appointment
+
+
+def backfill_slot(doctor_id, day, time_slot):
+    """
+    Hand a freed slot to the first matching waitlist entry, either booking
+    it directly or offering it. Returns the entry, or None if nobody matched.
+    """
+    if day < date.today() or (day == date.today() and time_slot <= timezone.now().time()):
+        return None
+
+    for entry in waiting_for_slot(doctor_id, day, time_slot)[:20]:
+        if entry.auto_book:
+            try:
+                appointment = book_from_waitlist(entry, day, time_slot)
+            except DjangoValidationError:
+                # The patient booked something overlapping, or the slot is
+                # outside the doctor's hours now; try the next in line.
+                continue
+            except IntegrityError:
+                return None  # slot was taken meanwhile
+            send_appointment_notification(appointment, 'booked')
+            return entry
+
+        updated = WaitlistEntry.objects.filter(pk=entry.pk, status='Waiting').update(
+            status='Offered', offered_date=day, offered_time_slot=time_slot,
+            offer_expires_at=timezone.now() + WaitlistEntry.OFFER_TTL,
+        )
+        if not updated:
+            continue  # claimed by a concurrent cancellation
+        entry.refresh_from_db()
+        send_waitlist_offer_notification(entry)
+        return entry
+    return None
+
+
+def accept_offer(entry):
+    """Book the slot offered to `entry`. Raises DjangoValidationError if it can no longer be booked."""
+    if entry.status != 'Offered':
+        raise DjangoValidationError("There is no open offer on this waitlist entry.")
+
+    day, time_slot = entry.offered_date, entry.offered_time_slot
+    if entry.offer_expires_at < timezone.now():
+        expire_offer(entry)
+        raise DjangoValidationError("This offer has expired.")
+
+    try:
+        return book_from_waitlist(entry, day, time_slot, claim_from='Offered')
+    except IntegrityError:
+        raise DjangoValidationError("This slot has just been booked by someone else.")
+
+
+def expire_offer(entry):
+    """Close an unanswered offer and pass the slot on to the next patient in line."""
+    day, time_slot = entry.offered_date, entry.offered_time_slot
+    entry.status = 'Expired'
+    entry.save(update_fields=['status'])
+    backfill_slot(entry.doctor_id, day, time_slot)
+
+
+def expire_stale_offers():
+    stale = WaitlistEntry.objects.filter(status='Offered', offer_expires_at__lt=timezone.now())
+    count = 0
+    for entry in stale:
+        expire_offer(entry)
+        count += 1
+    return count
@@ -0,0 +1,21 @@
+from django.contrib import admin
+
+from .models import ArchivedAppointment, ArchiveWatermark
+
+
+@admin.register(ArchivedAppointment)
+class ArchivedAppointmentAdmin(admin.ModelAdmin):
+    list_display = ('id', 'patient', 'doctor', 'service', 'date', 'time_slot', 'status', 'archived_at')
+    list_filter = ('status', 'date')
+    search_fields = ('patient__user__email', 'doctor__user__email')
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(ArchiveWatermark)
+class ArchiveWatermarkAdmin(admin.ModelAdmin):
+    list_display = ('archived_before', 'updated_at')
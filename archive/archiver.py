@@ -0,0 +1,92 @@
+"""
+Moves old appointments, with their feedback, prescription, bill and
+payments, from the live tables into the archive tables in chunks. Each
+chunk is one transaction: rows are copied with bulk_create() and then
+deleted from the live tables, so a row is always in exactly one place.
+"""
+from datetime import date
+
+from django.db import transaction
+
+from appointments.models import Appointment, Feedback
+from medical_records.models import Bill, Payment, Prescription, PrescriptionItem
+from .models import (ArchivedAppointment, ArchivedBill, ArchivedFeedback, ArchivedPayment, ArchivedPrescription,
+                     ArchivedPrescriptionItem, ArchiveWatermark, get_archive_watermark)
+
+
+# Only finished appointments are archived; anything still open stays live.
+ARCHIVABLE_STATUSES = ('Completed', 'Cancelled', 'No-Show')
+
+APPOINTMENT_FIELDS = (
+    'id', 'patient_id', 'doctor_id', 'service_id', 'date', 'time_slot', 'end_time', 'status',
+    'reason_for_visit', 'booking_timestamp', 'series_id',
+)
+FEEDBACK_FIELDS = ('id', 'appointment_id', 'rating_score', 'comments', 'date_submitted')
+PRESCRIPTION_FIELDS = ('id', 'appointment_id', 'created_at', 'notes')
+PRESCRIPTION_ITEM_FIELDS = ('id', 'prescription_id', 'medicine_name', 'dosage', 'frequency', 'duration', 'instructions')
+BILL_FIELDS = ('id', 'appointment_id', 'amount', 'status', 'issued_date')
+PAYMENT_FIELDS = ('id', 'bill_id', 'amount_paid', 'payment_method', 'status', 'payment_date')
+
+
+def months_before(day, months):
+    """`day` moved back by whole months, clamped to the end of shorter months."""
+    month_index = day.year * 12 + day.month - 1 - months
+    year, month = divmod(month_index, 12)
+    for candidate in range(day.day, 0, -1):
+        try:
+            return date(year, month + 1, candidate)
+        except ValueError:
+            continue
+
+
+def archivable(before):
+    return Appointment.objects.filter(date__lt=before, status__in=ARCHIVABLE_STATUSES)
+
+
+def _copy(source, target, fields):
+    rows = [target(**row) for row in source.values(*fields)]
+    target.objects.bulk_create(rows)
+    return len(rows)
+
+
+def archive_chunk(ids):
+    """Move the appointments with these ids and their dependants. Returns the number of appointments moved."""
+    moved = _copy(Appointment.objects.filter(pk__in=ids), ArchivedAppointment, APPOINTMENT_FIELDS)
+    _copy(Feedback.objects.filter(appointment_id__in=ids), ArchivedFeedback, FEEDBACK_FIELDS)
+    _copy(Prescription.objects.filter(appointment_id__in=ids), ArchivedPrescription, PRESCRIPTION_FIELDS)
+    _copy(PrescriptionItem.objects.filter(prescription__appointment_id__in=ids), ArchivedPrescriptionItem,
+          PRESCRIPTION_ITEM_FIELDS)
+    _copy(Bill.objects.filter(appointment_id__in=ids), ArchivedBill, BILL_FIELDS)
+    _copy(Payment.objects.filter(bill__appointment_id__in=ids), ArchivedPayment, PAYMENT_FIELDS)
+
+    # Children first, so the final delete finds nothing left to cascade to.
+    Payment.objects.filter(bill__appointment_id__in=ids).delete()
+    Bill.objects.filter(appointment_id__in=ids).delete()
+    PrescriptionItem.objects.filter(prescription__appointment_id__in=ids).delete()
+    Prescription.objects.filter(appointment_id__in=ids).delete()
+    Feedback.objects.filter(appointment_id__in=ids).delete()
+    Appointment.objects.filter(pk__in=ids).delete()
+    return moved
+
+
+def archive_appointments(before, chunk_size=1000, log=None):
+    """
+    Archive every finished appointment dated before `before`. Returns the
+    number of appointments moved.
+    """
+    # Raise the watermark first: from now on reads below it include the
+    # archive, so rows moved by the chunks below never disappear from them.
+    current = get_archive_watermark()
+    if current is None or before > current:
+        ArchiveWatermark(archived_before=before).save()
+
+    moved = 0
+    while True:
+        with transaction.atomic():
+            ids = list(archivable(before).order_by('pk').values_list('pk', flat=True)[:chunk_size])
+            if not ids:
+                break
+            moved += archive_chunk(ids)
+        if log:
+            log(f"Archived {moved} appointment(s)...")
+    return moved
@@ -0,0 +1,28 @@
+from datetime import date
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from archive.archiver import archivable, archive_appointments, months_before
+
+
+class Command(BaseCommand):
+    help = "Move finished appointments older than N months, with their feedback, prescriptions, bills and payments, into the archive tables."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--months', type=int, default=settings.ARCHIVE_AFTER_MONTHS,
+                            help="Archive appointments older than this many months (default: ARCHIVE_AFTER_MONTHS).")
+        parser.add_argument('--chunk-size', type=int, default=1000)
+        parser.add_argument('--dry-run', action='store_true', help="Only report how many appointments would move.")
+
+    def handle(self, *args, **options):
+        if options['months'] < 1:
+            raise CommandError("--months must be at least 1.")
+        before = months_before(date.today(), options['months'])
+
+        if options['dry_run']:
+            self.stdout.write(f"{archivable(before).count()} appointment(s) dated before {before} would be archived.")
+            return
+
+        moved = archive_appointments(before, chunk_size=options['chunk_size'], log=self.stdout.write)
+        self.stdout.write(self.style.SUCCESS(f"Archived {moved} appointment(s) dated before {before}."))
@@ -0,0 +1,103 @@
+# Generated by Django 5.2.6 on 2026-10-19 16:30
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('appointments', '0015_appointment_end_time'),
+        ('medical_records', '0006_service_doctors'),
+        ('staff_management', '0011_doctorleave_range_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchiveWatermark',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('archived_before', models.DateField()),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ArchivedAppointment',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('date', models.DateField()),
+                ('time_slot', models.TimeField()),
+                ('end_time', models.TimeField()),
+                ('status', models.CharField(choices=[('Scheduled', 'Scheduled'), ('Completed', 'Completed'), ('Cancelled', 'Cancelled'), ('No-Show', 'No-Show'), ('Checked-In', 'Checked-In')], max_length=20)),
+                ('reason_for_visit', models.TextField(blank=True, null=True)),
+                ('booking_timestamp', models.DateTimeField()),
+                ('series_id', models.BigIntegerField(blank=True, null=True)),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+                ('doctor', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_appointments', to='staff_management.doctor')),
+                ('patient', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_appointments', to='appointments.patient')),
+                ('service', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, to='medical_records.service')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ArchivedBill',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('amount', models.DecimalField(blank=True, decimal_places=2, max_digits=10, null=True)),
+                ('status', models.CharField(max_length=10)),
+                ('issued_date', models.DateTimeField()),
+                ('appointment', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='bill', to='archive.archivedappointment')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ArchivedFeedback',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('rating_score', models.IntegerField()),
+                ('comments', models.TextField(blank=True, null=True)),
+                ('date_submitted', models.DateTimeField()),
+                ('appointment', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='feedback', to='archive.archivedappointment')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ArchivedPayment',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('amount_paid', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('payment_method', models.CharField(max_length=20)),
+                ('status', models.CharField(max_length=20)),
+                ('payment_date', models.DateTimeField()),
+                ('bill', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='payments', to='archive.archivedbill')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ArchivedPrescription',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField()),
+                ('notes', models.TextField(blank=True, null=True)),
+                ('appointment', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='prescription', to='archive.archivedappointment')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ArchivedPrescriptionItem',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('medicine_name', models.CharField(max_length=100)),
+                ('dosage', models.CharField(max_length=100)),
+                ('frequency', models.CharField(blank=True, max_length=100, null=True)),
+                ('duration', models.CharField(blank=True, max_length=100, null=True)),
+                ('instructions', models.CharField(blank=True, max_length=200, null=True)),
+                ('prescription', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='items', to='archive.archivedprescription')),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='archivedappointment',
+            index=models.Index(fields=['patient', 'date'], name='archived_patient_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='archivedappointment',
+            index=models.Index(fields=['doctor', 'date'], name='archived_doctor_date_idx'),
+        ),
+    ]
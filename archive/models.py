@@ -0,0 +1,105 @@
+"""
+Cold storage for old appointments and everything hanging off them. Rows
+keep their original primary keys, so ids seen by clients do not change when
+an appointment is archived.
+"""
+from django.core.cache import cache
+from django.db import models
+
+from appointments.models import Appointment, Patient
+from staff_management.models import Doctor
+
+
+class ArchivedAppointment(models.Model):
+    id = models.BigIntegerField(primary_key=True)
+    patient = models.ForeignKey(Patient, on_delete=models.CASCADE, related_name="archived_appointments")
+    doctor = models.ForeignKey(Doctor, on_delete=models.CASCADE, related_name="archived_appointments")
+    service = models.ForeignKey('medical_records.Service', on_delete=models.PROTECT)
+    date = models.DateField()
+    time_slot = models.TimeField()
+    end_time = models.TimeField()
+    status = models.CharField(max_length=20, choices=Appointment.STATUS_CHOICES)
+    reason_for_visit = models.TextField(null=True, blank=True)
+    booking_timestamp = models.DateTimeField()
+    series_id = models.BigIntegerField(null=True, blank=True)
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['patient', 'date'], name='archived_patient_date_idx'),
+            models.Index(fields=['doctor', 'date'], name='archived_doctor_date_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.patient} with {self.doctor} on {self.date} at {self.time_slot} (archived)"
+
+
+class ArchivedFeedback(models.Model):
+    id = models.BigIntegerField(primary_key=True)
+    appointment = models.OneToOneField(ArchivedAppointment, on_delete=models.CASCADE, related_name="feedback")
+    rating_score = models.IntegerField()
+    comments = models.TextField(null=True, blank=True)
+    date_submitted = models.DateTimeField()
+
+
+class ArchivedPrescription(models.Model):
+    id = models.BigIntegerField(primary_key=True)
+    appointment = models.OneToOneField(ArchivedAppointment, on_delete=models.CASCADE, related_name="prescription")
+    created_at = models.DateTimeField()
+    notes = models.TextField(blank=True, null=True)
+
+
+class ArchivedPrescriptionItem(models.Model):
+    id = models.BigIntegerField(primary_key=True)
+    prescription = models.ForeignKey(ArchivedPrescription, on_delete=models.CASCADE, related_name="items")
+    medicine_name = models.CharField(max_length=100)
+    dosage = models.CharField(max_length=100)
+    frequency = models.CharField(max_length=100, null=True, blank=True)
+    duration = models.CharField(max_length=100, blank=True, null=True)
+    instructions = models.CharField(max_length=200, blank=True, null=True)
+
+
+class ArchivedBill(models.Model):
+    id = models.BigIntegerField(primary_key=True)
+    appointment = models.OneToOneField(ArchivedAppointment, on_delete=models.CASCADE, related_name="bill")
+    amount = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
+    status = models.CharField(max_length=10)
+    issued_date = models.DateTimeField()
+
+
+class ArchivedPayment(models.Model):
+    id = models.BigIntegerField(primary_key=True)
+    bill = models.ForeignKey(ArchivedBill, on_delete=models.CASCADE, related_name="payments")
+    amount_paid = models.DecimalField(max_digits=10, decimal_places=2)
+    payment_method = models.CharField(max_length=20)
+    status = models.CharField(max_length=20)
+    payment_date = models.DateTimeField()
+
+
+class ArchiveWatermark(models.Model):
+    """
+    Single row. Every appointment dated before `archived_before` may be in
+    the archive; reads for ranges that start on or after it skip the
+    archive tables entirely.
+    """
+    archived_before = models.DateField()
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def save(self, *args, **kwargs):
+        self.pk = 1
+        super().save(*args, **kwargs)
+        cache.delete("archive_watermark")
+
+    def __str__(self):
+        return f"Archived before {self.archived_before}"
+
+
+def get_archive_watermark():
+    """The archive boundary date, or None if nothing has been archived."""
+    watermark = cache.get("archive_watermark")
+    if watermark is None:
+        row = ArchiveWatermark.objects.filter(pk=1).values_list('archived_before', flat=True).first()
+        # Cache "nothing archived" too, as False, so it costs no query either.
+        watermark = row or False
+        cache.set("archive_watermark", watermark, timeout=86400)
+    return watermark or None
@@ -0,0 +1,101 @@
+"""
+Archive side of the patient read paths. Callers check needs_archive()
+first, so requests whose range starts after the watermark never touch the
+archive tables.
+"""
+from datetime import date
+
+from rest_framework.exceptions import ValidationError
+
+from appointments.flat_serializers import date_field, full_name, time_field
+from .models import ArchivedAppointment, ArchivedPrescription, ArchivedPrescriptionItem, get_archive_watermark
+
+
+ARCHIVED_APPOINTMENT_COLUMNS = (
+    'id', 'doctor_id', 'doctor__user__first_name', 'doctor__user__last_name', 'service__name',
+    'date', 'time_slot', 'status', 'reason_for_visit',
+)
+
+ARCHIVED_PRESCRIPTION_COLUMNS = (
+    'id', 'appointment__doctor__user__first_name', 'appointment__doctor__user__last_name',
+    'appointment__date', 'appointment__reason_for_visit', 'notes',
+)
+
+
+def requested_range(query_params):
+    """Optional ?from=&to= dates. Raises ValidationError on bad input."""
+    try:
+        start = query_params.get('from')
+        end = query_params.get('to')
+        start = date.fromisoformat(start) if start else None
+        end = date.fromisoformat(end) if end else None
+    except ValueError:
+        raise ValidationError({"error": "'from' and 'to' must be dates in YYYY-MM-DD format."})
+    if start and end and end < start:
+        raise ValidationError({"error": "'to' cannot be before 'from'."})
+    return start, end
+
+
+def needs_archive(start):
+    watermark = get_archive_watermark()
+    return watermark is not None and (start is None or start < watermark)
+
+
+def _in_range(queryset, field, start, end):
+    if start:
+        queryset = queryset.filter(**{f'{field}__gte': start})
+    if end:
+        queryset = queryset.filter(**{f'{field}__lte': end})
+    return queryset
+
+
+def archived_appointment_rows(patient_id, start=None, end=None):
+    """Rows shaped like AppointmentListSerializer."""
+    date_repr = date_field.to_representation
+    time_repr = time_field.to_representation
+
+    queryset = _in_range(ArchivedAppointment.objects.filter(patient_id=patient_id), 'date', start, end)
+    return [
+        {
+            'id': pk,
+            'doctor': doctor_id,
+            'doctor_name': full_name(d_first, d_last),
+            'service_name': service_name,
+            'date': date_repr(day),
+            'time_slot': time_repr(slot),
+            'status': status,
+            'reason_for_visit': reason,
+        }
+        for pk, doctor_id, d_first, d_last, service_name, day, slot, status, reason
+        in queryset.order_by('-date', '-time_slot').values_list(*ARCHIVED_APPOINTMENT_COLUMNS)
+    ]
+
+
+def archived_prescription_rows(patient_id, start=None, end=None):
+    """Rows shaped like PrescriptionSerializer, items fetched in one extra query."""
+    queryset = _in_range(
+        ArchivedPrescription.objects.filter(appointment__patient_id=patient_id), 'appointment__date', start, end
+    )
+    prescriptions = list(queryset.order_by('-appointment__date').values_list(*ARCHIVED_PRESCRIPTION_COLUMNS))
+    if not prescriptions:
+        return []
+
+    items = {}
+    for prescription_id, *item in ArchivedPrescriptionItem.objects.filter(
+        prescription_id__in=[row[0] for row in prescriptions]
+    ).order_by('pk').values_list('prescription_id', 'medicine_name', 'dosage', 'frequency', 'duration', 'instructions'):
+        items.setdefault(prescription_id, []).append(
+            dict(zip(('medicine_name', 'dosage', 'frequency', 'duration', 'instructions'), item))
+        )
+
+    return [
+        {
+            'id': pk,
+            'doctor_name': full_name(d_first, d_last),
+            'date': date_field.to_representation(day),
+            'reason_for_visit': reason,
+            'notes': notes,
+            'items': items.get(pk, []),
+        }
+        for pk, d_first, d_last, day, reason, notes in prescriptions
+    ]
@@ -0,0 +1,262 @@
+import json
+from datetime import date, time, timedelta
+from functools import cached_property
+
+from django.urls import reverse
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from django.db.models import Q
+
+from appointments.models import Appointment
+from appointments.slots import IntervalIndex, end_time_for
+from core.models import User
+from medical_records.models import Bill, Service
+from staff_management.availability import AvailabilityIndex
+from staff_management.models import DoctorLeave
+from .generator import BENCH_DOMAIN, BENCH_PASSWORD
+
+
+SERIES_OCCURRENCES = 4
+
+URL_MODULES = ['core.urls', 'appointments.urls', 'medical_records.urls', 'staff_management.urls']
+
+
+class BenchContext:
+    """Picks the seeded rows each endpoint needs (ids, owners, free slots)."""
+
+    @cached_property
+    def admin(self):
+        return User.objects.filter(is_staff=True, role='Admin').order_by('pk').first()
+
+    @cached_property
+    def upcoming(self):
+        return (Appointment.objects.filter(status='Scheduled', date__gt=date.today())
+                .select_related('patient__user', 'doctor__user').order_by('date', 'pk').first())
+
+    @property
+    def patient(self):
+        return self.upcoming.patient.user
+
+    @property
+    def doctor(self):
+        return self.upcoming.doctor.user
+
+    @cached_property
+    def completed_without_feedback(self):
+        return (Appointment.objects.filter(status='Completed', feedback__isnull=True)
+                .select_related('patient__user').order_by('-date').first())
+
+    @cached_property
+    def without_prescription(self):
+        return (Appointment.objects.filter(status='Completed', prescription__isnull=True)
+                .select_related('doctor__user').order_by('-date').first())
+
+    @cached_property
+    def completed(self):
+        return Appointment.objects.filter(status='Completed').order_by('-date').first()
+
+    @cached_property
+    def unpaid_bill(self):
+        return Bill.objects.filter(status='Unpaid').order_by('pk').first()
+
+    @cached_property
+    def leave(self):
+        return DoctorLeave.objects.select_related('doctor__user').order_by('pk').first()
+
+    @cached_property
+    def pending_doctor(self):
+        return User.objects.filter(role='Doctor', is_active=False).order_by('pk').first()
+
+    @cached_property
+    def service(self):
+        return Service.objects.filter(doctors=self.upcoming.doctor).order_by('pk').first()
+
+    @cached_property
+    def free_slots(self):
+        """Two free, non-overlapping slots for `service` on a day the upcoming appointment's doctor is working."""
+        doctor = self.upcoming.doctor
+        duration = self.service.default_duration_min
+        for offset in range(1, 366):
+            day = date.today() + timedelta(days=offset)
+            if not doctor.is_available_on(day):
+                continue
+            schedule = doctor.schedules.filter(day_of_week=day.strftime('%A'), is_closed=False).first()
+            booked = IntervalIndex()
+            active = doctor.appointments.filter(date=day).exclude(status='Cancelled')
+            for start, end in active.values_list('time_slot', 'end_time'):
+                booked.add(day, start, end)
+            free = []
+            start = schedule.start_time
+            for minute in range(0, 180, 15):
+                slot = time(start.hour + minute // 60, minute % 60)
+                end = end_time_for(slot, duration)
+                if slot < schedule.end_time and not booked.overlaps(day, slot, end):
+                    free.append(slot)
+                    booked.add(day, slot, end)
+                if len(free) == 2:
+                    return day, free
+        raise LookupError("No free slot found for the benchmark doctor.")
+
+    @cached_property
+    def free_series(self):
+        """A start date and slot where SERIES_OCCURRENCES weekly bookings pass AppointmentSeriesSerializer."""
+        doctor_id, patient_id = self.upcoming.doctor_id, self.upcoming.patient_id
+        duration = self.service.default_duration_min
+        first, last = date.today() + timedelta(days=1), date.today() + timedelta(days=365)
+        horizon = last + timedelta(weeks=SERIES_OCCURRENCES)
+
+        availability = AvailabilityIndex([doctor_id], first, horizon)
+        doctor_booked, patient_booked = IntervalIndex(), IntervalIndex()
+        booked = Appointment.objects.filter(
+            Q(doctor_id=doctor_id) | Q(patient_id=patient_id), date__range=(first, horizon)
+        ).exclude(status='Cancelled')
+        for booked_doctor, booked_patient, day, start, end in booked.values_list(
+            'doctor_id', 'patient_id', 'date', 'time_slot', 'end_time'
+        ):
+            if booked_doctor == doctor_id:
+                doctor_booked.add(day, start, end)
+            if booked_patient == patient_id:
+                patient_booked.add(day, start, end)
+
+        def bookable(day, slot, end):
+            return (availability.check(doctor_id, day, slot) is None
+                    and not doctor_booked.overlaps(day, slot, end)
+                    and not patient_booked.overlaps(day, slot, end))
+
+        for offset in range((last - first).days + 1):
+            start_day = first + timedelta(days=offset)
+            if not availability.is_available_on(doctor_id, start_day):
+                continue
+            dates = [start_day + timedelta(weeks=i) for i in range(SERIES_OCCURRENCES)]
+            for minute in range(0, 24 * 60, 15):
+                slot = time(minute // 60, minute % 60)
+                end = end_time_for(slot, duration)
+                if all(bookable(day, slot, end) for day in dates):
+                    return start_day, slot
+        raise LookupError("No free weekly series found for the benchmark doctor.")
+
+    def refresh_token(self):
+        return str(RefreshToken.for_user(self.patient))
+
+
+class Endpoint:
+    def __init__(self, name, method, user=None, kwargs=None, data=None, mutates=False,
+                 content_type='application/json', expect=None):
+        self.name = name
+        self.method = method
+        self.user = user
+        self.kwargs = kwargs
+        self.data = data
+        self.mutates = mutates or method != 'GET'
+        self.content_type = content_type
+        self.expect = expect  # status the runner insists on, e.g. to rule out measuring a 400
+
+    def body(self, ctx):
+        if not self.data:
+            return ''
+        data = self.data(ctx)
+        return json.dumps(data) if self.content_type == 'application/json' else data
+
+
+def _slot(ctx, index):
+    day, slots = ctx.free_slots
+    return {'date': day.isoformat(), 'time_slot': slots[index].strftime('%H:%M')}
+
+
+def _import_rows(ctx):
+    rows = [
+        {'patient': ctx.patient.email, 'doctor': ctx.upcoming.doctor_id, 'service': ctx.service.name, **_slot(ctx, i)}
+        for i in range(2)
+    ]
+    return ''.join(json.dumps(row) + '\n' for row in rows)
+
+
+def _admin_batch(ctx):
+    paths = [
+        reverse('pending-doctors'),
+        reverse('admin-leave-list'),
+        reverse('admin_today_queue'),
+        reverse('get_generate_bill', kwargs={'appointment_id': ctx.completed.pk}),
+    ]
+    return {'requests': [{'method': 'GET', 'path': path} for path in paths]}
+
+
+ENDPOINTS = [
+    # core
+    Endpoint('patient-register', 'POST', data=lambda ctx: {
+        'email': f'new-patient@{BENCH_DOMAIN}', 'password': BENCH_PASSWORD, 'first_name': 'New',
+        'last_name': 'Patient', 'date_of_birth': '1990-01-01'}),
+    Endpoint('token_obtain_pair', 'POST', data=lambda ctx: {'email': ctx.patient.email, 'password': BENCH_PASSWORD}),
+    Endpoint('token_refresh', 'POST', data=lambda ctx: {'refresh': ctx.refresh_token()}),
+    Endpoint('patient-profile', 'GET', user=lambda ctx: ctx.patient),
+    Endpoint('patient-home', 'GET', user=lambda ctx: ctx.patient),
+    Endpoint('doctor-register', 'POST', data=lambda ctx: {
+        'email': f'new-doctor@{BENCH_DOMAIN}', 'password': BENCH_PASSWORD, 'first_name': 'New',
+        'last_name': 'Doctor', 'qualification': 'MBBS', 'experience_years': 3, 'consultation_fee': '300.00'}),
+    Endpoint('admin-reset-password', 'POST', user=lambda ctx: ctx.admin,
+             data=lambda ctx: {'email': ctx.patient.email, 'new_password': BENCH_PASSWORD}),
+    Endpoint('change-password', 'POST', user=lambda ctx: ctx.patient,
+             data=lambda ctx: {'old_password': BENCH_PASSWORD, 'new_password': 'changed-password'}),
+    Endpoint('pending-doctors', 'GET', user=lambda ctx: ctx.admin),
+    Endpoint('approve-doctor', 'POST', user=lambda ctx: ctx.admin, kwargs=lambda ctx: {'id': ctx.pending_doctor.pk}),
+    Endpoint('reject_doctor', 'DELETE', user=lambda ctx: ctx.admin, kwargs=lambda ctx: {'pk': ctx.pending_doctor.pk}),
+
+    # appointments
+    Endpoint('book_appointment', 'POST', user=lambda ctx: ctx.patient, data=lambda ctx: {
+        'doctor': ctx.upcoming.doctor_id, 'service_id': ctx.service.pk, 'reason_for_visit': 'Benchmark',
+        **_slot(ctx, 0)}),
+    Endpoint('book_appointment_series', 'POST', user=lambda ctx: ctx.patient, expect=201, data=lambda ctx: {
+        'doctor': ctx.upcoming.doctor_id, 'service_id': ctx.service.pk,
+        'start_date': ctx.free_series[0].isoformat(), 'time_slot': ctx.free_series[1].strftime('%H:%M'),
+        'interval_weeks': 1, 'occurrences': SERIES_OCCURRENCES}),
+    Endpoint('patient_history', 'GET', user=lambda ctx: ctx.patient),
+    Endpoint('cancel_appointment', 'PATCH', user=lambda ctx: ctx.patient, kwargs=lambda ctx: {'pk': ctx.upcoming.pk}),
+    Endpoint('reschedule_appointment', 'PATCH', user=lambda ctx: ctx.patient,
+             kwargs=lambda ctx: {'pk': ctx.upcoming.pk}, data=lambda ctx: _slot(ctx, 1)),
+    Endpoint('doctor_appointments', 'GET', user=lambda ctx: ctx.doctor),
+    Endpoint('doctor_calendar', 'GET', user=lambda ctx: ctx.doctor),
+    Endpoint('complete_appointment', 'PATCH', user=lambda ctx: ctx.doctor, kwargs=lambda ctx: {'pk': ctx.upcoming.pk}),
+    Endpoint('create_feedback', 'POST', user=lambda ctx: ctx.completed_without_feedback.patient.user,
+             data=lambda ctx: {'appointment': ctx.completed_without_feedback.pk, 'rating_score': 5}),
+    Endpoint('admin_today_queue', 'GET', user=lambda ctx: ctx.admin),
+    Endpoint('update_status', 'PATCH', user=lambda ctx: ctx.admin, kwargs=lambda ctx: {'pk': ctx.upcoming.pk},
+             data=lambda ctx: {'status': 'Checked-In'}),
+    Endpoint('waitlist', 'POST', user=lambda ctx: ctx.patient, data=lambda ctx: {
+        'doctor': ctx.upcoming.doctor_id, 'service_id': ctx.service.pk,
+        'start_date': ctx.upcoming.date.isoformat(), 'end_date': ctx.upcoming.date.isoformat()}),
+    Endpoint('import_appointments', 'POST', user=lambda ctx: ctx.admin, data=_import_rows,
+             content_type='application/x-ndjson'),
+
+    # medical_records / finance
+    Endpoint('medical_history', 'GET', user=lambda ctx: ctx.patient),
+    Endpoint('patient_bills', 'GET', user=lambda ctx: ctx.patient),
+    Endpoint('create_prescription', 'POST', user=lambda ctx: ctx.without_prescription.doctor.user, data=lambda ctx: {
+        'appointment': ctx.without_prescription.pk, 'notes': 'Rest',
+        'items': [{'medicine_name': 'Paracetamol', 'dosage': '500mg'}]}),
+    Endpoint('service_list', 'GET', user=lambda ctx: ctx.patient),
+    Endpoint('get_generate_bill', 'GET', user=lambda ctx: ctx.admin,
+             kwargs=lambda ctx: {'appointment_id': ctx.completed.pk}),
+    Endpoint('generate_bills', 'POST', user=lambda ctx: ctx.admin),
+    Endpoint('add_payment', 'POST', user=lambda ctx: ctx.admin,
+             data=lambda ctx: {'bill_id': ctx.unpaid_bill.pk, 'amount': '10.00', 'method': 'UPI'}),
+    Endpoint('service-list-create', 'GET', user=lambda ctx: ctx.admin),
+    Endpoint('service-detail', 'GET', user=lambda ctx: ctx.admin, kwargs=lambda ctx: {'pk': ctx.service.pk}),
+
+    # staff_management
+    Endpoint('doctor_schedule', 'GET', user=lambda ctx: ctx.doctor),
+    Endpoint('doctor_profile_update', 'GET', user=lambda ctx: ctx.doctor),
+    Endpoint('doctor-list', 'GET', user=lambda ctx: ctx.patient),
+    Endpoint('public_doctor_schedule', 'GET', user=lambda ctx: ctx.patient,
+             kwargs=lambda ctx: {'doctor_id': ctx.upcoming.doctor_id}),
+    Endpoint('public_doctor_leaves', 'GET', user=lambda ctx: ctx.patient,
+             kwargs=lambda ctx: {'doctor_id': ctx.leave.doctor_id}),
+    Endpoint('delete_leave', 'DELETE', user=lambda ctx: ctx.leave.doctor.user, kwargs=lambda ctx: {'pk': ctx.leave.pk}),
+    Endpoint('admin-leave-list', 'GET', user=lambda ctx: ctx.admin),
+    Endpoint('admin-leave-update', 'PATCH', user=lambda ctx: ctx.admin, kwargs=lambda ctx: {'pk': ctx.leave.pk},
+             data=lambda ctx: {'status': 'Rejected'}),
+    Endpoint('doctors-list', 'GET'),
+    Endpoint('doctor-my-leave', 'GET', user=lambda ctx: ctx.leave.doctor.user),
+
+    # project
+    Endpoint('batch', 'POST', user=lambda ctx: ctx.admin, data=_admin_batch),
+]
@@ -0,0 +1,314 @@
+"""
+Deterministic, high-throughput synthetic data for load tests.
+
+Rows are generated as plain value lists with primary keys allocated up
+front, so children (bills, payments, prescriptions...) never need a
+round trip to learn their parent's id. Each table is written in chunks:
+on SQLite through executemany() with per-column values prepared once and
+memoised (dates, times and prices repeat constantly), elsewhere through
+bulk_create(). Model save(), full_clean() and signals are all bypassed.
+"""
+import random
+import time as perf
+from datetime import date, time, timedelta
+from decimal import Decimal
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.color import no_style
+from django.db import connections, transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from appointments.models import Appointment, Feedback, Patient
+from appointments.slots import end_time_for
+from core.models import User
+from core.versioning import bump_resource_version
+from medical_records.models import Bill, Payment, Prescription, PrescriptionItem, Service
+from staff_management.models import Doctor, DoctorLeave, Schedule, get_shifts
+from staff_management.ratings import rebuild_ratings
+
+
+DAYS = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+
+SLOT_MINUTES = 15
+
+SERVICES = [
+    ('General Consultation', 15, '200.00'),
+    ('Follow-up', 15, '150.00'),
+    ('Physiotherapy', 45, '600.00'),
+    ('Dialysis', 60, '2500.00'),
+    ('Vaccination', 15, '350.00'),
+    ('ECG', 30, '400.00'),
+]
+
+FIRST_NAMES = ['Aarav', 'Vivaan', 'Aditya', 'Diya', 'Ananya', 'Sadiya', 'Imran', 'Meera', 'Kabir', 'Zoya']
+LAST_NAMES = ['Sharma', 'Khan', 'Patel', 'Iyer', 'Mahajan', 'Aslam', 'Reddy', 'Das', 'Gupta', 'Nair']
+MEDICINES = [('Paracetamol', '500mg'), ('Amoxicillin', '250mg'), ('Cetirizine', '10mg'), ('Pantoprazole', '40mg')]
+REASONS = [None, 'Fever', 'Back pain', 'Routine check-up', 'Follow-up']
+
+BENCH_PASSWORD = 'bench-password'
+BENCH_DOMAIN = 'bench.example.com'
+
+PREPARED_TYPES = {'DateField', 'TimeField', 'DateTimeField', 'DecimalField'}
+
+
+class TableWriter:
+    """Buffers rows for one model and writes them in chunks with explicit ids."""
+
+    def __init__(self, model, connection):
+        self.model = model
+        self.connection = connection
+        # Generated columns (Appointment.active_slot) are computed by the database.
+        self.fields = [f for f in model._meta.concrete_fields if not f.generated]
+        self.index = {f.attname: i for i, f in enumerate(self.fields)}
+        self.pk_index = self.index[model._meta.pk.attname]
+
+        now = timezone.now()
+        self.defaults = [
+            now if getattr(f, 'auto_now', False) or getattr(f, 'auto_now_add', False) else f.get_default()
+            for f in self.fields
+        ]
+        self.memos = [{} if f.get_internal_type() in PREPARED_TYPES else None for f in self.fields]
+
+        quote = connection.ops.quote_name
+        self.sql = "INSERT INTO %s (%s) VALUES (%s)" % (
+            quote(model._meta.db_table),
+            ", ".join(quote(f.column) for f in self.fields),
+            ", ".join(["%s"] * len(self.fields)),
+        )
+        self.next_id = (model.objects.using(connection.alias).aggregate(m=Max('pk'))['m'] or 0) + 1
+        self.rows = []
+        self.written = 0
+
+    def add(self, **values):
+        row = self.defaults.copy()
+        if self.model._meta.pk.attname not in values:
+            row[self.pk_index] = self.next_id
+            self.next_id += 1
+        for name, value in values.items():
+            row[self.index[name]] = value
+        self.rows.append(row)
+        return row[self.pk_index]
+
+    def _prepare(self, field, memo, value):
+        prepared = memo.get(value)
+        if prepared is None:
+            if len(memo) > 100000:
+                memo.clear()
+            prepared = memo[value] = field.get_db_prep_save(value, self.connection)
+        return prepared
+
+    def flush(self):
+        if not self.rows:
+            return
+        if self.connection.vendor == 'sqlite':
+            prepared_columns = [(i, f, m) for i, (f, m) in enumerate(zip(self.fields, self.memos)) if m is not None]
+            for row in self.rows:
+                for i, field, memo in prepared_columns:
+                    if row[i] is not None:
+                        row[i] = self._prepare(field, memo, row[i])
+            with self.connection.cursor() as cursor:
+                cursor.executemany(self.sql, self.rows)
+        else:
+            names = [f.attname for f in self.fields]
+            self.model.objects.using(self.connection.alias).bulk_create(
+                [self.model(**dict(zip(names, row))) for row in self.rows]
+            )
+        self.written += len(self.rows)
+        self.rows = []
+
+
+class HospitalDataGenerator:
+    """
+    Generates doctors (with schedules and leaves), patients, services and
+    appointments with bills, payments, prescriptions and feedback. The same
+    seed and sizes always produce the same rows. Unique constraints hold by
+    construction: emails/phones are numbered, schedules are one per
+    (doctor, day, shift), and appointments walk each doctor's free slots.
+    Every account uses BENCH_PASSWORD, hashed once.
+    """
+
+    def __init__(self, doctors=200, patients=5000, appointments=100000, past_days=180, future_days=30,
+                 seed=42, chunk_size=20000, using='default'):
+        self.doctors = doctors
+        self.patients = patients
+        self.appointments = appointments
+        self.past_days = past_days
+        self.future_days = future_days
+        self.rng = random.Random(seed)
+        self.chunk_size = chunk_size
+        self.connection = connections[using]
+        self.today = date.today()
+        self.writers = {}
+
+    def writer(self, model):
+        if model not in self.writers:
+            self.writers[model] = TableWriter(model, self.connection)
+        return self.writers[model]
+
+    def flush(self):
+        # Parents before children.
+        with transaction.atomic(using=self.connection.alias):
+            for writer in self.writers.values():
+                writer.flush()
+
+    def run(self, log=print):
+        started = perf.perf_counter()
+        with self.fast_sqlite():
+            self.generate_staff()
+            self.flush()
+            log(f"Generated {self.doctors} doctors and {self.patients} patients.")
+            self.generate_appointments(log)
+            self.flush()
+            self.reset_sequences()
+            # Feedback rows were written straight to the table, past the signal that keeps ratings.
+            log(f"Rated {rebuild_ratings()} doctors.")
+
+        bump_resource_version('doctors', 'services')
+        elapsed = perf.perf_counter() - started
+        counts = {writer.model.__name__: writer.written for writer in self.writers.values()}
+        total = sum(counts.values())
+        log(f"Wrote {total} rows in {elapsed:.1f}s ({total / elapsed:,.0f} rows/sec): "
+            + ", ".join(f"{name}={count}" for name, count in counts.items()))
+        return counts, elapsed
+
+    def fast_sqlite(self):
+        generator = self
+
+        class FastSQLite:
+            def __enter__(self):
+                if generator.connection.vendor == 'sqlite':
+                    with generator.connection.cursor() as cursor:
+                        cursor.execute('PRAGMA synchronous = OFF')
+
+            def __exit__(self, *exc):
+                if generator.connection.vendor == 'sqlite':
+                    with generator.connection.cursor() as cursor:
+                        cursor.execute('PRAGMA synchronous = FULL')
+
+        return FastSQLite()
+
+    def reset_sequences(self):
+        if self.connection.vendor == 'sqlite':
+            return  # AUTOINCREMENT follows explicit ids on its own
+        models = [writer.model for writer in self.writers.values()]
+        with self.connection.cursor() as cursor:
+            for sql in self.connection.ops.sequence_reset_sql(no_style(), models):
+                cursor.execute(sql)
+
+    def generate_staff(self):
+        rng = self.rng
+        password = make_password(BENCH_PASSWORD)
+        users, doctors, schedules = self.writer(User), self.writer(Doctor), self.writer(Schedule)
+        leaves, patients = self.writer(DoctorLeave), self.writer(Patient)
+        services, service_doctors = self.writer(Service), self.writer(Service.doctors.through)
+
+        users.add(email=f'admin@{BENCH_DOMAIN}', first_name='Bench', last_name='Admin', role='Admin',
+                  password=password, is_staff=True, is_superuser=True)
+
+        self.doctor_ids = []
+        self.leaves = {}
+        for i in range(self.doctors):
+            user_id = users.add(
+                email=f'doctor{i}@{BENCH_DOMAIN}', first_name=rng.choice(FIRST_NAMES),
+                last_name=rng.choice(LAST_NAMES), role='Doctor', password=password,
+                is_active=i % 50 != 49,  # a few pending approvals
+            )
+            doctors.add(user_id=user_id, qualification='MBBS', experience_years=rng.randrange(1, 30),
+                        consultation_fee=Decimal(rng.choice([200, 300, 500])))
+            for day in DAYS:
+                for shift in get_shifts().values():
+                    schedules.add(doctor_id=user_id, day_of_week=day, shift=shift.name,
+                                  start_time=shift.start_time, end_time=shift.end_time)
+            if i % 5 == 0:
+                start = self.today + timedelta(days=rng.randrange(1, self.future_days + 1))
+                end = start + timedelta(days=rng.randrange(0, 4))
+                self.leaves[user_id] = (start, end)
+                leaves.add(doctor_id=user_id, start_date=start, end_date=end, reason='Conference')
+            self.doctor_ids.append(user_id)
+
+        self.patient_ids = []
+        for i in range(self.patients):
+            user_id = users.add(
+                email=f'patient{i}@{BENCH_DOMAIN}', first_name=rng.choice(FIRST_NAMES),
+                last_name=rng.choice(LAST_NAMES), role='Patient', password=password,
+                phone_number=f'+91{9000000000 + i}',
+            )
+            patients.add(user_id=user_id, date_of_birth=date(1950 + i % 60, 1 + i % 12, 1 + i % 28))
+            self.patient_ids.append(user_id)
+
+        self.services = []
+        for name, duration, price in SERVICES:
+            price = Decimal(price)
+            service_id = services.add(name=f'{name} ({BENCH_DOMAIN})', default_duration_min=duration, base_price=price)
+            self.services.append((service_id, price, duration))
+            for doctor_id in self.doctor_ids:
+                service_doctors.add(service_id=service_id, doctor_id=doctor_id)
+
+    def slots(self):
+        """Yields (doctor_id, date, time) for a random but even spread of free slots."""
+        rng = self.rng
+        day_slots = []
+        for shift in get_shifts().values():
+            minutes = shift.start_time.hour * 60 + shift.start_time.minute
+            while minutes < shift.end_time.hour * 60 + shift.end_time.minute:
+                day_slots.append(time(minutes // 60, minutes % 60))
+                minutes += SLOT_MINUTES
+
+        total_days = self.past_days + self.future_days + 1
+        fill = self.appointments / (len(day_slots) * len(self.doctor_ids) * total_days)
+        # Longer services cover the following slots, which are then skipped;
+        # raise the sampling rate so the requested count is still reached.
+        covered = sum(-(-duration // SLOT_MINUTES) for _, _, duration in self.services) / len(self.services)
+        occupancy = 1.0 if fill * (covered - 1) >= 1 else min(1.0, fill / (1 - fill * (covered - 1)))
+        for offset in range(-self.past_days, self.future_days + 1):
+            day = self.today + timedelta(days=offset)
+            for doctor_id in self.doctor_ids:
+                leave = self.leaves.get(doctor_id)
+                if leave and leave[0] <= day <= leave[1]:
+                    continue
+                for slot in day_slots:
+                    if rng.random() < occupancy:
+                        yield doctor_id, day, slot
+
+    def generate_appointments(self, log):
+        rng = self.rng
+        appointments, bills, payments = self.writer(Appointment), self.writer(Bill), self.writer(Payment)
+        prescriptions, items = self.writer(Prescription), self.writer(PrescriptionItem)
+        feedback = self.writer(Feedback)
+        past_statuses = ['Completed'] * 17 + ['Cancelled'] * 2 + ['No-Show']
+
+        created = 0
+        busy_until = None  # (doctor_id, day, end) of the previous appointment, to keep a doctor's day non-overlapping
+        for doctor_id, day, slot in self.slots():
+            if created == self.appointments:
+                break
+            if busy_until and busy_until[:2] == (doctor_id, day) and slot < busy_until[2]:
+                continue
+            service_id, price, duration = rng.choice(self.services)
+            end_time = end_time_for(slot, duration)
+            busy_until = (doctor_id, day, end_time)
+            status = rng.choice(past_statuses) if day < self.today else 'Scheduled'
+            appointment_id = appointments.add(
+                patient_id=rng.choice(self.patient_ids), doctor_id=doctor_id, service_id=service_id,
+                date=day, time_slot=slot, end_time=end_time, status=status, reason_for_visit=rng.choice(REASONS),
+            )
+            created += 1
+
+            if status == 'Completed':
+                paid = rng.random() < 0.7
+                bill_id = bills.add(appointment_id=appointment_id, amount=price, status='Paid' if paid else 'Unpaid')
+                if paid:
+                    payments.add(bill_id=bill_id, amount_paid=price, payment_method=rng.choice(['Cash', 'Card', 'UPI']),
+                                 status='Completed')
+                if rng.random() < 0.5:
+                    prescription_id = prescriptions.add(appointment_id=appointment_id, notes='Drink plenty of water')
+                    for name, dosage in rng.sample(MEDICINES, rng.randrange(1, 4)):
+                        items.add(prescription_id=prescription_id, medicine_name=name, dosage=dosage,
+                                  frequency='1-0-1', duration='5 days')
+                if rng.random() < 0.3:
+                    feedback.add(appointment_id=appointment_id, rating_score=rng.randrange(1, 6))
+
+            if len(appointments.rows) >= self.chunk_size:
+                self.flush()
+                log(f"  {created} appointments")
@@ -0,0 +1,147 @@
+import json
+import logging
+import platform
+import time as perf
+from datetime import datetime
+from importlib import import_module
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test import Client
+from django.test.utils import override_settings
+from django.urls import reverse
+from rest_framework_simplejwt.tokens import AccessToken
+
+from benchmarks.endpoints import ENDPOINTS, URL_MODULES, BenchContext
+from core.middleware import QueryCounter
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, round(fraction * (len(ordered) - 1)))]
+
+
+class Command(BaseCommand):
+    help = "Exercise every API endpoint against the current database and report p50/p95 latency and query counts."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=20)
+        parser.add_argument('--output', default='bench_output.json')
+        parser.add_argument('--only', nargs='*', help="Restrict the run to these URL names.")
+        parser.add_argument('--compare', help="Previous JSON report to compare against.")
+        parser.add_argument('--tolerance', type=float, default=0.2,
+                            help="Relative p50 slowdown reported as a regression (default 0.2 = 20%%).")
+
+    def handle(self, *args, **options):
+        ctx = BenchContext()
+        if ctx.upcoming is None:
+            raise CommandError("No upcoming appointment found; run seed_hospital first.")
+
+        self.warn_uncovered()
+        # Query counts are part of the report; skip the per-request budget warnings.
+        logging.getLogger('core.middleware').setLevel(logging.ERROR)
+        endpoints = [e for e in ENDPOINTS if not options['only'] or e.name in options['only']]
+
+        results = {}
+        # Every iteration comes from the same client; keep the throttles in
+        # the measured path but with buckets too large to ever run dry.
+        rates = {scope: '1000000/s' for scope in settings.THROTTLE_RATES}
+        with override_settings(EMAIL_BACKEND='django.core.mail.backends.locmem.EmailBackend', THROTTLE_RATES=rates):
+            for endpoint in endpoints:
+                try:
+                    results[endpoint.name] = self.run_endpoint(ctx, endpoint, options['iterations'])
+                except Exception as exc:
+                    results[endpoint.name] = {'error': f"{type(exc).__name__}: {exc}"}
+                self.print_result(endpoint.name, results[endpoint.name])
+
+        report = {
+            'meta': {
+                'created': datetime.now().isoformat(timespec='seconds'),
+                'database': connection.vendor,
+                'python': platform.python_version(),
+                'iterations': options['iterations'],
+            },
+            'endpoints': results,
+        }
+        with open(options['output'], 'w') as fh:
+            json.dump(report, fh, indent=2)
+        self.stdout.write(self.style.SUCCESS(f"Wrote {options['output']}"))
+
+        if options['compare']:
+            self.compare(options['compare'], results, options['tolerance'])
+
+    def run_endpoint(self, ctx, endpoint, iterations):
+        client = Client(raise_request_exception=False)
+        headers = {}
+        if endpoint.user:
+            headers['HTTP_AUTHORIZATION'] = f"Bearer {AccessToken.for_user(endpoint.user(ctx))}"
+        path = reverse(endpoint.name, kwargs=endpoint.kwargs(ctx) if endpoint.kwargs else None)
+        body = endpoint.body(ctx)
+
+        latencies, queries, statuses = [], [], set()
+        for i in range(iterations + 1):
+            counter = QueryCounter()
+            with transaction.atomic(), connection.execute_wrapper(counter):
+                started = perf.perf_counter()
+                response = client.generic(endpoint.method, path, body, content_type=endpoint.content_type, **headers)
+                elapsed = perf.perf_counter() - started
+                # Writes are rolled back so every iteration sees the same data.
+                transaction.set_rollback(endpoint.mutates)
+            if endpoint.expect and response.status_code != endpoint.expect:
+                raise CommandError(
+                    f"expected {endpoint.expect}, got {response.status_code}: {response.content[:200].decode(errors='replace')}"
+                )
+            if i == 0:
+                continue  # warm-up
+            latencies.append(elapsed * 1000)
+            queries.append(counter.count)
+            statuses.add(response.status_code)
+
+        return {
+            'method': endpoint.method,
+            'path': path,
+            'status': sorted(statuses),
+            'p50_ms': round(percentile(latencies, 0.5), 3),
+            'p95_ms': round(percentile(latencies, 0.95), 3),
+            'mean_ms': round(sum(latencies) / len(latencies), 3),
+            'queries': max(queries),
+        }
+
+    def print_result(self, name, result):
+        if 'error' in result:
+            self.stdout.write(self.style.ERROR(f"{name:<28} {result['error']}"))
+            return
+        self.stdout.write(
+            f"{name:<28}{result['method']:>7} {','.join(map(str, result['status'])):>8}"
+            f"{result['p50_ms']:>10.2f} ms{result['p95_ms']:>10.2f} ms{result['queries']:>6} q"
+        )
+
+    def warn_uncovered(self):
+        covered = {e.name for e in ENDPOINTS}
+        for module in URL_MODULES:
+            for pattern in import_module(module).urlpatterns:
+                if pattern.name and pattern.name not in covered:
+                    self.stdout.write(self.style.WARNING(f"{module}: '{pattern.name}' has no benchmark entry"))
+
+    def compare(self, path, results, tolerance):
+        with open(path) as fh:
+            baseline = json.load(fh)['endpoints']
+
+        regressions = 0
+        for name, result in results.items():
+            before = baseline.get(name)
+            if not before or 'error' in before or 'error' in result:
+                continue
+            slower = result['p50_ms'] > before['p50_ms'] * (1 + tolerance)
+            more_queries = result['queries'] > before['queries']
+            if slower or more_queries:
+                regressions += 1
+                self.stdout.write(self.style.WARNING(
+                    f"{name}: p50 {before['p50_ms']} -> {result['p50_ms']} ms, "
+                    f"queries {before['queries']} -> {result['queries']}"
+                ))
+        if regressions:
+            self.stdout.write(self.style.WARNING(f"{regressions} endpoint(s) regressed against {path}"))
+        else:
+            self.stdout.write(self.style.SUCCESS(f"No regressions against {path}"))
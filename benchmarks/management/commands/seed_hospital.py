@@ -0,0 +1,43 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from core.models import User
+from benchmarks.generator import BENCH_DOMAIN, HospitalDataGenerator
+
+
+TARGET_ROWS_PER_SEC = 50000
+
+
+class Command(BaseCommand):
+    help = "Seed a synthetic hospital (doctors, schedules, leaves, appointments, bills...) for benchmarking."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--doctors', type=int, default=200)
+        parser.add_argument('--patients', type=int, default=5000)
+        parser.add_argument('--appointments', type=int, default=100000)
+        parser.add_argument('--past-days', type=int, default=180)
+        parser.add_argument('--future-days', type=int, default=30)
+        parser.add_argument('--chunk-size', type=int, default=20000)
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--allow-non-debug', action='store_true',
+                            help="Seed even though DEBUG is off. The rows go into DATABASE_URL, whatever it points at.")
+
+    def handle(self, *args, **options):
+        if not settings.DEBUG and not options['allow_non_debug']:
+            raise CommandError(
+                "Refusing to seed synthetic data with DEBUG off; this may be a production database. "
+                "Pass --allow-non-debug if it really is a benchmark database."
+            )
+        if User.objects.filter(email__endswith=f'@{BENCH_DOMAIN}').exists():
+            raise CommandError("Benchmark data is already seeded; use a fresh database.")
+
+        generator = HospitalDataGenerator(
+            doctors=options['doctors'], patients=options['patients'], appointments=options['appointments'],
+            past_days=options['past_days'], future_days=options['future_days'],
+            seed=options['seed'], chunk_size=options['chunk_size'],
+        )
+        counts, elapsed = generator.run(log=self.stdout.write)
+
+        rate = sum(counts.values()) / elapsed
+        if rate < TARGET_ROWS_PER_SEC:
+            self.stdout.write(self.style.WARNING(f"Below the {TARGET_ROWS_PER_SEC:,} rows/sec target."))
@@ -0,0 +1,115 @@
+"""
+Runs several API calls inside one HTTP request. Each sub-request is
+resolved with the normal URL resolver and dispatched to its view in-process,
+reusing the batch request's authenticated user and the same DB connection.
+"""
+import json
+import logging
+from io import BytesIO
+from urllib.parse import urlsplit
+
+from django.core.handlers.wsgi import WSGIRequest
+from django.http import Http404
+from django.urls import Resolver404, resolve
+
+from .replicas import mark_recent_write, replica_aliases
+
+logger = logging.getLogger(__name__)
+
+
+MAX_BATCH_REQUESTS = 20
+BATCH_METHODS = ('GET', 'POST', 'PUT', 'PATCH', 'DELETE')
+BATCH_PREFIX = '/api/'
+
+
+def parse_batch(data):
+    """Validate the payload. Returns (items, error)."""
+    items = data.get('requests') if isinstance(data, dict) else None
+    if not isinstance(items, list) or not items:
+        return None, "'requests' must be a non-empty list."
+    if len(items) > MAX_BATCH_REQUESTS:
+        return None, f"A batch can contain at most {MAX_BATCH_REQUESTS} requests."
+
+    for index, item in enumerate(items):
+        if not isinstance(item, dict) or not isinstance(item.get('path'), str):
+            return None, f"Request {index}: 'path' is required."
+        method = str(item.get('method', 'GET')).upper()
+        if method not in BATCH_METHODS:
+            return None, f"Request {index}: method '{method}' is not allowed."
+        if not item['path'].startswith(BATCH_PREFIX):
+            return None, f"Request {index}: only {BATCH_PREFIX} paths can be batched."
+        item['method'] = method
+    return items, None
+
+
+def _sub_request(request, method, path, body):
+    url = urlsplit(path)
+    payload = json.dumps(body).encode() if body is not None else b''
+
+    environ = dict(request.META)
+    environ.update({
+        'REQUEST_METHOD': method,
+        'PATH_INFO': url.path,
+        'QUERY_STRING': url.query,
+        'CONTENT_TYPE': 'application/json',
+        'CONTENT_LENGTH': str(len(payload)),
+        'wsgi.input': BytesIO(payload),
+    })
+    environ.pop('HTTP_IF_NONE_MATCH', None)
+    environ.pop('HTTP_IF_MODIFIED_SINCE', None)
+    environ.pop('HTTP_IDEMPOTENCY_KEY', None)  # belongs to the batch request, not to each call in it
+    return WSGIRequest(environ)
+
+
+def _result(response):
+    data = getattr(response, 'data', None)
+    if data is None and response.status_code != 304 and response.content:
+        try:
+            data = json.loads(response.content)
+        except ValueError:
+            data = response.content.decode(errors='replace')
+    return {'status': response.status_code, 'body': data}
+
+
+def run_batch(request, items):
+    """
+    Dispatch `items` in order and return one {'status', 'body'} per item.
+    A failing sub-request, even one that raises, does not stop the ones
+    after it. After each successful write the user's reads stick to the
+    primary, so later calls in the same batch see it.
+    """
+    sticky = bool(replica_aliases()) and request.user.is_authenticated
+    results = []
+    for item in items:
+        url = urlsplit(item['path'])
+        try:
+            match = resolve(url.path)
+        except Resolver404:
+            results.append({'status': 404, 'body': {'error': 'Not found.'}})
+            continue
+
+        view_class = getattr(match.func, 'view_class', None)
+        if getattr(view_class, 'batchable', True) is False:
+            results.append({'status': 400, 'body': {'error': 'This endpoint cannot be batched.'}})
+            continue
+
+        sub = _sub_request(request._request, item['method'], item['path'], item.get('body'))
+        sub.resolver_match = match
+        # Picked up by DRF's Request: the sub-request is not authenticated again.
+        sub._force_auth_user = request.user
+        sub._force_auth_token = request.auth
+
+        try:
+            response = match.func(sub, *match.args, **match.kwargs)
+        except Http404:
+            results.append({'status': 404, 'body': {'error': 'Not found.'}})
+            continue
+        except Exception:
+            logger.exception("Batched %s %s failed", item['method'], item['path'])
+            results.append({'status': 500, 'body': {'error': 'Internal server error.'}})
+            continue
+
+        if sticky and item['method'] != 'GET' and response.status_code < 400:
+            mark_recent_write(request.user.pk)
+        results.append(_result(response))
+    return results
@@ -0,0 +1,122 @@
+"""
+Everything the patient app shows on its home screen, in one response:
+profile, upcoming appointments, unpaid bill summary and last prescription.
+Each section is one values_list() query (two for bills and prescription),
+shaped like the serializer of the standalone endpoint it replaces.
+"""
+from django.db.models import Count, Sum
+from django.utils import timezone
+
+from appointments.flat_serializers import date_field, full_name, price_field, time_field
+from appointments.models import Appointment, Patient
+from medical_records.models import Bill, Payment, Prescription, PrescriptionItem
+
+
+UPCOMING_LIMIT = 5
+
+UPCOMING_COLUMNS = (
+    'id', 'doctor_id', 'doctor__user__first_name', 'doctor__user__last_name', 'service__name',
+    'date', 'time_slot', 'status', 'reason_for_visit',
+)
+
+PRESCRIPTION_COLUMNS = (
+    'id', 'appointment__doctor__user__first_name', 'appointment__doctor__user__last_name',
+    'appointment__date', 'appointment__reason_for_visit', 'notes',
+)
+
+PRESCRIPTION_ITEM_COLUMNS = ('medicine_name', 'dosage', 'frequency', 'duration', 'instructions')
+
+
+def profile_section(user, patient):
+    """Shaped like PatientProfileSerializer; the user row is the one already loaded by authentication."""
+    _, date_of_birth, address, gender = patient
+    return {
+        'email': user.email,
+        'first_name': user.first_name,
+        'last_name': user.last_name,
+        'phone_number': user.phone_number,
+        'date_of_birth': date_field.to_representation(date_of_birth),
+        'address': address,
+        'gender': gender,
+    }
+
+
+def upcoming_section(patient_id):
+    """Next Scheduled appointments, shaped like AppointmentListSerializer."""
+    date_repr = date_field.to_representation
+    time_repr = time_field.to_representation
+
+    now = timezone.localtime()
+    upcoming = (
+        Appointment.objects
+        .filter(patient_id=patient_id, status='Scheduled', date__gte=now.date())
+        .exclude(date=now.date(), time_slot__lt=now.time())
+        .order_by('date', 'time_slot')
+    )
+    return [
+        {
+            'id': pk,
+            'doctor': doctor_id,
+            'doctor_name': full_name(d_first, d_last),
+            'service_name': service_name,
+            'date': date_repr(day),
+            'time_slot': time_repr(slot),
+            'status': status,
+            'reason_for_visit': reason,
+        }
+        for pk, doctor_id, d_first, d_last, service_name, day, slot, status, reason
+        in upcoming.values_list(*UPCOMING_COLUMNS)[:UPCOMING_LIMIT]
+    ]
+
+
+def bills_section(patient_id):
+    """Count and total amount due of the patient's unpaid bills (Bill.amount_due summed)."""
+    unpaid = Bill.objects.filter(appointment__patient_id=patient_id, status='Unpaid')
+    totals = unpaid.aggregate(count=Count('pk'), amount=Sum('amount'))
+    paid = Payment.objects.filter(bill__in=unpaid.values('pk'), status='Completed').aggregate(
+        total=Sum('amount_paid')
+    )['total']
+
+    amount_due = (totals['amount'] or 0) - (paid or 0)
+    return {
+        'unpaid_count': totals['count'],
+        'amount_due': price_field.to_representation(amount_due),
+    }
+
+
+def last_prescription_section(patient_id):
+    """Most recent prescription, shaped like PrescriptionSerializer, or None."""
+    latest = (
+        Prescription.objects.filter(appointment__patient_id=patient_id)
+        .order_by('-appointment__date', '-created_at')
+        .values_list(*PRESCRIPTION_COLUMNS)
+        .first()
+    )
+    if latest is None:
+        return None
+
+    pk, d_first, d_last, day, reason, notes = latest
+    items = PrescriptionItem.objects.filter(prescription_id=pk).order_by('pk').values(*PRESCRIPTION_ITEM_COLUMNS)
+    return {
+        'id': pk,
+        'doctor_name': full_name(d_first, d_last),
+        'date': date_field.to_representation(day),
+        'reason_for_visit': reason,
+        'notes': notes,
+        'items': list(items),
+    }
+
+
+def patient_home(user):
+    """Returns None if `user` has no patient profile."""
+    patient = Patient.objects.filter(user=user).values_list('pk', 'date_of_birth', 'address', 'gender').first()
+    if patient is None:
+        return None
+
+    patient_id = patient[0]
+    return {
+        'profile': profile_section(user, patient),
+        'upcoming_appointments': upcoming_section(patient_id),
+        'bills': bills_section(patient_id),
+        'last_prescription': last_prescription_section(patient_id),
+    }
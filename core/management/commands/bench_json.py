@@ -0,0 +1,103 @@
+import random
+import timeit
+from datetime import date, datetime, time, timedelta, timezone as dt_timezone
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.renderers import JSONRenderer
+
+from core.renderers import FastJSONRenderer, orjson
+
+
+STATUSES = ['Scheduled', 'Completed', 'Cancelled', 'No-Show', 'Checked-In']
+NAMES = ['Asha Rao', 'Imran Sheikh', 'Zoë Müller', 'Sadiya Aslam', 'Rahul Mahajan', '']
+
+
+def today_queue_payload(rng, rows):
+    """Same shape as AppointmentSerializer output for admin/today/."""
+    data = []
+    for i in range(rows):
+        slot = time(9 + i % 12, (i * 5) % 60)
+        data.append({
+            'id': i + 1,
+            'patient': 1000 + i, 'patient_name': rng.choice(NAMES), 'patient_email': f'patient{i}@example.com',
+            'doctor': 10 + i % 40, 'doctor_name': rng.choice(NAMES),
+            'service': 1 + i % 8, 'service_name': 'General Consultation', 'service_price': '250.00',
+            'date': date.today().isoformat(), 'time_slot': slot.strftime('%I:%M %p'),
+            'status': rng.choice(STATUSES),
+            'reason_for_visit': rng.choice([None, 'Fever and headache', 'Follow-up   visit']),
+            'booking_timestamp': '2026-10-19T08:15:30.123456Z',
+        })
+    return data
+
+
+def bills_payload(rng, rows):
+    """BillSerializer output plus raw Decimal/datetime values that go through the encoder."""
+    issued = datetime(2026, 10, 19, 8, 15, 30, 123456, tzinfo=dt_timezone.utc)
+    data = []
+    for i in range(rows):
+        amount = Decimal(rng.randrange(10000, 200000)) / 100
+        data.append({
+            'id': i + 1, 'appointment': 5000 + i, 'patient_name': rng.choice(NAMES),
+            'amount': amount, 'status': rng.choice(['Paid', 'Unpaid']),
+            'issued_date': issued + timedelta(minutes=i),
+            'total_paid': Decimal('0.00'), 'amount_due': amount,
+            'payments': [
+                {'id': j, 'amount_paid': Decimal('100.00'), 'payment_method': 'UPI',
+                 'status': 'Completed', 'payment_date': issued}
+                for j in range(i % 3)
+            ],
+            'doctor_name': rng.choice(NAMES),
+        })
+    return data
+
+
+def history_payload(rng, rows):
+    """PrescriptionSerializer output for history/."""
+    return [{
+        'id': i + 1, 'doctor_name': rng.choice(NAMES), 'date': date(2026, 1, 1) + timedelta(days=i % 300),
+        'reason_for_visit': 'Cough', 'notes': 'Drink plenty of water',
+        'items': [
+            {'medicine_name': 'Paracetamol', 'dosage': '500mg', 'frequency': '1-0-1',
+             'duration': '5 days', 'instructions': None}
+            for _ in range(1 + i % 4)
+        ],
+    } for i in range(rows)]
+
+
+PAYLOADS = {
+    'admin/today/': today_queue_payload,
+    'bills/': bills_payload,
+    'history/': history_payload,
+}
+
+
+class Command(BaseCommand):
+    help = "Compare FastJSONRenderer against DRF's JSONRenderer on representative payloads."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=2000)
+        parser.add_argument('--repeat', type=int, default=20)
+        parser.add_argument('--seed', type=int, default=42)
+
+    def handle(self, *args, **options):
+        if orjson is None:
+            raise CommandError("orjson is not installed; FastJSONRenderer would fall back to JSONRenderer.")
+
+        rng = random.Random(options['seed'])
+        stdlib, fast = JSONRenderer(), FastJSONRenderer()
+
+        self.stdout.write(f"{'payload':<14}{'bytes':>10}{'json ms':>10}{'orjson ms':>11}{'speedup':>9}")
+        for name, build in PAYLOADS.items():
+            data = build(rng, options['rows'])
+            expected = stdlib.render(data)
+            if fast.render(data) != expected:
+                raise CommandError(f"{name}: FastJSONRenderer output differs from JSONRenderer.")
+
+            slow_t = min(timeit.repeat(lambda: stdlib.render(data), number=1, repeat=options['repeat']))
+            fast_t = min(timeit.repeat(lambda: fast.render(data), number=1, repeat=options['repeat']))
+            self.stdout.write(
+                f"{name:<14}{len(expected):>10}{slow_t * 1000:>10.2f}{fast_t * 1000:>11.2f}{slow_t / fast_t:>8.1f}x"
+            )
+
+        self.stdout.write(self.style.SUCCESS("Output is byte-identical for all payloads."))
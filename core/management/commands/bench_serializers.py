@@ -0,0 +1,113 @@
+import random
+import time as perf
+from datetime import date, time, timedelta
+from decimal import Decimal
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from rest_framework.renderers import JSONRenderer
+
+from appointments.flat_serializers import appointment_rows, doctor_appointment_rows
+from appointments.models import Appointment, Patient
+from appointments.serializers import AppointmentSerializer, DoctorAppointmentListSerializer
+from appointments.slots import end_time_for
+from core.models import User
+from medical_records.flat_serializers import bill_rows
+from medical_records.models import Bill, Payment, Service
+from medical_records.serializers import BillSerializer
+from staff_management.models import Doctor
+
+
+class Command(BaseCommand):
+    help = "Compare rows/sec of the ModelSerializer and flat read paths for appointments and bills."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=5000, help="Synthetic appointments/bills to seed.")
+        parser.add_argument('--existing', action='store_true', help="Benchmark existing rows instead of seeding.")
+        parser.add_argument('--seed', type=int, default=42)
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            if not options['existing']:
+                self.seed(options['rows'], random.Random(options['seed']))
+
+            appointments = Appointment.objects.order_by('date', 'time_slot')
+            bills = Bill.objects.order_by('-issued_date')
+            cases = [
+                ('AppointmentSerializer', AppointmentSerializer, appointment_rows, appointments,
+                 ('patient__user', 'doctor__user', 'service'), ()),
+                ('DoctorAppointmentListSerializer', DoctorAppointmentListSerializer, doctor_appointment_rows,
+                 appointments, ('patient__user', 'service'), ()),
+                ('BillSerializer', BillSerializer, bill_rows, bills,
+                 ('appointment__patient__user', 'appointment__doctor__user'), ('payments',)),
+            ]
+
+            self.stdout.write(f"{'shape':<34}{'rows':>7}{'serializer/s':>14}{'+select_related/s':>19}{'flat/s':>11}")
+            for name, serializer_class, flat, queryset, related, prefetch in cases:
+                self.run_case(name, serializer_class, flat, queryset, related, prefetch)
+
+            transaction.set_rollback(True)
+
+        self.stdout.write(self.style.SUCCESS("Flat output is identical to the serializers for every shape."))
+
+    def run_case(self, name, serializer_class, flat, queryset, related, prefetch):
+        renderer = JSONRenderer()
+
+        started = perf.perf_counter()
+        expected = serializer_class(queryset.all(), many=True).data
+        plain = perf.perf_counter() - started
+
+        started = perf.perf_counter()
+        serializer_class(queryset.select_related(*related).prefetch_related(*prefetch), many=True).data
+        joined = perf.perf_counter() - started
+
+        started = perf.perf_counter()
+        rows = flat(queryset.all())
+        fast = perf.perf_counter() - started
+
+        if renderer.render(rows) != renderer.render(expected):
+            raise CommandError(f"{name}: flat output differs from the serializer.")
+
+        count = len(rows) or 1
+        self.stdout.write(f"{name:<34}{len(rows):>7}{count / plain:>14.0f}{count / joined:>19.0f}{count / fast:>11.0f}")
+
+    def seed(self, rows, rng):
+        password = make_password(None)
+        doctor_count = max(rows // 200, 2)
+        patient_count = max(rows // 10, 2)
+
+        users = User.objects.bulk_create(
+            [User(email=f"bench-doctor{i}@example.com", first_name="Doctor", last_name=str(i), role="Doctor",
+                  password=password) for i in range(doctor_count)]
+            + [User(email=f"bench-patient{i}@example.com", first_name="Patient", last_name=str(i), role="Patient",
+                    password=password) for i in range(patient_count)]
+        )
+        doctors = Doctor.objects.bulk_create([Doctor(user=u) for u in users[:doctor_count]])
+        patients = Patient.objects.bulk_create(
+            [Patient(user=u, date_of_birth=date(1990, 1, 1)) for u in users[doctor_count:]]
+        )
+        services = Service.objects.bulk_create(
+            [Service(name=f"Bench service {i}", default_duration_min=15, base_price=Decimal(150 + i * 50))
+             for i in range(5)]
+        )
+
+        start = date.today()
+        appointments = []
+        for i in range(rows):
+            slot = time(9 + ((i // doctor_count) % 40) // 4, 15 * ((i // doctor_count) % 4))
+            appointments.append(Appointment(
+                patient=rng.choice(patients), doctor=doctors[i % doctor_count], service=rng.choice(services),
+                date=start + timedelta(days=(i // doctor_count) // 40),
+                time_slot=slot, end_time=end_time_for(slot, 15),
+                status=rng.choice(['Scheduled', 'Completed']),
+                reason_for_visit=rng.choice([None, 'Check-up']),
+            ))
+        appointments = Appointment.objects.bulk_create(appointments)
+        bills = Bill.objects.bulk_create(
+            [Bill(appointment=a, amount=a.service.base_price) for a in appointments]
+        )
+        Payment.objects.bulk_create([
+            Payment(bill=b, amount_paid=Decimal('50.00'), payment_method='Cash', status='Completed')
+            for b in bills for _ in range(rng.randrange(3))
+        ])
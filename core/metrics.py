@@ -0,0 +1,58 @@
+import threading
+from collections import defaultdict
+
+
+COUNTERS = (
+    ('requests_total', 'Requests handled.'),
+    ('db_queries_total', 'SQL queries executed.'),
+    ('db_query_seconds_total', 'Time spent executing SQL.'),
+    # Renderer (JSON encoding) only; serializer.data runs inside the view
+    # and is part of request_seconds_total.
+    ('render_seconds_total', 'Time spent encoding response bodies after the view returned.'),
+    ('response_bytes_total', 'Response body bytes sent.'),
+    ('request_seconds_total', 'Wall time spent handling requests.'),
+    ('query_budget_exceeded_total', 'Requests that ran more queries than their budget.'),
+)
+
+
+def _escape(value):
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+class MetricsRegistry:
+    """
+    Per-process counters keyed by URL name. Each worker exposes its own
+    totals; Prometheus sums them across scrape targets.
+    """
+
+    def __init__(self, prefix='hms'):
+        self.prefix = prefix
+        self._lock = threading.Lock()
+        self._endpoints = defaultdict(lambda: [0] * len(COUNTERS))
+
+    def record(self, endpoint, queries, sql_seconds, render_seconds, response_bytes, request_seconds, over_budget):
+        values = (1, queries, sql_seconds, render_seconds, response_bytes, request_seconds, int(over_budget))
+        with self._lock:
+            totals = self._endpoints[endpoint]
+            for i, value in enumerate(values):
+                totals[i] += value
+
+    def reset(self):
+        with self._lock:
+            self._endpoints.clear()
+
+    def render_prometheus(self):
+        with self._lock:
+            snapshot = {endpoint: list(totals) for endpoint, totals in self._endpoints.items()}
+
+        lines = []
+        for i, (name, help_text) in enumerate(COUNTERS):
+            metric = f"{self.prefix}_{name}"
+            lines.append(f"# HELP {metric} {help_text}")
+            lines.append(f"# TYPE {metric} counter")
+            for endpoint in sorted(snapshot):
+                lines.append(f'{metric}{{endpoint="{_escape(endpoint)}"}} {snapshot[endpoint][i]}')
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
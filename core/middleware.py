@@ -0,0 +1,108 @@
+import logging
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+
+from .metrics import registry
+from .replicas import mark_recent_write, replica_aliases
+
+
+logger = logging.getLogger(__name__)
+
+
+class QueryCounter:
+    """connection.execute_wrapper() hook counting queries and their time."""
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.count += 1
+            self.seconds += time.perf_counter() - started
+
+
+class QueryMetricsMiddleware:
+    """
+    Records SQL count, SQL time, render (JSON encoding) time and response
+    size per URL name into core.metrics.registry (served at /metrics), and
+    logs requests that run more queries than QUERY_BUDGET or the view's
+    `query_budget`.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        counter = QueryCounter()
+        request._render_seconds = 0.0
+        started = time.perf_counter()
+
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(counter))
+            response = self.get_response(request)
+
+        elapsed = time.perf_counter() - started
+        endpoint, budget = self.resolve(request)
+        over_budget = counter.count > budget
+        if over_budget:
+            logger.warning(
+                "%s %s (%s) ran %d queries, budget is %d",
+                request.method, request.path, endpoint, counter.count, budget,
+            )
+
+        response_bytes = 0 if response.streaming else len(response.content)
+        registry.record(
+            endpoint, counter.count, counter.seconds, request._render_seconds,
+            response_bytes, elapsed, over_budget,
+        )
+        return response
+
+    def process_template_response(self, request, response):
+        # DRF responses are rendered after the view returns; this times only
+        # the renderer. Serializer work happens inside the view.
+        started = time.perf_counter()
+
+        def rendered(response):
+            request._render_seconds = time.perf_counter() - started
+
+        response.add_post_render_callback(rendered)
+        return response
+
+    def resolve(self, request):
+        match = getattr(request, 'resolver_match', None)
+        if match is None:
+            return '<unresolved>', settings.QUERY_BUDGET
+
+        view_class = getattr(match.func, 'view_class', None)
+        budget = getattr(view_class, 'query_budget', settings.QUERY_BUDGET)
+        return match.url_name or match.view_name, budget
+
+
+class ReplicaStickyMiddleware:
+    """
+    After a successful write, keeps the user's reads on the primary for
+    REPLICA_STICKY_SECONDS so they see their own changes despite replica
+    lag. DRF sets request.user once the view has authenticated it.
+    """
+
+    SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.enabled = bool(replica_aliases())
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if self.enabled and request.method not in self.SAFE_METHODS and response.status_code < 400:
+            user = getattr(request, 'user', None)
+            if user is not None and user.is_authenticated:
+                mark_recent_write(user.pk)
+        return response
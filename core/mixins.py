@@ -0,0 +1,130 @@
+import hashlib
+import json
+
+from django.core.cache import cache
+from django.utils.cache import get_conditional_response, patch_cache_control
+
+from rest_framework import status
+from rest_framework.response import Response
+
+from .replicas import replica_aliases, start_replica_reads, stop_replica_reads, wrote_recently
+from .versioning import get_resource_version
+
+
+class ConditionalGetMixin:
+    """
+    Answers GET requests with 304 Not Modified when the client's
+    If-None-Match header matches the current version stamp of
+    `version_resource`, before the queryset or serializer runs.
+    Permissions are still checked first because this hooks into get().
+
+    No Last-Modified is sent: its one-second resolution cannot tell apart
+    two changes made in the same second, so If-Modified-Since could answer
+    304 for data that has changed.
+    """
+    version_resource = None
+
+    def get_version_resource(self):
+        return self.version_resource
+
+    def get_version(self, resource):
+        return get_resource_version(resource)
+
+    def get(self, request, *args, **kwargs):
+        resource = self.get_version_resource()
+        version = self.get_version(resource)
+        etag = f'"{resource}:{version}"'
+
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            response = super().get(request, *args, **kwargs)
+
+        if response.status_code in (200, 304):
+            response["ETag"] = etag
+            patch_cache_control(response, private=True, no_cache=True)
+        return response
+
+
+IDEMPOTENCY_TIMEOUT = 60 * 60 * 24
+IDEMPOTENCY_LOCK_TIMEOUT = 30
+
+
+class IdempotencyMixin:
+    """
+    Makes POST safe to retry. When the client sends an Idempotency-Key
+    header, the first response (anything below 500) is stored in the cache
+    for IDEMPOTENCY_TIMEOUT and replayed for later requests with the same
+    key, user and URL, without running validation or writes again.
+    A retry that arrives while the first request is still running gets 409;
+    reusing a key with a different body gets 422.
+
+    The view's post() is wrapped in initial(), after authentication and
+    permission checks, so views may define post() themselves.
+    """
+    idempotency_timeout = IDEMPOTENCY_TIMEOUT
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        key = request.headers.get('Idempotency-Key')
+        if request.method == 'POST' and key:
+            handler = self.post
+            self.post = lambda request, *args, **kwargs: self.idempotent_response(
+                request, key, handler, *args, **kwargs
+            )
+
+    def _idempotency_key(self, request, key):
+        digest = hashlib.sha256(f"{request.user.pk}:{request.path}:{key}".encode()).hexdigest()
+        return f"idempotency:{digest}"
+
+    def idempotent_response(self, request, key, handler, *args, **kwargs):
+        if len(key) > 255:
+            return Response({"error": "Idempotency-Key must be at most 255 characters."},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        cache_key = self._idempotency_key(request, key)
+        fingerprint = hashlib.sha256(
+            json.dumps(request.data, sort_keys=True, default=str).encode()
+        ).hexdigest()
+
+        stored = cache.get(cache_key)
+        if stored is None:
+            if not cache.add(f"{cache_key}:lock", 1, timeout=IDEMPOTENCY_LOCK_TIMEOUT):
+                return Response({"error": "A request with this Idempotency-Key is still being processed."},
+                                status=status.HTTP_409_CONFLICT)
+            try:
+                response = handler(request, *args, **kwargs)
+                if response.status_code < 500:
+                    stored = {'fingerprint': fingerprint, 'status': response.status_code, 'data': response.data}
+                    cache.set(cache_key, stored, timeout=self.idempotency_timeout)
+            finally:
+                cache.delete(f"{cache_key}:lock")
+            return response
+
+        if stored['fingerprint'] != fingerprint:
+            return Response({"error": "This Idempotency-Key was already used with a different request."},
+                            status=status.HTTP_422_UNPROCESSABLE_ENTITY)
+        response = Response(stored['data'], status=stored['status'])
+        response['Idempotent-Replayed'] = 'true'
+        return response
+
+
+class ReplicaReadMixin:
+    """
+    Sends the ORM reads of this view's GET requests to a read replica, unless
+    the user wrote something within REPLICA_STICKY_SECONDS. Only for views
+    whose results may lag the primary slightly; avoid it where a cache entry
+    is rebuilt from the rows read, or stale rows would be cached.
+    """
+
+    def initial(self, request, *args, **kwargs):
+        # Authentication runs first, on the primary.
+        super().initial(request, *args, **kwargs)
+        if request.method in ('GET', 'HEAD') and replica_aliases() and not wrote_recently(request.user.pk):
+            self._replica_token = start_replica_reads()
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        token = getattr(self, '_replica_token', None)
+        if token is not None:
+            self._replica_token = None
+            stop_replica_reads(token)
+        return super().finalize_response(request, response, *args, **kwargs)
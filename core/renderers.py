@@ -0,0 +1,43 @@
+from rest_framework.renderers import JSONRenderer
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is optional
+    orjson = None
+
+
+if orjson is not None:
+    # OPT_UTC_Z matches DRF's encoder, which writes UTC datetimes with 'Z'.
+    # Types orjson does not know (Decimal, lazy strings, ...) go through
+    # DRF's JSONEncoder.default, exactly like JSONRenderer.
+    ORJSON_OPTIONS = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    orjson-backed alternative to JSONRenderer. Indented, ASCII-only or
+    non-strict output and integers wider than 64 bits fall back to the
+    stdlib path. Floats are not byte-identical: orjson formats exponents
+    differently (1e16, 1.5e-7, 0.00001 vs DRF's 1e+16, 1.5e-07, 1e-05)
+    and writes NaN/Infinity as null where DRF raises ValueError.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or self.ensure_ascii or not self.compact or not self.strict:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        if data is None:
+            return b''
+
+        if self.get_indent(accepted_media_type, renderer_context or {}) is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            ret = orjson.dumps(data, default=self.encoder_class().default, option=ORJSON_OPTIONS)
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        # Same \u2028 / \u2029 escaping as JSONRenderer.
+        if b'\xe2\x80\xa8' in ret or b'\xe2\x80\xa9' in ret:
+            ret = ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+        return ret
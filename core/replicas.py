@@ -0,0 +1,73 @@
+"""
+Read replica routing. Replicas are configured with DATABASE_REPLICA_URLS
+and show up as the 'replica1', 'replica2'... aliases. Nothing reads from
+them unless a view opts in with core.mixins.ReplicaReadMixin, which turns
+replica reads on for its safe requests only. Every write goes to 'default'.
+
+Replication lags, so a user who just wrote something reads from the primary
+for REPLICA_STICKY_SECONDS afterwards (see ReplicaStickyMiddleware) and
+sees their own change.
+"""
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import cache
+
+
+# The replica alias reads go to in the current context, or None for default routing.
+_read_alias = ContextVar('read_alias', default=None)
+
+
+def replica_aliases():
+    return [alias for alias in settings.DATABASES if alias.startswith('replica')]
+
+
+def start_replica_reads():
+    """
+    Route reads to one replica, picked once so all queries of a request see
+    the same replication point. Returns a token for stop_replica_reads().
+    """
+    replicas = replica_aliases()
+    return _read_alias.set(random.choice(replicas) if replicas else None)
+
+
+def stop_replica_reads(token):
+    _read_alias.reset(token)
+
+
+@contextmanager
+def replica_reads():
+    token = start_replica_reads()
+    try:
+        yield
+    finally:
+        stop_replica_reads(token)
+
+
+def _sticky_key(user_id):
+    return f"replica_sticky:{user_id}"
+
+
+def mark_recent_write(user_id):
+    cache.set(_sticky_key(user_id), True, timeout=settings.REPLICA_STICKY_SECONDS)
+
+
+def wrote_recently(user_id):
+    return user_id is not None and cache.get(_sticky_key(user_id), False)
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        return _read_alias.get()
+
+    def db_for_write(self, model, **hints):
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same rows as the primary.
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return None
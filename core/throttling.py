@@ -0,0 +1,135 @@
+"""
+Protection for the open, CPU-heavy endpoints (login and registration hash
+passwords). Two layers, both kept in the default cache, so they are
+shared between workers only when that cache is (Redis via REDIS_URL). With
+the LocMemCache fallback every worker counts on its own:
+
+* Token-bucket throttles per client IP and per submitted account, so
+  short bursts pass but sustained hammering gets 429 with Retry-After.
+* ConcurrencyLimitMixin, which caps how many requests of a view run at
+  once and sheds the rest with 429 before any password is hashed, so a
+  login storm cannot take every worker away from booking.
+
+Rates are "<capacity>/<period>" strings in settings.THROTTLE_RATES, keyed
+by the view's `throttle_scope`. A scope without a rate is not throttled.
+"""
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.exceptions import Throttled
+from rest_framework.throttling import BaseThrottle
+
+
+PERIODS = {'s': 1, 'sec': 1, 'm': 60, 'min': 60, 'h': 3600, 'hour': 3600, 'd': 86400, 'day': 86400}
+
+
+def parse_rate(rate):
+    """'10/min' -> (capacity 10, refill 10/60 tokens per second)."""
+    capacity, period = rate.split('/')
+    capacity = int(capacity)
+    return capacity, capacity / PERIODS[period]
+
+
+class TokenBucketThrottle(BaseThrottle):
+    """
+    A bucket of `capacity` tokens per key, refilled continuously. Each
+    request takes one token. The bucket is a (tokens, timestamp) pair in the
+    cache; concurrent workers can race on it, which at worst lets a few
+    extra requests through and is acceptable here.
+    """
+    scope_suffix = ''
+
+    def get_scope(self, view):
+        scope = getattr(view, 'throttle_scope', None)
+        return f"{scope}{self.scope_suffix}" if scope else None
+
+    def get_ident_key(self, request, view):
+        raise NotImplementedError
+
+    def allow_request(self, request, view):
+        scope = self.get_scope(view)
+        rate = settings.THROTTLE_RATES.get(scope) if scope else None
+        ident = self.get_ident_key(request, view) if rate else None
+        if ident is None:
+            return True
+
+        capacity, refill = parse_rate(rate)
+        key = f"throttle:{scope}:{ident}"
+        now = time.time()
+        tokens, updated = cache.get(key, (capacity, now))
+        tokens = min(capacity, tokens + (now - updated) * refill)
+
+        if tokens < 1:
+            self._wait = (1 - tokens) / refill
+            return False
+
+        # Expire once the bucket would be full again anyway.
+        cache.set(key, (tokens - 1, now), timeout=int(capacity / refill) + 1)
+        return True
+
+    def wait(self):
+        return getattr(self, '_wait', None)
+
+
+class IPTokenBucketThrottle(TokenBucketThrottle):
+    def get_ident_key(self, request, view):
+        return self.get_ident(request)
+
+
+class AccountTokenBucketThrottle(TokenBucketThrottle):
+    """Keyed by the email in the request body, so one account cannot be brute-forced from many IPs."""
+    scope_suffix = '_account'
+
+    def get_ident_key(self, request, view):
+        email = request.data.get('email') if hasattr(request.data, 'get') else None
+        return str(email).strip().lower() if email else None
+
+
+class ConcurrencyLimitMixin:
+    """
+    Allows at most `max_concurrency` requests of this view's
+    `throttle_scope` to run at the same time. The slot is taken in initial()
+    (after throttles) and released in finalize_response(), which DRF calls
+    even when the view raised.
+
+    The counter lives in the default cache. On Redis the cap is global; on
+    LocMemCache it is per worker process (the effective limit is the cap
+    times the number of workers), and a counter culled from a full LocMem
+    cache starts again from zero.
+    """
+    max_concurrency = None
+    # The counter's TTL, refreshed on every request: slots held by a crashed
+    # worker are given back once the view has been idle this long.
+    concurrency_timeout = 60
+
+    def _concurrency_key(self):
+        return f"concurrency:{self.throttle_scope}"
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        limit = self.max_concurrency or settings.MAX_CONCURRENT_PASSWORD_CHECKS
+        key = self._concurrency_key()
+        cache.add(key, 0, timeout=self.concurrency_timeout)
+        try:
+            running = cache.incr(key)
+        except ValueError:
+            # Expired between add() and incr(); start counting again.
+            cache.add(key, 1, timeout=self.concurrency_timeout)
+            running = 1
+        else:
+            # incr() keeps the original expiry; without this a busy counter
+            # would expire mid-flight and under-count the requests running.
+            cache.touch(key, self.concurrency_timeout)
+        self._holds_concurrency_slot = True
+        if running > limit:
+            raise Throttled(wait=1, detail="The server is busy. Please try again shortly.")
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        if getattr(self, '_holds_concurrency_slot', False):
+            self._holds_concurrency_slot = False
+            try:
+                cache.decr(self._concurrency_key())
+            except ValueError:
+                pass  # counter expired
+        return super().finalize_response(request, response, *args, **kwargs)
@@ -1,5 +1,5 @@
 from django.urls import path
-from core.views import (PatientRegistrationView,CustomLoginView,PatientProfileView,
+from core.views import (PatientRegistrationView,CustomLoginView,PatientProfileView,PatientHomeView,
                         DoctorRegistrationView,AdminResetPasswordView,ChangePasswordView, 
                         PendingDoctorsView,ApproveDoctorView,RejectDoctorView)
 from rest_framework_simplejwt.views import TokenRefreshView
@@ -10,6 +10,7 @@ urlpatterns = [
     path('login/', CustomLoginView.as_view(), name='token_obtain_pair'),
     path('token/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
     path('patient/profile/', PatientProfileView.as_view(), name='patient-profile'),
+    path('patient/home/', PatientHomeView.as_view(), name='patient-home'),
     path('register/doctor/', DoctorRegistrationView.as_view(), name='doctor-register'),
     path('admin/reset-password/', AdminResetPasswordView.as_view(), name='admin-reset-password'),
     path('auth/change-password/', ChangePasswordView.as_view(), name='change-password'),
@@ -0,0 +1,43 @@
+import time
+
+from django.core.cache import cache
+from django.db import transaction
+
+
+VERSION_TIMEOUT = None  # version stamps never expire on their own
+
+
+def _version_key(resource):
+    return f"version:{resource}"
+
+
+def get_resource_version(resource):
+    """
+    Return the current version stamp (a unix timestamp) for `resource`.
+    A missing stamp (cold cache) is initialised to "now" so that every
+    worker sharing the cache agrees on the same value.
+    """
+    key = _version_key(resource)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, time.time(), timeout=VERSION_TIMEOUT)
+        version = cache.get(key)
+    return version
+
+
+def bump_resource_version(*resources):
+    # Deferred until commit so a reader cannot rebuild a cache entry for the
+    # new version from rows that are not yet visible to it.
+    def bump():
+        now = time.time()
+        cache.set_many({_version_key(r): now for r in resources}, timeout=VERSION_TIMEOUT)
+
+    transaction.on_commit(bump)
+
+
+def doctor_schedule_resource(doctor_id):
+    return f"schedule:{doctor_id}"
+
+
+def doctor_day_resource(doctor_id, day_name):
+    return f"schedule:{doctor_id}:{day_name}"
@@ -11,20 +11,33 @@ from appointments.models import Patient
 from .permissions import IsPatient  
 from .serializers import PatientRegistrationSerializer, DoctorRegistrationSerializer 
 from django.contrib.auth import get_user_model
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseForbidden
+from django.utils.crypto import constant_time_compare
+from .metrics import registry
+from .home import patient_home
+from .mixins import ReplicaReadMixin
+from .batch import MAX_BATCH_REQUESTS, parse_batch, run_batch
+from .throttling import AccountTokenBucketThrottle, ConcurrencyLimitMixin, IPTokenBucketThrottle
+from staff_management.directory import rebuild_doctor_directories
 User = get_user_model()
 
 
 
-class PatientRegistrationView(generics.CreateAPIView):
+class PatientRegistrationView(ConcurrencyLimitMixin, generics.CreateAPIView):
    
     serializer_class = PatientRegistrationSerializer
     authentication_classes = [] 
     permission_classes = [AllowAny]
+    throttle_classes = [IPTokenBucketThrottle]
+    throttle_scope = 'registration'
 
 
 
-class CustomLoginView(TokenObtainPairView):
+class CustomLoginView(ConcurrencyLimitMixin, TokenObtainPairView):
     serializer_class = CustomTokenObtainPairSerializer
+    throttle_classes = [IPTokenBucketThrottle, AccountTokenBucketThrottle]
+    throttle_scope = 'login'
 
 
 
@@ -41,14 +54,31 @@ class PatientProfileView(generics.RetrieveUpdateAPIView):
 
 
 
+class PatientHomeView(ReplicaReadMixin, APIView):
+    """
+    Home screen of the patient app in one round trip instead of separate
+    calls to the profile, appointment, bill and history endpoints.
+    """
+    permission_classes = [IsPatient]
+    query_budget = 7  # user (authentication), patient, appointments, 2 x bills, 2 x prescription
+
+    def get(self, request):
+        data = patient_home(request.user)
+        if data is None:
+            return Response({"error": "Patient profile not found."}, status=status.HTTP_404_NOT_FOUND)
+        return Response(data)
 
 
 
-class DoctorRegistrationView(generics.CreateAPIView):
+
+
+class DoctorRegistrationView(ConcurrencyLimitMixin, generics.CreateAPIView):
    
     serializer_class = DoctorRegistrationSerializer
     authentication_classes = [] 
     permission_classes = [AllowAny]
+    throttle_classes = [IPTokenBucketThrottle]
+    throttle_scope = 'registration'
     def create(self, request, *args, **kwargs):
         
         serializer = self.get_serializer(data=request.data)
@@ -170,6 +200,7 @@ class ApproveDoctorView(APIView):
             doctor = User.objects.get(id=id, role='Doctor')
             doctor.is_active = True
             doctor.save()
+            rebuild_doctor_directories()
             return Response({"message": "Doctor Approved Successfully!"})
         except User.DoesNotExist:
             return Response({"error": "Doctor not found"}, status=404)
@@ -198,4 +229,38 @@ class RejectDoctorView(generics.DestroyAPIView):
             return Response({"message": "Application rejected and user removed."}, status=status.HTTP_200_OK)
             
         except User.DoesNotExist:
-            return Response({"error": "User not found"}, status=status.HTTP_404_NOT_FOUND)
\ No newline at end of file
+            return Response({"error": "User not found"}, status=status.HTTP_404_NOT_FOUND)
+
+
+
+class BatchView(APIView):
+    """
+    POST {"requests": [{"method": "GET", "path": "/api/...", "body": {...}}, ...]}
+    Runs the sub-requests in order as the authenticated user and returns
+    {"responses": [{"status": ..., "body": ...}, ...]} in the same order.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    batchable = False  # no nested batches
+    query_budget = MAX_BATCH_REQUESTS * 5
+
+    def post(self, request):
+        items, error = parse_batch(request.data)
+        if error:
+            return Response({"error": error}, status=status.HTTP_400_BAD_REQUEST)
+        return Response({"responses": run_batch(request, items)})
+
+
+
+def metrics_allowed(request):
+    if request.user.is_authenticated and request.user.is_staff:
+        return True
+    scheme, _, token = request.headers.get('Authorization', '').partition(' ')
+    return bool(settings.METRICS_TOKEN) and scheme.lower() == 'bearer' and constant_time_compare(
+        token.strip(), settings.METRICS_TOKEN
+    )
+
+
+def metrics_view(request):
+    if not metrics_allowed(request):
+        return HttpResponseForbidden("Forbidden")
+    return HttpResponse(registry.render_prometheus(), content_type="text/plain; version=0.0.4; charset=utf-8")
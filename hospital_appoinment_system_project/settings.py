@@ -1,6 +1,8 @@
 
 MIDDLEWARE = [
     'corsheaders.middleware.CorsMiddleware',  
+    'core.middleware.QueryMetricsMiddleware',
+    'core.middleware.ReplicaStickyMiddleware',
     'django.middleware.security.SecurityMiddleware',
     "whitenoise.middleware.WhiteNoiseMiddleware",
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -56,16 +58,39 @@ INSTALLED_APPS = [
     'medical_records',
     'appointments',
     'staff_management',
+    'archive',
     'anymail'
     
 ]
 
+# Synthetic data seeding and the endpoint benchmark runner (seed_hospital,
+# run_benchmarks). Only enable on development or benchmark machines.
+if os.environ.get("BENCHMARKS", "0") == "1":
+    INSTALLED_APPS.append('benchmarks')
+
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
         'rest_framework_simplejwt.authentication.JWTAuthentication',
     )
 }
 
+# orjson-backed JSON rendering/parsing, off unless FAST_JSON=1. Output
+# matches DRF's JSONRenderer except for floats: orjson writes 1e16 and
+# 0.00001 where DRF writes 1e+16 and 1e-05, and NaN/Infinity become null
+# instead of raising. Enable it only where clients can live with that.
+FAST_JSON = os.environ.get("FAST_JSON", "0") == "1"
+
+if FAST_JSON:
+    REST_FRAMEWORK['DEFAULT_RENDERER_CLASSES'] = (
+        'core.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    )
+    REST_FRAMEWORK['DEFAULT_PARSER_CLASSES'] = (
+        'core.parsers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    )
+
 AUTH_USER_MODEL = 'core.User'
 
 
@@ -91,6 +116,43 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'hospital_appoinment_system_project.wsgi.application'
 
+# Requests running more SQL queries than this are logged by
+# core.middleware.QueryMetricsMiddleware. Views can override it with a
+# `query_budget` attribute.
+QUERY_BUDGET = int(os.environ.get("QUERY_BUDGET", 30))
+
+# /metrics is served to staff users logged into the admin site and to
+# scrapers sending "Authorization: Bearer <METRICS_TOKEN>". Unset, only staff.
+METRICS_TOKEN = os.environ.get("METRICS_TOKEN", "")
+
+# Token-bucket rates ("<burst>/<period>") for core.throttling, by the view's
+# `throttle_scope`; "<scope>_account" is keyed by the submitted email.
+THROTTLE_RATES = {
+    'login': '30/min',
+    'login_account': '5/min',
+    'registration': '20/hour',
+    'doctor_directory': '120/min',
+}
+
+# Monthly range partitioning of the appointments table by date (Postgres
+# only; see appointments.partitioning). Applied by migration 0016 when on, and
+# create_appointment_partitions keeps this many months of partitions ready.
+APPOINTMENT_PARTITIONING = os.environ.get("APPOINTMENT_PARTITIONING", "0") == "1"
+APPOINTMENT_PARTITION_MONTHS_AHEAD = int(os.environ.get("APPOINTMENT_PARTITION_MONTHS_AHEAD", 12))
+
+# archive_appointments moves finished appointments older than this into the
+# archive tables.
+ARCHIVE_AFTER_MONTHS = int(os.environ.get("ARCHIVE_AFTER_MONTHS", 24))
+
+# Password hashing is CPU-bound: beyond this many concurrent login or
+# registration requests, extra ones are shed with 429. The count is shared
+# through the cache, so without REDIS_URL it applies to each worker process.
+MAX_CONCURRENT_PASSWORD_CHECKS = int(os.environ.get("MAX_CONCURRENT_PASSWORD_CHECKS", 4))
+
+# New feedback reaches the cached doctor directory (and its ETag) at most
+# this many seconds late; ratings are republished at most once per window.
+RATINGS_REFRESH_SECONDS = int(os.environ.get("RATINGS_REFRESH_SECONDS", 60))
+
 
 
 
@@ -111,6 +173,34 @@ database_url = os.environ.get("DATABASE_URL")
 if database_url:
     DATABASES['default'] = dj_database_url.parse(database_url)
 
+# Comma-separated read replica URLs, exposed as 'replica1', 'replica2'...
+# Only views using core.mixins.ReplicaReadMixin read from them; tests read
+# the primary's test database through TEST MIRROR.
+for index, replica_url in enumerate(filter(None, os.environ.get("DATABASE_REPLICA_URLS", "").split(",")), start=1):
+    DATABASES[f'replica{index}'] = {**dj_database_url.parse(replica_url.strip()), 'TEST': {'MIRROR': 'default'}}
+
+DATABASE_ROUTERS = ['core.replicas.ReplicaRouter']
+
+# After a write, the user's reads stay on the primary this long (replica lag).
+REPLICA_STICKY_SECONDS = int(os.environ.get("REPLICA_STICKY_SECONDS", 5))
+
+
+# Shared cache for resource version stamps (ETags) and cached lookups.
+# Point REDIS_URL at a shared instance when running more than one worker.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}
+
+redis_url = os.environ.get("REDIS_URL")
+
+if redis_url:
+    CACHES['default'] = {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': redis_url,
+    }
+
 
 
 AUTH_PASSWORD_VALIDATORS = [
@@ -16,6 +16,7 @@ Including another URLconf
 """
 from django.contrib import admin
 from django.urls import path,include
+from core.views import metrics_view, BatchView
 
 admin.site.site_header='Hospital Admin'
 admin.site.index_title='Admin'
@@ -26,5 +27,7 @@ urlpatterns = [
     path('api/appointments/', include('appointments.urls')), 
     path('api/medical_records/',include('medical_records.urls')),
     path('api/staff/', include('staff_management.urls')),
-    path('api/finance/', include('medical_records.urls'))
+    path('api/finance/', include('medical_records.urls')),
+    path('api/batch/', BatchView.as_view(), name='batch'),
+    path('metrics', metrics_view, name='metrics'),
 ]
@@ -0,0 +1,72 @@
+"""
+Bill creation. A bill is priced at the service's base price, as it always
+has been. Appointments are billed when they are marked Completed; the bulk
+path catches any that were completed another way (imports, the admin site)
+in one insert.
+"""
+from django.core.exceptions import ValidationError
+from django.db import IntegrityError, transaction
+from django.db.models import F
+
+from appointments.models import Appointment
+from .flat_serializers import money_field
+from .models import Bill
+
+
+BILL_PRICE = F('service__base_price')
+
+
+def unbilled_appointments(day=None):
+    pending = Appointment.objects.filter(status='Completed', bill__isnull=True)
+    if day is not None:
+        pending = pending.filter(date=day)
+    return pending.order_by()
+
+
+GENERATE_ATTEMPTS = 3
+
+
+def generate_bills(day=None, batch_size=1000):
+    """
+    Create a bill for every Completed appointment without one (on `day`
+    if given). Returns a summary dict counting only bills this run created.
+    If an appointment is billed concurrently the insert hits the unique
+    appointment column, and the run starts over from a fresh unbilled list.
+    """
+    for attempt in range(GENERATE_ATTEMPTS):
+        rows = list(unbilled_appointments(day).values_list('pk', BILL_PRICE))
+        bills = [Bill(appointment_id=pk, amount=price) for pk, price in rows]
+        try:
+            with transaction.atomic():
+                Bill.objects.bulk_create(bills, batch_size=batch_size)
+            break
+        except IntegrityError:
+            if attempt == GENERATE_ATTEMPTS - 1:
+                raise
+
+    return {
+        'date': day.isoformat() if day else None,
+        'created': len(bills),
+        'total_amount': money_field.to_representation(sum((bill.amount for bill in bills), 0)),
+    }
+
+
+def create_bill(appointment_id):
+    """
+    Bill a single appointment. Returns True if a bill was created, False if
+    it already had one and None if the appointment does not exist. Raises
+    ValidationError unless the appointment is Completed. Call it inside the
+    transaction that completes the appointment.
+    """
+    row = Appointment.objects.filter(pk=appointment_id).values_list('status', BILL_PRICE).first()
+    if row is None:
+        return None
+    appointment_status, price = row
+    if appointment_status != 'Completed':
+        raise ValidationError(f"Cannot bill an appointment that is {appointment_status}.")
+    try:
+        with transaction.atomic():
+            Bill.objects.create(appointment_id=appointment_id, amount=price)
+    except IntegrityError:
+        return False  # already billed
+    return True
@@ -0,0 +1,56 @@
+import threading
+
+from django.db.models import Prefetch
+
+from core.versioning import get_resource_version
+from staff_management.models import Doctor
+from .models import Service
+from .serializers import ServiceSerializer
+
+
+class ServiceCatalog:
+    """
+    Serialized services plus doctor->services and service->doctors indexes,
+    built in one pass so the service list and its doctor_id filter need no
+    queries until the 'services' version stamp moves.
+    """
+
+    def __init__(self, version, services):
+        self.version = version
+        self.services = services
+        self.service_doctors = {}
+        self.doctor_services = {}
+        for service in services:
+            self.service_doctors[service['id']] = list(service['doctors'])
+            for doctor_id in service['doctors']:
+                self.doctor_services.setdefault(doctor_id, []).append(service)
+
+    def for_doctor(self, doctor_id):
+        return self.doctor_services.get(doctor_id, [])
+
+    def doctors_for(self, service_id):
+        return self.service_doctors.get(service_id, [])
+
+
+_catalog = None
+_catalog_lock = threading.Lock()
+
+
+def build_service_catalog(version):
+    # select_related keeps the doctor names in the m2m query itself; a
+    # separate user prefetch would need an IN list of every doctor id.
+    doctors = Prefetch('doctors', queryset=Doctor.objects.select_related('user'))
+    queryset = Service.objects.prefetch_related(doctors).order_by('pk')
+    return ServiceCatalog(version, ServiceSerializer(queryset, many=True).data)
+
+
+def get_service_catalog():
+    global _catalog
+    version = get_resource_version('services')
+    catalog = _catalog
+    if catalog is None or catalog.version != version:
+        with _catalog_lock:
+            if _catalog is None or _catalog.version != version:
+                _catalog = build_service_catalog(version)
+            catalog = _catalog
+    return catalog
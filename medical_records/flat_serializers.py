@@ -0,0 +1,82 @@
+"""
+values_list()-based read path producing the same dicts as BillSerializer,
+with all payments fetched in one extra query instead of one per bill.
+"""
+from rest_framework import serializers
+
+from appointments.flat_serializers import full_name
+from .models import Payment
+
+
+datetime_field = serializers.DateTimeField()
+money_field = serializers.DecimalField(max_digits=10, decimal_places=2)
+
+
+BILL_COLUMNS = (
+    'id', 'appointment_id', 'appointment__patient__user__first_name', 'appointment__patient__user__last_name',
+    'amount', 'status', 'issued_date',
+    'appointment__doctor__user__first_name', 'appointment__doctor__user__last_name',
+)
+
+PAYMENT_COLUMNS = ('bill_id', 'id', 'amount_paid', 'payment_method', 'status', 'payment_date')
+
+
+def _bill_row(bill, bill_payments):
+    money_repr = money_field.to_representation
+    datetime_repr = datetime_field.to_representation
+
+    pk, appointment_id, p_first, p_last, amount, status, issued, d_first, d_last = bill
+    # Bill.total_paid / Bill.amount_due
+    total_paid = sum(p[1] for p in bill_payments if p[3] == 'Completed')
+    amount_due = amount - total_paid if amount is not None else None
+
+    return {
+        'id': pk,
+        'appointment': appointment_id,
+        'patient_name': full_name(p_first, p_last),
+        'amount': money_repr(amount) if amount is not None else None,
+        'status': status,
+        'issued_date': datetime_repr(issued),
+        'total_paid': money_repr(total_paid),
+        'amount_due': money_repr(amount_due) if amount_due is not None else None,
+        'payments': [
+            {
+                'id': payment_pk,
+                'amount_paid': money_repr(amount_paid),
+                'payment_method': method,
+                'status': payment_status,
+                'payment_date': datetime_repr(paid_on),
+            }
+            for payment_pk, amount_paid, method, payment_status, paid_on in bill_payments
+        ],
+        'doctor_name': full_name(d_first, d_last),
+    }
+
+
+def bill_rows(queryset):
+    """Rows shaped like BillSerializer(queryset, many=True).data"""
+    payments_by_bill = {}
+    payments = Payment.objects.filter(bill__in=queryset.values('pk')).order_by('bill_id', 'id')
+    for bill_id, pk, amount_paid, method, status, paid_on in payments.values_list(*PAYMENT_COLUMNS):
+        payments_by_bill.setdefault(bill_id, []).append((pk, amount_paid, method, status, paid_on))
+
+    return [_bill_row(bill, payments_by_bill.get(bill[0], ())) for bill in queryset.values_list(*BILL_COLUMNS)]
+
+
+def bill_row(queryset):
+    """
+    The first bill of `queryset` shaped like BillSerializer(bill).data, or
+    None. Bill and payments come from a single LEFT JOIN query.
+    """
+    joined = queryset.order_by('pk', 'payments__id').values_list(
+        *BILL_COLUMNS, *('payments__' + column for column in PAYMENT_COLUMNS[1:])
+    )
+    bill, bill_payments = None, []
+    for row in joined:
+        if bill is None:
+            bill = row[:len(BILL_COLUMNS)]
+        elif row[0] != bill[0]:
+            break
+        if row[len(BILL_COLUMNS)] is not None:
+            bill_payments.append(row[len(BILL_COLUMNS):])
+    return _bill_row(bill, bill_payments) if bill is not None else None
@@ -0,0 +1,23 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from medical_records.billing import generate_bills
+
+
+class Command(BaseCommand):
+    help = "Create bills for Completed appointments that have none. Run at end of day from cron."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--date', help="Only bill appointments on this date (YYYY-MM-DD). Default: all dates.")
+
+    def handle(self, *args, **options):
+        day = None
+        if options['date']:
+            try:
+                day = date.fromisoformat(options['date'])
+            except ValueError:
+                raise CommandError("--date must be in YYYY-MM-DD format.")
+
+        summary = generate_bills(day)
+        self.stdout.write(f"Created {summary['created']} bill(s) totalling {summary['total_amount']}.")
@@ -0,0 +1,26 @@
+from django.db import migrations
+
+
+def bill_completed_appointments(apps, schema_editor):
+    # GET finance/bill/<id>/ used to create missing bills; it no longer does,
+    # so appointments completed before that change get their bill here.
+    Appointment = apps.get_model('appointments', 'Appointment')
+    Bill = apps.get_model('medical_records', 'Bill')
+    pending = (Appointment.objects.filter(status='Completed', bill__isnull=True)
+               .order_by().values_list('pk', 'service__base_price'))
+    Bill.objects.bulk_create(
+        [Bill(appointment_id=pk, amount=price) for pk, price in pending.iterator(chunk_size=2000)],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('appointments', '0017_appointment_active_slot'),
+        ('medical_records', '0006_service_doctors'),
+    ]
+
+    operations = [
+        migrations.RunPython(bill_completed_appointments, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,17 @@
+from django.db.models.signals import post_save, post_delete, m2m_changed
+from django.dispatch import receiver
+
+from core.versioning import bump_resource_version
+from .models import Service
+
+
+@receiver(post_save, sender=Service)
+@receiver(post_delete, sender=Service)
+def service_changed(sender, instance, **kwargs):
+    bump_resource_version('services')
+
+
+@receiver(m2m_changed, sender=Service.doctors.through)
+def service_doctors_changed(sender, action, **kwargs):
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        bump_resource_version('services')
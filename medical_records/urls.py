@@ -1,7 +1,7 @@
 from django.urls import path
 from .views import (PatientMedicalHistoryView,PatientBillListView,CreatePrescriptionView,
                     ServiceListView,GetGenerateBillView, ProcessPaymentView,
-                    ServiceListCreateView, ServiceDetailView
+                    ServiceListCreateView, ServiceDetailView, GenerateBillsView
 )
 urlpatterns = [
     path('history/', PatientMedicalHistoryView.as_view(), name='medical_history'),
@@ -9,6 +9,7 @@ urlpatterns = [
     path('create/', CreatePrescriptionView.as_view(), name='create_prescription'),
     path('services/', ServiceListView.as_view(), name='service_list'),
     path('bill/<int:appointment_id>/', GetGenerateBillView.as_view(), name='get_generate_bill'),
+    path('bills/generate/', GenerateBillsView.as_view(), name='generate_bills'),
     path('payment/add/', ProcessPaymentView.as_view(), name='add_payment'),
     path('services-create/', ServiceListCreateView.as_view(), name='service-list-create'),
     path('services-create/<int:pk>/', ServiceDetailView.as_view(), name='service-detail'),
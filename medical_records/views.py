@@ -5,12 +5,19 @@ from rest_framework import generics,status, permissions
 from .models import Prescription,Service,Bill, Payment
 from .serializers import (PrescriptionSerializer,ServiceSerializer,BillSerializer, 
                           PaymentSerializer,PrescriptionCreateSerializer)
-from core.permissions import IsPatient,IsDoctor
+from core.permissions import IsPatient,IsDoctor,IsAdmin
+from core.mixins import ConditionalGetMixin, IdempotencyMixin, ReplicaReadMixin
+from .catalog import get_service_catalog
+from .flat_serializers import bill_row, bill_rows
+from .billing import create_bill, generate_bills
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from django.shortcuts import get_object_or_404
+from django.core.exceptions import ValidationError as DjangoValidationError
 from appointments.models import Appointment
+from archive.reads import archived_prescription_rows, needs_archive, requested_range
+from datetime import date
 
 
 
@@ -18,20 +25,32 @@ from appointments.models import Appointment
 
 
 
-class PatientMedicalHistoryView(generics.ListAPIView):
+class PatientMedicalHistoryView(ReplicaReadMixin, generics.ListAPIView):
     serializer_class = PrescriptionSerializer
     permission_classes = [IsPatient]
 
     def get_queryset(self):
         
-        return Prescription.objects.filter(
-            appointment__patient__user=self.request.user
-        ).order_by('-appointment__date')
+        start, end = requested_range(self.request.query_params)
+        queryset = Prescription.objects.filter(appointment__patient__user=self.request.user)
+        if start:
+            queryset = queryset.filter(appointment__date__gte=start)
+        if end:
+            queryset = queryset.filter(appointment__date__lte=end)
+        return queryset.order_by('-appointment__date')
+
+    def list(self, request, *args, **kwargs):
+        rows = self.get_serializer(self.get_queryset(), many=True).data
+        start, end = requested_range(request.query_params)
+        if needs_archive(start):
+            rows = [*rows, *archived_prescription_rows(request.user.pk, start, end)]
+            rows.sort(key=lambda row: row['date'], reverse=True)
+        return Response(rows)
 
 
 
 
-class PatientBillListView(generics.ListAPIView):
+class PatientBillListView(ReplicaReadMixin, generics.ListAPIView):
     serializer_class = BillSerializer
     permission_classes = [IsPatient]
 
@@ -39,6 +58,9 @@ class PatientBillListView(generics.ListAPIView):
         return Bill.objects.filter(
             appointment__patient__user=self.request.user
         ).order_by('-issued_date')        
+
+    def list(self, request, *args, **kwargs):
+        return Response(bill_rows(self.get_queryset()))
     
 
 
@@ -47,7 +69,8 @@ class CreatePrescriptionView(generics.CreateAPIView):
     serializer_class = PrescriptionCreateSerializer
     permission_classes = [IsDoctor]    
 
-class ServiceListView(generics.ListAPIView):
+class ServiceListView(ConditionalGetMixin, generics.ListAPIView):
+    version_resource = 'services'
     serializer_class = ServiceSerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly] 
 
@@ -63,6 +86,19 @@ class ServiceListView(generics.ListAPIView):
             
         return queryset
 
+    def list(self, request, *args, **kwargs):
+        catalog = get_service_catalog()
+        doctor_id = request.query_params.get('doctor_id')
+
+        if doctor_id:
+            try:
+                doctor_id = int(doctor_id)
+            except ValueError:
+                return Response({"error": "doctor_id must be a number."}, status=status.HTTP_400_BAD_REQUEST)
+            return Response(catalog.for_doctor(doctor_id))
+
+        return Response(catalog.services)
+
 
 
 
@@ -71,21 +107,55 @@ class GetGenerateBillView(APIView):
     
     permission_classes = [permissions.IsAuthenticated] 
 
-    def get(self, request, appointment_id):
-        
-        appointment = get_object_or_404(Appointment, pk=appointment_id) 
-        bill, created = Bill.objects.get_or_create(appointment=appointment)
+    def get_permissions(self):
+        # Patients and doctors read the bills of their own visits; only staff who handle the visit can create one.
+        if self.request.method == 'POST':
+            return [(IsAdmin | IsDoctor)()]
+        return super().get_permissions()
 
-        
-        if created:
-            
-            bill.amount = appointment.service.base_price 
-            bill.save()
-
-        serializer = BillSerializer(bill)
-        return Response(serializer.data)
+    def get(self, request, appointment_id):
+        # Bills are created when the appointment is completed; reading has no side effects.
+        bills = Bill.objects.filter(appointment_id=appointment_id)
+        if request.user.role == 'Doctor':
+            bills = bills.filter(appointment__doctor_id=request.user.pk)
+        elif request.user.role != 'Admin':
+            bills = bills.filter(appointment__patient__user=request.user)
+        bill = bill_row(bills)
+        if bill is None:
+            return Response({"error": "No bill has been generated for this appointment."}, status=status.HTTP_404_NOT_FOUND)
+        return Response(bill)
+
+    def post(self, request, appointment_id):
+        appointments = Appointment.objects.filter(pk=appointment_id)
+        if request.user.role == 'Doctor':
+            appointments = appointments.filter(doctor_id=request.user.pk)
+        if not appointments.exists():
+            return Response({"error": "Appointment not found."}, status=status.HTTP_404_NOT_FOUND)
+
+        try:
+            created = create_bill(appointment_id)
+        except DjangoValidationError as e:
+            return Response({"error": e.messages}, status=status.HTTP_400_BAD_REQUEST)
+        if created is None:
+            return Response({"error": "Appointment not found."}, status=status.HTTP_404_NOT_FOUND)
+        bill = bill_row(Bill.objects.filter(appointment_id=appointment_id))
+        return Response(bill, status=status.HTTP_201_CREATED if created else status.HTTP_200_OK)
+
+
+class GenerateBillsView(APIView):
+    """End-of-day billing: bills every Completed appointment that has none, optionally for one date."""
+    permission_classes = [IsAdmin]
 
-class ProcessPaymentView(APIView):
+    def post(self, request):
+        day = request.data.get('date')
+        if day:
+            try:
+                day = date.fromisoformat(str(day))
+            except ValueError:
+                return Response({"error": "'date' must be in YYYY-MM-DD format."}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(generate_bills(day or None), status=status.HTTP_201_CREATED)
+
+class ProcessPaymentView(IdempotencyMixin, APIView):
     
     permission_classes = [permissions.IsAuthenticated] 
 
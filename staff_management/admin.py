@@ -1,7 +1,7 @@
 from django.contrib import admin
 from django.utils import timezone
 from django.utils.html import format_html
-from staff_management.models import Doctor,Schedule,DoctorLeave
+from staff_management.models import Doctor,Schedule,DoctorLeave,Shift,DoctorRating
 
 class CurrentlyOnLeaveFilter(admin.SimpleListFilter):
     title = 'availability'
@@ -46,7 +46,20 @@ class DoctorAdmin(admin.ModelAdmin):
 
 @admin.register(Schedule)
 class ScheduleAdmin(admin.ModelAdmin):
-    list_display = ("doctor", "day_of_week", "start_time", "end_time")
+    list_display = ("doctor", "day_of_week", "shift", "start_time", "end_time", "is_closed")
     list_filter = ("day_of_week",)
    
 
+
+@admin.register(Shift)
+class ShiftAdmin(admin.ModelAdmin):
+    list_display = ("name", "start_time", "end_time")
+
+
+
+@admin.register(DoctorRating)
+class DoctorRatingAdmin(admin.ModelAdmin):
+    list_display = ("doctor", "count", "average", "stars_1", "stars_2", "stars_3", "stars_4", "stars_5")
+    list_select_related = ("doctor__user",)
+    # Maintained from feedback; rebuild with `manage.py rebuild_doctor_ratings`.
+    readonly_fields = ("doctor", "count", "total", "stars_1", "stars_2", "stars_3", "stars_4", "stars_5")
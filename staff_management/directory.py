@@ -0,0 +1,64 @@
+from django.core.cache import cache
+from rest_framework.settings import api_settings
+
+from core.versioning import get_resource_version
+from .models import Doctor
+from .ratings import ratings_version
+from .serializers import DoctorProfileSerializer, DoctorSelectSerializer
+
+
+DIRECTORY_TIMEOUT = 60 * 60 * 24
+
+DIRECTORY_SERIALIZERS = {
+    'profiles': DoctorProfileSerializer,
+    'dropdown': DoctorSelectSerializer,
+}
+
+# Kinds that embed DoctorRating and so also change with the 'ratings' version.
+RATED_KINDS = {'profiles'}
+
+
+def active_doctors():
+    return Doctor.objects.filter(
+        user__role='Doctor', user__is_active=True
+    ).select_related('user', 'rating')
+
+
+def _directory_key(kind, version):
+    return f"doctor_directory:{kind}:{version}"
+
+
+def directory_version(kind):
+    version = get_resource_version('doctors')
+    if kind in RATED_KINDS:
+        version = f"{version}:{ratings_version()}"
+    return version
+
+
+def build_doctor_directory(kind, version=None):
+    if version is None:
+        version = directory_version(kind)
+    serializer_class = DIRECTORY_SERIALIZERS[kind]
+    renderer = api_settings.DEFAULT_RENDERER_CLASSES[0]()
+    content = renderer.render(serializer_class(active_doctors(), many=True).data)
+    cache.set(_directory_key(kind, version), content, DIRECTORY_TIMEOUT)
+    return content
+
+
+def get_doctor_directory(kind):
+    """
+    Rendered JSON bytes for the public doctor directory. Entries are keyed
+    by the 'doctors' version stamp (plus 'ratings' for profiles), so a
+    Doctor/User change simply makes the next request rebuild instead of
+    reading stale bytes.
+    """
+    version = directory_version(kind)
+    content = cache.get(_directory_key(kind, version))
+    if content is None:
+        content = build_doctor_directory(kind, version)
+    return content
+
+
+def rebuild_doctor_directories():
+    for kind in DIRECTORY_SERIALIZERS:
+        build_doctor_directory(kind)
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from staff_management.ratings import rebuild_ratings
+
+
+class Command(BaseCommand):
+    help = "Recompute every doctor's rating aggregates from live and archived feedback."
+
+    def handle(self, *args, **options):
+        rated = rebuild_ratings()
+        self.stdout.write(f"Rebuilt ratings for {rated} doctor(s).")
@@ -0,0 +1,62 @@
+# Generated by Django 5.2.6 on 2026-10-19 16:17
+
+from datetime import time
+
+from django.db import migrations, models
+
+
+# Schedule.save() and DoctorBatchScheduleView disagreed (10-13/17-22 vs
+# 10-15/18-22). The batch endpoint is what the doctor dashboard uses, and
+# taking its wider hours keeps every existing booking inside a shift.
+DEFAULT_SHIFTS = [
+    ('Morning', time(10, 0), time(15, 0)),
+    ('Evening', time(18, 0), time(22, 0)),
+]
+# The batch view's fallback for any other shift name.
+FALLBACK_HOURS = (time(9, 0), time(17, 0))
+
+
+def seed_shifts(apps, schema_editor):
+    Shift = apps.get_model('staff_management', 'Shift')
+    Schedule = apps.get_model('staff_management', 'Schedule')
+
+    for name, start, end in DEFAULT_SHIFTS:
+        Shift.objects.get_or_create(name=name, defaults={'start_time': start, 'end_time': end})
+
+    open_rows = Schedule.objects.filter(is_closed=False)
+    known = set(Shift.objects.values_list('name', flat=True))
+    for name in set(open_rows.order_by().values_list('shift', flat=True).distinct()) - known:
+        Shift.objects.create(name=name, start_time=FALLBACK_HOURS[0], end_time=FALLBACK_HOURS[1])
+
+    # One UPDATE per shift rather than one per schedule row.
+    for shift in Shift.objects.all():
+        open_rows.filter(shift=shift.name).update(start_time=shift.start_time, end_time=shift.end_time)
+    Schedule.objects.filter(is_closed=True).update(start_time=time(0, 0), end_time=time(0, 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('staff_management', '0009_alter_doctorleave_status'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Shift',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=10, unique=True)),
+                ('start_time', models.TimeField()),
+                ('end_time', models.TimeField()),
+            ],
+            options={
+                'ordering': ['start_time'],
+            },
+        ),
+        migrations.AlterField(
+            model_name='schedule',
+            name='shift',
+            field=models.CharField(default='Morning', max_length=10),
+        ),
+        migrations.RunPython(seed_shifts, migrations.RunPython.noop),
+    ]
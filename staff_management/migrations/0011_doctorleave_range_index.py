@@ -0,0 +1,17 @@
+# Generated by Django 5.2.6 on 2026-10-19 16:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('staff_management', '0010_shift'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='doctorleave',
+            index=models.Index(fields=['doctor', 'start_date', 'end_date'], name='leave_doctor_range_idx'),
+        ),
+    ]
@@ -0,0 +1,52 @@
+# Generated by Django 5.2.6 on 2026-10-19 16:34
+
+from collections import defaultdict
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def fill_ratings(apps, schema_editor):
+    DoctorRating = apps.get_model('staff_management', 'DoctorRating')
+    counts = defaultdict(lambda: defaultdict(int))
+    for model in (apps.get_model('appointments', 'Feedback'), apps.get_model('archive', 'ArchivedFeedback')):
+        rows = model.objects.values_list('appointment__doctor_id', 'rating_score').annotate(n=Count('pk')).order_by()
+        for doctor_id, score, n in rows:
+            counts[doctor_id][score] += n
+
+    DoctorRating.objects.bulk_create([
+        DoctorRating(
+            doctor_id=doctor_id,
+            count=sum(scores.values()),
+            total=sum(score * n for score, n in scores.items()),
+            **{f'stars_{score}': scores.get(score, 0) for score in range(1, 6)},
+        )
+        for doctor_id, scores in counts.items()
+    ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('staff_management', '0011_doctorleave_range_index'),
+        ('appointments', '0016_partition_appointments'),
+        ('archive', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DoctorRating',
+            fields=[
+                ('doctor', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='rating', serialize=False, to='staff_management.doctor')),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('total', models.PositiveIntegerField(default=0)),
+                ('stars_1', models.PositiveIntegerField(default=0)),
+                ('stars_2', models.PositiveIntegerField(default=0)),
+                ('stars_3', models.PositiveIntegerField(default=0)),
+                ('stars_4', models.PositiveIntegerField(default=0)),
+                ('stars_5', models.PositiveIntegerField(default=0)),
+            ],
+        ),
+        migrations.RunPython(fill_ratings, migrations.RunPython.noop),
+    ]
@@ -3,10 +3,13 @@ from django.db import models
 # Create your models here.
 from django.db import models
 from django.core.exceptions import ValidationError
+from django.core.cache import cache
 from django.core.validators import MinValueValidator
 from datetime import date
 from datetime import time 
+import threading
 from core.models import User  
+from core.versioning import get_resource_version, doctor_day_resource
 
 
 class Doctor(models.Model):
@@ -34,10 +37,7 @@ class Doctor(models.Model):
     def is_available_on(self, check_date):
         
         day_name = check_date.strftime("%A")  
-        has_schedule = self.schedules.filter(
-            day_of_week=day_name, 
-            is_closed=False
-        ).exists()
+        has_schedule = bool(get_day_shifts(self.pk, day_name))
         
         if not has_schedule:
             return False 
@@ -53,6 +53,64 @@ class Doctor(models.Model):
 
  
 
+class Shift(models.Model):
+    """
+    Working hours for a named shift. Every Schedule row copies its times
+    from here, whichever endpoint wrote it.
+    """
+    name = models.CharField(max_length=10, unique=True)
+    start_time = models.TimeField()
+    end_time = models.TimeField()
+
+    class Meta:
+        ordering = ['start_time']
+
+    def clean(self):
+        if self.start_time >= self.end_time:
+            raise ValidationError("Shift must end after it starts.")
+
+    def save(self, *args, **kwargs):
+        self.clean()
+        super().save(*args, **kwargs)
+
+    def __str__(self):
+        return f"{self.name} ({self.start_time.strftime('%I:%M %p')} - {self.end_time.strftime('%I:%M %p')})"
+
+
+_shifts = (None, {})
+_shifts_lock = threading.Lock()
+
+
+def get_shifts():
+    """{name: Shift}, cached in-process until the 'shifts' version stamp moves."""
+    global _shifts
+    version = get_resource_version('shifts')
+    cached_version, shifts = _shifts
+    if cached_version != version:
+        with _shifts_lock:
+            if _shifts[0] != version:
+                _shifts = (version, {shift.name: shift for shift in Shift.objects.all()})
+            shifts = _shifts[1]
+    return shifts
+
+
+def get_day_shifts(doctor_id, day_name):
+    """
+    [(shift, start_time, end_time)] for the doctor's open shifts on a weekday,
+    cached until that doctor/day's version stamp moves.
+    """
+    version = get_resource_version(doctor_day_resource(doctor_id, day_name))
+    key = f"day_shifts:{doctor_id}:{day_name}:{version}"
+    shifts = cache.get(key)
+    if shifts is None:
+        shifts = list(
+            Schedule.objects.filter(doctor_id=doctor_id, day_of_week=day_name, is_closed=False)
+            .order_by('shift').values_list('shift', 'start_time', 'end_time')
+        )
+        cache.set(key, shifts, timeout=86400)
+    return shifts
+
+
 class Schedule(models.Model):
     
     DAYS_OF_WEEK = [
@@ -65,10 +123,7 @@ class Schedule(models.Model):
         ('Sunday', 'Sunday'),
     ]
 
-    SHIFT_CHOICES = [
-        ('Morning', 'Morning (10 AM - 1 PM)'),
-        ('Evening', 'Evening (5 PM - 10 PM)'),
-    ]
+    CLOSED = 'Closed'
 
     doctor = models.ForeignKey(
         'Doctor', 
@@ -76,7 +131,7 @@ class Schedule(models.Model):
         related_name="schedules"
     )
     day_of_week = models.CharField(max_length=10, choices=DAYS_OF_WEEK)
-    shift = models.CharField(max_length=10, choices=SHIFT_CHOICES,default='Morning')
+    shift = models.CharField(max_length=10, default='Morning')
     start_time = models.TimeField(editable=False)
     end_time = models.TimeField(editable=False)
     is_closed = models.BooleanField(default=False)
@@ -86,20 +141,20 @@ class Schedule(models.Model):
         
         ordering = ['day_of_week', 'shift']
 
-    def save(self, *args, **kwargs):
-        
-        if self.shift == 'Morning':
-            self.start_time = time(10, 0)
-            self.end_time = time(13, 0) 
-        elif self.shift == 'Evening':
-            self.start_time = time(17, 0)
-            self.end_time = time(22, 0) 
-        
-        
-        if self.start_time is None or self.end_time is None:
-             
-             raise ValueError("Shift times could not be determined.")
+    def apply_shift_times(self):
+        if self.is_closed:
+            self.start_time = time(0, 0)
+            self.end_time = time(0, 0)
+            return
+
+        shift = get_shifts().get(self.shift)
+        if shift is None:
+            raise ValidationError(f"Unknown shift '{self.shift}'.")
+        self.start_time = shift.start_time
+        self.end_time = shift.end_time
 
+    def save(self, *args, **kwargs):
+        self.apply_shift_times()
         super().save(*args, **kwargs)
 
     def __str__(self):
@@ -123,6 +178,9 @@ class DoctorLeave(models.Model):
 
     class Meta:
         ordering = ['-start_date']
+        indexes = [
+            models.Index(fields=['doctor', 'start_date', 'end_date'], name='leave_doctor_range_idx'),
+        ]
         verbose_name = "Doctor Leave"
         verbose_name_plural = "Doctor Leaves"
 
@@ -138,3 +196,33 @@ class DoctorLeave(models.Model):
 
     def __str__(self):
         return f"{self.doctor} ({self.start_date} to {self.end_date}) - {self.status}"    
+
+
+RATING_SCORES = range(1, 6)
+
+
+class DoctorRating(models.Model):
+    """
+    Running totals of a doctor's feedback, kept up to date as feedback is
+    submitted (see staff_management.ratings) so listings never aggregate
+    the feedback table. Rebuild with `manage.py rebuild_doctor_ratings`.
+    """
+    doctor = models.OneToOneField(Doctor, on_delete=models.CASCADE, primary_key=True, related_name="rating")
+    count = models.PositiveIntegerField(default=0)
+    total = models.PositiveIntegerField(default=0)
+    stars_1 = models.PositiveIntegerField(default=0)
+    stars_2 = models.PositiveIntegerField(default=0)
+    stars_3 = models.PositiveIntegerField(default=0)
+    stars_4 = models.PositiveIntegerField(default=0)
+    stars_5 = models.PositiveIntegerField(default=0)
+
+    @property
+    def average(self):
+        return round(self.total / self.count, 2) if self.count else None
+
+    @property
+    def distribution(self):
+        return {str(score): getattr(self, f'stars_{score}') for score in RATING_SCORES}
+
+    def __str__(self):
+        return f"{self.doctor} - {self.average or 'no'} rating ({self.count})"
@@ -0,0 +1,112 @@
+"""
+Per-doctor rating aggregates. Each new Feedback adds one to the doctor's
+DoctorRating row with an UPDATE ... SET count = count + 1, so concurrent
+submissions never lose a vote and reading a rating is a plain join.
+
+Rating changes are published under their own 'ratings' version, not
+'doctors', and at most once per RATINGS_REFRESH_SECONDS: a busy day of
+reviews rebuilds the cached doctor profiles (and changes their ETag) once
+per window instead of once per review, and never touches the dropdown.
+
+Feedback moved to the archive still counts: archiving does not touch the
+aggregates, and rebuild_ratings() reads both tables.
+"""
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F
+
+from core.versioning import bump_resource_version, get_resource_version
+from .models import RATING_SCORES, DoctorRating
+
+
+PENDING_KEY = "ratings:pending"
+WINDOW_KEY = "ratings:window"
+
+
+EMPTY_RATING = {
+    'count': 0,
+    'average': None,
+    'distribution': {str(score): 0 for score in RATING_SCORES},
+}
+
+
+def rating_summary(doctor):
+    """The doctor's rating as served by the API. Use select_related('rating') to avoid a query."""
+    try:
+        rating = doctor.rating
+    except DoctorRating.DoesNotExist:
+        return EMPTY_RATING
+    return {'count': rating.count, 'average': rating.average, 'distribution': rating.distribution}
+
+
+def record_rating(doctor_id, score):
+    """Add one `score` (1-5) to the doctor's aggregate."""
+    changes = {
+        'count': F('count') + 1,
+        'total': F('total') + score,
+        f'stars_{score}': F(f'stars_{score}') + 1,
+    }
+    if not DoctorRating.objects.filter(doctor_id=doctor_id).update(**changes):
+        try:
+            with transaction.atomic():
+                DoctorRating.objects.create(doctor_id=doctor_id, count=1, total=score, **{f'stars_{score}': 1})
+        except IntegrityError:
+            # Another submission created the row first.
+            DoctorRating.objects.filter(doctor_id=doctor_id).update(**changes)
+    transaction.on_commit(_mark_ratings_changed)
+
+
+def _mark_ratings_changed():
+    cache.set(PENDING_KEY, True, timeout=None)
+    _publish_pending_ratings()
+
+
+def _publish_pending_ratings():
+    # The first change in a window is published straight away; later ones
+    # stay pending until a read finds the window over.
+    if cache.get(PENDING_KEY) and cache.add(WINDOW_KEY, True, timeout=settings.RATINGS_REFRESH_SECONDS):
+        cache.delete(PENDING_KEY)
+        bump_resource_version('ratings')
+
+
+def ratings_version():
+    """Version stamp of the published ratings. Publishes held-back changes once their window is over."""
+    _publish_pending_ratings()
+    return get_resource_version('ratings')
+
+
+def _score_counts(feedback_model):
+    return (
+        feedback_model.objects.values_list('appointment__doctor_id', 'rating_score')
+        .annotate(n=Count('pk')).order_by()
+    )
+
+
+def rebuild_ratings():
+    """Recompute every DoctorRating from live and archived feedback. Returns the number of doctors rated."""
+    from appointments.models import Feedback
+    from archive.models import ArchivedFeedback
+
+    counts = defaultdict(lambda: defaultdict(int))
+    for feedback_model in (Feedback, ArchivedFeedback):
+        for doctor_id, score, n in _score_counts(feedback_model):
+            counts[doctor_id][score] += n
+
+    ratings = [
+        DoctorRating(
+            doctor_id=doctor_id,
+            count=sum(scores.values()),
+            total=sum(score * n for score, n in scores.items()),
+            **{f'stars_{score}': scores.get(score, 0) for score in RATING_SCORES},
+        )
+        for doctor_id, scores in counts.items()
+    ]
+    with transaction.atomic():
+        DoctorRating.objects.all().delete()
+        DoctorRating.objects.bulk_create(ratings, batch_size=1000)
+    cache.delete(PENDING_KEY)
+    bump_resource_version('ratings')
+    return len(ratings)
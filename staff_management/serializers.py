@@ -1,7 +1,8 @@
 from rest_framework import serializers
-from .models import Schedule
+from .models import Schedule, get_shifts
 from .models import Doctor
 from .models import DoctorLeave
+from .ratings import rating_summary
 
 class ScheduleSerializer(serializers.ModelSerializer):
     class Meta:
@@ -9,6 +10,11 @@ class ScheduleSerializer(serializers.ModelSerializer):
         fields = ['id', 'day_of_week', 'shift', 'start_time', 'end_time', 'is_closed']
         read_only_fields = ['start_time', 'end_time'] 
 
+    def validate_shift(self, value):
+        if value not in get_shifts():
+            raise serializers.ValidationError(f"Unknown shift '{value}'. Choose one of: {', '.join(get_shifts())}.")
+        return value
+
 
 class DoctorProfileSerializer(serializers.ModelSerializer):
     
@@ -16,6 +22,7 @@ class DoctorProfileSerializer(serializers.ModelSerializer):
     first_name = serializers.CharField(required=False)
     last_name = serializers.CharField(required=False)
     phone_number = serializers.CharField(required=False)
+    rating = serializers.SerializerMethodField()
 
     class Meta:
         model = Doctor
@@ -28,7 +35,8 @@ class DoctorProfileSerializer(serializers.ModelSerializer):
             'qualification', 
             'experience_years', 
             'consultation_fee', 
-            'bio'
+            'bio',
+            'rating',
         ]
 
     
@@ -39,6 +47,9 @@ class DoctorProfileSerializer(serializers.ModelSerializer):
         data['phone_number'] = instance.user.phone_number
         return data
 
+    def get_rating(self, instance):
+        return rating_summary(instance)
+
     
     def update(self, instance, validated_data):
         
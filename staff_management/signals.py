@@ -0,0 +1,73 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import Signal, receiver
+
+from appointments.models import Feedback
+from core.models import User
+from core.versioning import bump_resource_version, doctor_day_resource, doctor_schedule_resource
+from .models import Doctor, Schedule, Shift
+from .ratings import record_rating
+
+
+# Sent by bulk schedule writes (which skip post_save) with the weekdays
+# whose shifts actually changed: schedule_changed.send(sender, doctor_id, days).
+schedule_changed = Signal()
+
+# Saves that do not touch anything shown in the doctor directory or service list.
+IGNORED_USER_FIELDS = {'last_login', 'password'}
+
+
+@receiver(post_save, sender=Doctor)
+@receiver(post_delete, sender=Doctor)
+def doctor_changed(sender, instance, **kwargs):
+    # Service.doctor_names embeds the doctor's name, so services change too.
+    bump_resource_version('doctors', 'services')
+
+
+@receiver(post_save, sender=User)
+def doctor_user_changed(sender, instance, update_fields=None, **kwargs):
+    if instance.role != 'Doctor':
+        return
+    if update_fields and set(update_fields) <= IGNORED_USER_FIELDS:
+        return
+    bump_resource_version('doctors', 'services')
+
+
+@receiver(post_save, sender=Schedule)
+@receiver(post_delete, sender=Schedule)
+def schedule_row_changed(sender, instance, **kwargs):
+    bump_resource_version(
+        doctor_schedule_resource(instance.doctor_id), doctor_day_resource(instance.doctor_id, instance.day_of_week)
+    )
+
+
+@receiver(schedule_changed)
+def schedule_days_changed(sender, doctor_id, days, **kwargs):
+    # Only the changed weekdays' cached shifts are rebuilt.
+    bump_resource_version(
+        doctor_schedule_resource(doctor_id), *(doctor_day_resource(doctor_id, day) for day in days)
+    )
+
+
+@receiver(post_save, sender=Shift)
+def shift_changed(sender, instance, **kwargs):
+    # Schedule rows carry a copy of the shift's hours; keep them in step.
+    schedules = Schedule.objects.filter(shift=instance.name, is_closed=False)
+    affected = set(schedules.values_list('doctor_id', 'day_of_week'))
+    schedules.update(start_time=instance.start_time, end_time=instance.end_time)
+    bump_resource_version(
+        'shifts',
+        *{doctor_schedule_resource(doctor_id) for doctor_id, _ in affected},
+        *(doctor_day_resource(doctor_id, day) for doctor_id, day in affected),
+    )
+
+
+@receiver(post_delete, sender=Shift)
+def shift_deleted(sender, instance, **kwargs):
+    bump_resource_version('shifts')
+
+
+@receiver(post_save, sender=Feedback)
+def feedback_submitted(sender, instance, created, raw=False, **kwargs):
+    # Only new feedback counts; edits and deletes are picked up by rebuild_doctor_ratings.
+    if created and not raw:
+        record_rating(instance.appointment.doctor_id, instance.rating_score)
@@ -5,12 +5,18 @@ from rest_framework import generics,permissions,status,serializers
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from django.db import transaction
-from datetime import time
+from django.http import HttpResponse
+from django.core.exceptions import ValidationError as DjangoValidationError
 from rest_framework.exceptions import ValidationError
 from .models import Schedule, Doctor,DoctorLeave
 from .serializers import (ScheduleSerializer,DoctorProfileSerializer,DoctorLeaveSerializer,
                           DoctorSelectSerializer,DoctorMyLeaveSerializer)
 from core.permissions import IsDoctor
+from core.mixins import ConditionalGetMixin
+from core.throttling import IPTokenBucketThrottle
+from core.versioning import doctor_schedule_resource
+from .signals import schedule_changed
+from .directory import active_doctors, directory_version, get_doctor_directory
 from rest_framework.permissions import IsAuthenticated
 
 
@@ -67,16 +73,28 @@ class DoctorLeaveDeleteView(generics.DestroyAPIView):
         return DoctorLeave.objects.filter(doctor__user=self.request.user)   
 
 
-class PublicDoctorListView(generics.ListAPIView):
-    
-    queryset = Doctor.objects.filter(user__role='Doctor',user__is_active=True)
+class PublicDoctorListView(ConditionalGetMixin, generics.ListAPIView):
+    version_resource = 'doctors'
     serializer_class = DoctorProfileSerializer
     permission_classes = [IsAuthenticated]
 
-class DoctorPublicScheduleView(generics.ListAPIView):
+    def get_version(self, resource):
+        # Profiles carry ratings, so the ETag follows the directory's own version.
+        return directory_version('profiles')
+
+    def get_queryset(self):
+        return active_doctors()
+
+    def list(self, request, *args, **kwargs):
+        return HttpResponse(get_doctor_directory('profiles'), content_type='application/json')
+
+class DoctorPublicScheduleView(ConditionalGetMixin, generics.ListAPIView):
     serializer_class = ScheduleSerializer
     permission_classes = [IsAuthenticated]
 
+    def get_version_resource(self):
+        return doctor_schedule_resource(self.kwargs['doctor_id'])
+
     def get_queryset(self):
         doctor_id = self.kwargs['doctor_id']
         return Schedule.objects.filter(doctor__user__id=doctor_id)
@@ -112,49 +130,67 @@ class DoctorBatchScheduleView(APIView):
             if not isinstance(new_schedules, list):
                 return Response({"error": "Invalid format. Expected a list."}, status=400)
 
+            days = {value for value, _ in Schedule.DAYS_OF_WEEK}
+            wanted = {}
+            for item in new_schedules:
+                if item.get('day_of_week') not in days:
+                    return Response({"error": f"Invalid day_of_week: {item.get('day_of_week')!r}."}, status=400)
+                is_closed = bool(item.get('is_closed', False))
+                schedule = Schedule(
+                    doctor=doctor,
+                    day_of_week=item['day_of_week'],
+                    shift=Schedule.CLOSED if is_closed else item.get('shift'),
+                    is_closed=is_closed
+                )
+                schedule.apply_shift_times()
+                key = (schedule.day_of_week, schedule.shift)
+                if key in wanted:
+                    return Response({"error": f"{schedule.shift} is listed twice for {schedule.day_of_week}."}, status=400)
+                wanted[key] = schedule
+
             with transaction.atomic():
-                Schedule.objects.filter(doctor=doctor).delete()
-                
-                created_slots = []
-                for item in new_schedules:
-                    
-                    
-                    is_closed = item.get('is_closed', False)
-                    
-                    shift_start = None
-                    shift_end = None
-                    
-                    if is_closed:
-                        
-                        shift_start = time(0, 0)
-                        shift_end = time(0, 0)
-                        shift_name = 'Closed' 
-                    
-                    elif item['shift'] == 'Morning':
-                        shift_start = time(10, 0)
-                        shift_end = time(15, 0)
-                        shift_name = 'Morning'
-                    elif item['shift'] == 'Evening':
-                        shift_start = time(18, 0)
-                        shift_end = time(22, 0)
-                        shift_name = 'Evening'
-                    else:
-                        shift_start = time(9, 0)
-                        shift_end = time(17, 0)
-                        shift_name = item['shift']
-
-                    created_slots.append(Schedule(
-                        doctor=doctor,
-                        day_of_week=item['day_of_week'],
-                        shift=shift_name,
-                        start_time=shift_start,
-                        end_time=shift_end,
-                        is_closed=is_closed 
-                    ))
-                
-                Schedule.objects.bulk_create(created_slots)
+                # Diff against the current rows so unchanged shifts keep their ids
+                # and only the weekdays that really changed are invalidated.
+                existing = {
+                    (s.day_of_week, s.shift): s
+                    for s in Schedule.objects.select_for_update().filter(doctor=doctor)
+                }
+
+                to_create = [s for key, s in wanted.items() if key not in existing]
+                to_delete = [s for key, s in existing.items() if key not in wanted]
+                to_update = []
+                for key, current in existing.items():
+                    target = wanted.get(key)
+                    if target is None:
+                        continue
+                    if (current.start_time, current.end_time, current.is_closed) != (
+                        target.start_time, target.end_time, target.is_closed
+                    ):
+                        current.start_time = target.start_time
+                        current.end_time = target.end_time
+                        current.is_closed = target.is_closed
+                        to_update.append(current)
+
+                if to_delete:
+                    Schedule.objects.filter(pk__in=[s.pk for s in to_delete]).delete()
+                if to_update:
+                    Schedule.objects.bulk_update(to_update, ['start_time', 'end_time', 'is_closed'])
+                if to_create:
+                    Schedule.objects.bulk_create(to_create)
+
+                changed_days = {s.day_of_week for s in to_create + to_update + to_delete}
+                if changed_days:
+                    schedule_changed.send(sender=Schedule, doctor_id=doctor.pk, days=sorted(changed_days))
             
-            return Response({"message": "Schedule updated successfully!"})
+            return Response({
+                "message": "Schedule updated successfully!",
+                "created": len(to_create),
+                "updated": len(to_update),
+                "deleted": len(to_delete),
+            })
+
+        except DjangoValidationError as e:
+            return Response({"error": e.messages}, status=400)
 
         except Exception as e:
             import traceback
@@ -198,10 +234,18 @@ class AdminLeaveUpdateView(APIView):
             return Response({"error": "Leave request not found"}, status=status.HTTP_404_NOT_FOUND)    
 
 
-class DoctorDropdownView(generics.ListAPIView):
-    queryset = Doctor.objects.filter(user__role='Doctor',user__is_active=True)
+class DoctorDropdownView(ConditionalGetMixin, generics.ListAPIView):
+    version_resource = 'doctors'
     serializer_class = DoctorSelectSerializer
     permission_classes = [] 
+    throttle_classes = [IPTokenBucketThrottle]
+    throttle_scope = 'doctor_directory'
+
+    def get_queryset(self):
+        return active_doctors()
+
+    def list(self, request, *args, **kwargs):
+        return HttpResponse(get_doctor_directory('dropdown'), content_type='application/json')
 
 
 class DoctorMyLeaveView(generics.ListCreateAPIView):